@@ -0,0 +1,43 @@
+from importlib import import_module
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+def attach(namespace: Dict[str, Any], imports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Creates the module-level ``__getattr__`` and ``__dir__`` of a package whose contents are imported on first access.
+
+    Parameters
+    ----------
+    namespace : dict
+        The ``globals()`` of the package. Imported names are stored in it, so that each is only looked up once.
+    imports : dict(str, str)
+        The module each name is imported from, relative to the package, e.g. ``{"SpatialIndex": ".spatial"}``.
+
+    Returns
+    -------
+    tuple(callable, callable)
+        The ``__getattr__`` and ``__dir__`` functions of the package.
+
+    Examples
+    --------
+    >>> __getattr__, __dir__ = attach(globals(), {"SpatialIndex": ".spatial"})
+
+    """
+    package = namespace["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module = imports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(imports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+Job = Tuple[Future, Callable[..., Any], tuple, dict]
+
+_CURRENT: List[BridgeExecutor] = []
+
+
+class BridgeExecutor:
+    """Runs calls to the cadwork API on the host thread on behalf of worker threads and asyncio coroutines.
+
+    The cadwork controller functions may only be called from the thread cadwork runs the plugin on. The executor is created
+    on that thread. Other threads hand it jobs with :meth:`submit`, :meth:`call` or :meth:`call_async`, which are queued
+    until the host thread processes them with :meth:`process_pending`, :meth:`run_until_complete` or :meth:`run`.
+    All jobs queued at that time are processed as one batch. Jobs submitted on the host thread itself are run immediately.
+
+    This allows pure Python work such as geometry conversion, encoding and file I/O to run on worker threads,
+    overlapping with the calls to cadwork on the host thread.
+
+    Note
+    ----
+    A worker thread which waits for the result of a job blocks until the host thread processes it.
+    The host thread must therefore keep processing jobs while workers run, which :meth:`run` takes care of.
+
+    Parameters
+    ----------
+    suspend_refresh : bool, optional
+        If True, the automatic refresh of the cadwork viewport is suspended while a batch is processed,
+        see :func:`~compas_cadwork.utilities.suspended_refresh`.
+
+    Attributes
+    ----------
+    jobs_processed : int
+        Number of jobs run by :meth:`process_pending`.
+    batches_processed : int
+        Number of batches run by :meth:`process_pending`.
+
+    Examples
+    --------
+    >>> async def export(storage):
+    ...     groups, data = await asyncio.gather(get_element_groups_async(), storage.load_async())
+    ...     return await asyncio.to_thread(write_report, groups, data)
+    >>> with BridgeExecutor() as bridge:
+    ...     bridge.run(export(storage))
+
+    """
+
+    def __init__(self, suspend_refresh: bool = False) -> None:
+        self.suspend_refresh = suspend_refresh
+        self.jobs_processed = 0
+        self.batches_processed = 0
+        self._host_id = threading.get_ident()
+        self._jobs: Deque[Job] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __enter__(self) -> BridgeExecutor:
+        _CURRENT.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _CURRENT.remove(self)
+        self.shutdown()
+
+    @classmethod
+    def current(cls) -> BridgeExecutor:
+        """Returns the innermost executor entered with ``with``.
+
+        Raises
+        ------
+        RuntimeError
+            If no executor is active.
+
+        Returns
+        -------
+        :class:`BridgeExecutor`
+
+        """
+        if not _CURRENT:
+            raise RuntimeError("No BridgeExecutor is active. Use `with BridgeExecutor():` on the cadwork host thread.")
+        return _CURRENT[-1]
+
+    @property
+    def is_host_thread(self) -> bool:
+        """bool: True if called from the thread which created the executor."""
+        return threading.get_ident() == self._host_id
+
+    @property
+    def pending(self) -> int:
+        """int: The number of queued jobs."""
+        return len(self._jobs)
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedules a call on the host thread.
+
+        Parameters
+        ----------
+        func : callable
+            The function to call.
+        *args, **kwargs
+            The arguments of the call.
+
+        Raises
+        ------
+        RuntimeError
+            If the executor was shut down.
+
+        Returns
+        -------
+        :class:`concurrent.futures.Future`
+            The future result. Already completed if called from the host thread.
+
+        """
+        future = Future()
+        job = (future, func, args, kwargs)
+        if self.is_host_thread:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a BridgeExecutor after shutdown.")
+            self._execute(job)
+            return future
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a BridgeExecutor after shutdown.")
+            self._jobs.append(job)
+            self._condition.notify_all()
+        return future
+
+    def map(self, func: Callable[..., Any], *iterables: Iterable) -> Iterator[Any]:
+        """Schedules one call per item of the iterables, queued together so that they are processed in the same batch.
+
+        Parameters
+        ----------
+        func : callable
+            The function to call.
+        *iterables : iterable
+            The arguments of the calls.
+
+        Returns
+        -------
+        iterator
+            The results, in order. Waiting for them blocks until the host thread processed the calls.
+
+        """
+        jobs = [(Future(), func, args, {}) for args in zip(*iterables)]
+        if self.is_host_thread:
+            for job in jobs:
+                self._execute(job)
+        else:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Cannot submit to a BridgeExecutor after shutdown.")
+                self._jobs.extend(jobs)
+                self._condition.notify_all()
+        return (job[0].result() for job in jobs)
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Calls a function on the host thread and waits for the result.
+
+        Parameters
+        ----------
+        func : callable
+            The function to call.
+        *args, **kwargs
+            The arguments of the call.
+
+        Returns
+        -------
+        object
+            The return value of the call.
+
+        """
+        return self.submit(func, *args, **kwargs).result()
+
+    async def call_async(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Calls a function on the host thread without blocking the event loop.
+
+        Parameters
+        ----------
+        func : callable
+            The function to call.
+        *args, **kwargs
+            The arguments of the call.
+
+        Returns
+        -------
+        object
+            The return value of the call.
+
+        """
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def process_pending(self, timeout: float = 0.0) -> int:
+        """Runs all queued jobs as one batch. Must be called on the host thread.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Time in seconds to wait for jobs if none are queued.
+
+        Returns
+        -------
+        int
+            The number of jobs which were run.
+
+        """
+        if not self.is_host_thread:
+            raise RuntimeError("BridgeExecutor.process_pending must be called on the host thread.")
+        with self._condition:
+            if not self._jobs and timeout > 0.0:
+                self._condition.wait_for(lambda: self._jobs or self._closed, timeout)
+            batch = list(self._jobs)
+            self._jobs.clear()
+        if not batch:
+            return 0
+
+        if self.suspend_refresh:
+            # imported here, as compas_cadwork.utilities itself depends on this module
+            from compas_cadwork.utilities.refresh import suspended_refresh
+
+            with suspended_refresh():
+                for job in batch:
+                    self._execute(job)
+        else:
+            for job in batch:
+                self._execute(job)
+        self.jobs_processed += len(batch)
+        self.batches_processed += 1
+        return len(batch)
+
+    def run_until_complete(self, futures: Iterable[Future], timeout: Optional[float] = None) -> None:
+        """Processes jobs on the host thread until the given futures are done.
+
+        Parameters
+        ----------
+        futures : iterable(:class:`concurrent.futures.Future`)
+            The futures to wait for, e.g. of work submitted to a thread pool.
+        timeout : float, optional
+            The maximum time in seconds to wait.
+
+        Raises
+        ------
+        TimeoutError
+            If the futures are not done within ``timeout``.
+
+        """
+        futures = list(futures)
+        for future in futures:
+            future.add_done_callback(self._wake)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0.0:
+                    raise TimeoutError("BridgeExecutor.run_until_complete timed out.")
+                self._condition.wait_for(lambda: self._jobs or all(future.done() for future in futures), remaining)
+            self.process_pending()
+            if all(future.done() for future in futures):
+                # jobs queued right before the last future completed are left for the next call
+                return
+
+    def run(self, work: Any, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Runs a function or coroutine on a worker thread, processing its jobs on the host thread until it finishes.
+
+        Parameters
+        ----------
+        work : callable | coroutine
+            A function, a coroutine function or a coroutine. Coroutines are run in a new event loop on the worker thread.
+        *args, **kwargs
+            The arguments of ``work``, if it is callable.
+        timeout : float, optional
+            The maximum time in seconds to wait.
+
+        Returns
+        -------
+        object
+            The result of ``work``.
+
+        """
+        if inspect.iscoroutine(work):
+            coroutine = work
+
+            def target():
+                return asyncio.run(coroutine)
+
+        elif inspect.iscoroutinefunction(work):
+
+            def target():
+                return asyncio.run(work(*args, **kwargs))
+
+        else:
+
+            def target():
+                return work(*args, **kwargs)
+
+        future = Future()
+
+        def worker():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = target()
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=worker, name="BridgeExecutorWorker", daemon=True).start()
+        self.run_until_complete([future], timeout=timeout)
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Stops accepting jobs and cancels the queued ones."""
+        with self._condition:
+            self._closed = True
+            jobs = list(self._jobs)
+            self._jobs.clear()
+            self._condition.notify_all()
+        for future, _, _, _ in jobs:
+            future.cancel()
+
+    def _wake(self, _: Future) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    @staticmethod
+    def _execute(job: Job) -> None:
+        future, func, args, kwargs = job
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
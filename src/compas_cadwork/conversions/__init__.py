@@ -2,6 +2,13 @@ from .primitives import point_to_cadwork
 from .primitives import vector_to_cadwork
 from .primitives import point_to_compas
 from .primitives import vector_to_compas
+from .primitives import points_to_compas
+from .primitives import points_to_cadwork
+from .arrays import points_to_array
+from .arrays import array_to_cadwork
+from .arrays import array_to_points
+from .arrays import array_to_vectors
+from .arrays import array_to_pointcloud
 
 
 __all__ = [
@@ -9,4 +16,11 @@ __all__ = [
     "vector_to_cadwork",
     "point_to_compas",
     "vector_to_compas",
+    "points_to_compas",
+    "points_to_cadwork",
+    "points_to_array",
+    "array_to_cadwork",
+    "array_to_points",
+    "array_to_vectors",
+    "array_to_pointcloud",
 ]
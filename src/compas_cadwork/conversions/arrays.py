@@ -0,0 +1,97 @@
+from itertools import chain
+from typing import List
+
+import numpy as np
+from compas.geometry import Point
+from compas.geometry import Pointcloud
+from compas.geometry import Vector
+
+try:
+    from cadwork import point_3d
+except ImportError:
+    pass
+
+
+def points_to_array(points) -> np.ndarray:
+    """Convert a list of cadwork point_3d objects to a numpy array.
+
+    Any objects with ``x``, ``y`` and ``z`` attributes are accepted, e.g. :class:`compas.geometry.Point` and :class:`compas.geometry.Vector`.
+
+    Parameters
+    ----------
+    points : list(:class:`cadwork.point_3d`)
+        The points to convert
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Array of shape ``(N, 3)`` and dtype ``float64``.
+
+    """
+    points = list(points)
+    coordinates = np.fromiter(chain.from_iterable((point.x, point.y, point.z) for point in points), dtype=np.float64, count=3 * len(points))
+    return coordinates.reshape(-1, 3)
+
+
+def array_to_cadwork(array: np.ndarray) -> list:
+    """Convert an ``(N, 3)`` array to a list of cadwork point_3d objects.
+
+    Parameters
+    ----------
+    array : :class:`numpy.ndarray`
+        The coordinates to convert
+
+    Returns
+    -------
+    list(:class:`cadwork.point_3d`)
+
+    """
+    return [point_3d(x, y, z) for x, y, z in np.asarray(array, dtype=np.float64).tolist()]
+
+
+def array_to_points(array: np.ndarray) -> List[Point]:
+    """Convert an ``(N, 3)`` array to a list of :class:`compas.geometry.Point` objects.
+
+    Parameters
+    ----------
+    array : :class:`numpy.ndarray`
+        The coordinates to convert
+
+    Returns
+    -------
+    list(:class:`~compas.geometry.Point`)
+
+    """
+    return [Point(x, y, z) for x, y, z in np.asarray(array, dtype=np.float64).tolist()]
+
+
+def array_to_vectors(array: np.ndarray) -> List[Vector]:
+    """Convert an ``(N, 3)`` array to a list of :class:`compas.geometry.Vector` objects.
+
+    Parameters
+    ----------
+    array : :class:`numpy.ndarray`
+        The coordinates to convert
+
+    Returns
+    -------
+    list(:class:`~compas.geometry.Vector`)
+
+    """
+    return [Vector(x, y, z) for x, y, z in np.asarray(array, dtype=np.float64).tolist()]
+
+
+def array_to_pointcloud(array: np.ndarray) -> Pointcloud:
+    """Convert an ``(N, 3)`` array to a :class:`compas.geometry.Pointcloud`.
+
+    Parameters
+    ----------
+    array : :class:`numpy.ndarray`
+        The coordinates to convert
+
+    Returns
+    -------
+    :class:`~compas.geometry.Pointcloud`
+
+    """
+    return Pointcloud(np.asarray(array, dtype=np.float64).tolist())
@@ -1,3 +1,6 @@
+from typing import Iterable
+from typing import List
+
 try:
     from cadwork import point_3d
 except ImportError:
@@ -56,16 +59,48 @@ def point_to_compas(point):
 
 
 def vector_to_compas(vector):
-    """Convert a cadwork point_3d to a :class:`compas.geometry.Point` obhect.
+    """Convert a cadwork point_3d to a :class:`compas.geometry.Vector` object.
 
     Parameters
     ----------
-    point : :class:`~compas.geometry.Point`
-        The point to convert
+    vector : :class:`cadwork.point_3d`
+        The vector to convert
 
     Returns
     -------
-    :class:`cadwork.point_3d`
+    :class:`~compas.geometry.Vector`
+
+    """
+    return Vector(vector.x, vector.y, vector.z)
+
+
+def points_to_compas(points) -> List[Point]:
+    """Convert a list of cadwork point_3d objects to :class:`compas.geometry.Point` objects.
+
+    Parameters
+    ----------
+    points : list(:class:`cadwork.point_3d`)
+        The points to convert
+
+    Returns
+    -------
+    list(:class:`~compas.geometry.Point`)
+
+    """
+    return [Point(point.x, point.y, point.z) for point in points]
+
+
+def points_to_cadwork(points: Iterable[Point]) -> list:
+    """Convert a list of :class:`compas.geometry.Point` objects to cadwork point_3d objects.
+
+    Parameters
+    ----------
+    points : list(:class:`~compas.geometry.Point`)
+        The points to convert
+
+    Returns
+    -------
+    list(:class:`cadwork.point_3d`)
 
     """
-    return Vector(*point_to_compas(vector))
+    return [point_3d(point.x, point.y, point.z) for point in points]
@@ -1,16 +1,44 @@
+from compas_cadwork._lazy import attach
+
 from .element import Element
 from .element import ElementGroup
+from .element import ElementGroupElements
 from .element import ElementGroupingType
 from .element import ATTR_INSTRUCTION_ID
-from .dimension import Dimension
-from .dimension import AnchorPoint
+from .element import FINGERPRINT_PRECISION
+from .cache import ElementCache
+from .cache import element_cache
+from .observers import ElementObserver
+from .transaction import Transaction
+from .transaction import transaction
 
+# imported on first access, they are not needed to work with single elements
+_LAZY_IMPORTS = {
+    "Dimension": ".dimension",
+    "AnchorPoint": ".dimension",
+    "ElementTable": ".table",
+    "ElementSnapshot": ".table",
+    "AttributeIndex": ".attributes",
+}
 
 __all__ = [
     "Element",
     "ElementGroup",
+    "ElementGroupElements",
     "ElementGroupingType",
     "ATTR_INSTRUCTION_ID",
+    "FINGERPRINT_PRECISION",
     "AnchorPoint",
     "Dimension",
+    "ElementTable",
+    "ElementSnapshot",
+    "ElementCache",
+    "element_cache",
+    "AttributeIndex",
+    "ElementObserver",
+    "Transaction",
+    "transaction",
 ]
+
+
+__getattr__, __dir__ = attach(globals(), _LAZY_IMPORTS)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+import attribute_controller as ac
+import element_controller as ec
+
+from .observers import ElementObserver
+
+
+class AttributeIndex(ElementObserver):
+    """Maps user attribute values to the ids of the elements which have them.
+
+    Each attribute number is indexed with a single scan over the elements the first time it is queried.
+    After that, lookups are answered from memory. Changes made through :meth:`Element.set_attribute`,
+    :meth:`Element.set_is_instruction`, :meth:`Element.remove_attribute` and :meth:`Element.remove` are applied to all
+    live indices automatically. Changes made by other means (e.g. by the user in cadwork) require a call to :meth:`refresh`.
+
+    Parameters
+    ----------
+    element_ids : iterable(int), optional
+        The ids of the elements to index. If None, all identifiable elements of the document at the time of the first scan,
+        and elements whose attributes are set later on. Otherwise, other elements are only added through :meth:`refresh`.
+    attribute_numbers : iterable(int), optional
+        Attribute numbers to index right away. Other numbers are indexed on first use.
+
+    Examples
+    --------
+    >>> index = AttributeIndex(attribute_numbers=[ATTR_INSTRUCTION_ID])
+    >>> list(get_all_elements(index=index))  # doctest: +SKIP
+    >>> index.lookup(5, "Wall")
+    {12, 13, 27}
+
+    """
+
+    def __init__(self, element_ids: Optional[Iterable[int]] = None, attribute_numbers: Optional[Iterable[int]] = None) -> None:
+        super().__init__()
+        # dict is used as an insertion ordered set
+        self._element_ids: Optional[Dict[int, None]] = dict.fromkeys(element_ids) if element_ids is not None else None
+        # an index of the whole document also takes up elements it learns about, e.g. through attribute_set
+        self._whole_document = element_ids is None
+        # attribute number -> value -> element ids
+        self._ids_by_value: Dict[int, Dict[str, Set[int]]] = {}
+        # attribute number -> element id -> value
+        self._value_by_id: Dict[int, Dict[int, str]] = {}
+        for attribute_number in attribute_numbers or ():
+            self._build(attribute_number)
+
+    def __contains__(self, attribute_number: int) -> bool:
+        return attribute_number in self._ids_by_value
+
+    @property
+    def attribute_numbers(self) -> Set[int]:
+        """set(int): The attribute numbers which are currently indexed."""
+        return set(self._ids_by_value)
+
+    def _get_element_ids(self) -> Iterable[int]:
+        if self._element_ids is None:
+            self._element_ids = dict.fromkeys(ec.get_all_identifiable_element_ids())
+        return self._element_ids
+
+    def _build(self, attribute_number: int) -> Dict[str, Set[int]]:
+        ids_by_value = {}
+        value_by_id = {}
+        for element_id in self._get_element_ids():
+            value = ac.get_user_attribute(element_id, attribute_number)
+            value_by_id[element_id] = value
+            ids_by_value.setdefault(value, set()).add(element_id)
+        self._ids_by_value[attribute_number] = ids_by_value
+        self._value_by_id[attribute_number] = value_by_id
+        return ids_by_value
+
+    def _set(self, attribute_number: int, element_id: int, value: str) -> None:
+        value_by_id = self._value_by_id[attribute_number]
+        ids_by_value = self._ids_by_value[attribute_number]
+        old_value = value_by_id.get(element_id)
+        if old_value is not None:
+            ids = ids_by_value[old_value]
+            ids.discard(element_id)
+            if not ids:
+                del ids_by_value[old_value]
+        value_by_id[element_id] = value
+        ids_by_value.setdefault(value, set()).add(element_id)
+
+    def lookup(self, attribute_number: int, value: Optional[str]) -> Set[int]:
+        """Returns the ids of the elements whose user attribute has the given value.
+
+        Parameters
+        ----------
+        attribute_number : int
+            The user attribute number.
+        value : str
+            The value of the user attribute. Elements without the attribute have the value ``""``.
+
+        Returns
+        -------
+        set(int)
+            The element ids. The returned set must not be modified.
+
+        """
+        ids_by_value = self._ids_by_value.get(attribute_number)
+        if ids_by_value is None:
+            ids_by_value = self._build(attribute_number)
+        return ids_by_value.get(value, set())
+
+    def ids_with_attribute(self, attribute_number: int) -> Set[int]:
+        """Returns the ids of the elements which have any non-empty value for the given user attribute.
+
+        Parameters
+        ----------
+        attribute_number : int
+            The user attribute number.
+
+        Returns
+        -------
+        set(int)
+            The element ids.
+
+        """
+        ids_by_value = self._ids_by_value.get(attribute_number)
+        if ids_by_value is None:
+            ids_by_value = self._build(attribute_number)
+        result = set()
+        for value, ids in ids_by_value.items():
+            if value:
+                result.update(ids)
+        return result
+
+    def value_of(self, element_id: int, attribute_number: int) -> Optional[str]:
+        """Returns the indexed value of a user attribute of an element.
+
+        Parameters
+        ----------
+        element_id : int
+            The id of the element.
+        attribute_number : int
+            The user attribute number.
+
+        Returns
+        -------
+        str, optional
+            The value, None if the element is not indexed.
+
+        """
+        if attribute_number not in self._value_by_id:
+            self._build(attribute_number)
+        return self._value_by_id[attribute_number].get(element_id)
+
+    def refresh(self, element_ids: Iterable[int]) -> None:
+        """Re-reads the indexed attributes of the given elements from cadwork.
+
+        Elements which no longer exist in the document are removed from the index.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of added, removed or modified elements.
+
+        """
+        element_ids = list(element_ids)
+        existing_ids = set(ec.get_all_identifiable_element_ids())
+        self.discard(element_id for element_id in element_ids if element_id not in existing_ids)
+
+        current_ids = [element_id for element_id in element_ids if element_id in existing_ids]
+        if self._element_ids is not None:
+            self._element_ids.update(dict.fromkeys(current_ids))
+
+        for attribute_number in self._ids_by_value:
+            for element_id in current_ids:
+                self._set(attribute_number, element_id, ac.get_user_attribute(element_id, attribute_number))
+
+    def discard(self, element_ids: Iterable[int]) -> None:
+        """Removes the given elements from the index.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements to remove.
+
+        """
+        element_ids = set(element_ids)
+        if not element_ids:
+            return
+        if self._element_ids is not None:
+            for element_id in element_ids:
+                self._element_ids.pop(element_id, None)
+        for attribute_number, value_by_id in self._value_by_id.items():
+            ids_by_value = self._ids_by_value[attribute_number]
+            for element_id in element_ids:
+                value = value_by_id.pop(element_id, None)
+                if value is None:
+                    continue
+                ids = ids_by_value[value]
+                ids.discard(element_id)
+                if not ids:
+                    del ids_by_value[value]
+
+    def invalidate(self, attribute_number: Optional[int] = None) -> None:
+        """Discards the index of the given attribute number. It is rebuilt on its next use.
+
+        Parameters
+        ----------
+        attribute_number : int, optional
+            The attribute number to discard. If None, all attribute numbers are discarded.
+
+        """
+        if attribute_number is None:
+            self._ids_by_value.clear()
+            self._value_by_id.clear()
+        else:
+            self._ids_by_value.pop(attribute_number, None)
+            self._value_by_id.pop(attribute_number, None)
+
+    def elements_removed(self, element_ids: List[int]) -> None:
+        self.discard(element_ids)
+
+    def attribute_set(self, element_ids: List[int], attribute_number: int, value: str) -> None:
+        if attribute_number not in self._value_by_id:
+            return
+        if self._whole_document:
+            self._element_ids.update(dict.fromkeys(element_ids))
+        else:
+            element_ids = [element_id for element_id in element_ids if element_id in self._element_ids]
+        for element_id in element_ids:
+            self._set(attribute_number, element_id, value)
+
+    def attribute_removed(self, attribute_number: int) -> None:
+        self.invalidate(attribute_number)
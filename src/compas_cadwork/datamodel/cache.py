@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Optional
+
+_ACTIVE_CACHES: List[ElementCache] = []
+
+
+class ElementCache:
+    """Memoizes :class:`~compas_cadwork.datamodel.Element` property values per element id.
+
+    Use :func:`element_cache` to activate a cache. While active, property reads on any :class:`~compas_cadwork.datamodel.Element`
+    are served from the cache after the first read. Entries of an element are invalidated by :meth:`Element.translate`,
+    :meth:`Element.set_attribute`, :meth:`Element.remove` and :meth:`Element.invalidate`.
+
+    Note
+    ----
+    Cached values are shared between reads. Geometry objects such as frames and points should therefore be copied before being modified.
+
+    Attributes
+    ----------
+    hits : int
+        Number of property reads served from the cache.
+    misses : int
+        Number of property reads which required calls to cadwork.
+
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[int, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"ElementCache(elements={len(self._values)}, hits={self.hits}, misses={self.misses})"
+
+    @property
+    def hit_rate(self) -> float:
+        """float: The fraction of property reads served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, element_id: int, name: str, compute: Callable[[], Any]) -> Any:
+        """Returns the cached value of a property, computing and storing it first if necessary.
+
+        Parameters
+        ----------
+        element_id : int
+            The ID of the element.
+        name : str
+            The name of the property.
+        compute : callable
+            Called without arguments to compute the value on a cache miss.
+
+        Returns
+        -------
+        any
+            The value of the property.
+
+        """
+        values = self._values.setdefault(element_id, {})
+        try:
+            value = values[name]
+        except KeyError:
+            self.misses += 1
+            value = values[name] = compute()
+        else:
+            self.hits += 1
+        return value
+
+    def invalidate(self, element_id: Optional[int] = None) -> None:
+        """Discards cached values.
+
+        Parameters
+        ----------
+        element_id : int, optional
+            The ID of the element whose values to discard. If None, all values are discarded.
+
+        """
+        if element_id is None:
+            self._values.clear()
+        else:
+            self._values.pop(element_id, None)
+
+    def reset_stats(self) -> None:
+        """Resets the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+
+@contextmanager
+def element_cache(cache: Optional[ElementCache] = None) -> Generator[ElementCache, None, None]:
+    """Activates property caching for all :class:`~compas_cadwork.datamodel.Element` instances within the context.
+
+    Parameters
+    ----------
+    cache : :class:`ElementCache`, optional
+        The cache to activate. If None, a new, empty cache is created.
+
+    Yields
+    ------
+    :class:`ElementCache`
+        The active cache.
+
+    Examples
+    --------
+    >>> with element_cache() as cache:
+    ...     for element in get_all_elements():
+    ...         print(element.frame.point, element.frame.xaxis)
+    >>> print(cache.hits, cache.misses)
+
+    """
+    cache = cache if cache is not None else ElementCache()
+    _ACTIVE_CACHES.append(cache)
+    try:
+        yield cache
+    finally:
+        _ACTIVE_CACHES.remove(cache)
+
+
+def invalidate_element(element_id: Optional[int] = None) -> None:
+    """Discards cached values of the given element in all active caches.
+
+    Parameters
+    ----------
+    element_id : int, optional
+        The ID of the element whose values to discard. If None, all values are discarded.
+
+    """
+    for cache in _ACTIVE_CACHES:
+        cache.invalidate(element_id)
+
+
+def cached(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Decorates an :class:`~compas_cadwork.datamodel.Element` property getter to use the active :class:`ElementCache`, if any."""
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self):
+        if not _ACTIVE_CACHES:
+            return func(self)
+        return _ACTIVE_CACHES[-1].get(self.id, name, lambda: func(self))
+
+    return wrapper
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 
 import dimension_controller as dc
@@ -8,9 +9,9 @@ from compas.geometry import Point
 from compas.geometry import Vector
 from compas.tolerance import Tolerance
 
-from compas_cadwork.conversions import point_to_compas
 from compas_cadwork.conversions import vector_to_compas
 
+from .element import FINGERPRINT_PRECISION
 from .element import Element
 
 TOL = Tolerance(unit="MM", absolute=1e-3, relative=1e-3)
@@ -49,19 +50,26 @@ class AnchorPoint:
 
 
 class Dimension(Element):
-    """Represents a cadwork dimension"""
+    """Represents a cadwork dimension
+
+    The anchor points are loaded from cadwork on first access of :attr:`anchors`, :attr:`anchor_values` or any property which depends on them.
+    From then on they are kept, so an instance represents the state of the dimension at the time of first access.
+
+    """
+
+    __slots__ = ("_frame", "_anchor_values", "_anchors")
 
     def __init__(self, id):
         super().__init__(id)
         self._frame = None
-        # not lazy-instantiating this so that it can be used to compare the modified instances of the same dimension
-        # otherwise, the anchors values that are compared depend on the time `anchors` was first accessed
-        self.anchors = self._init_anchors()
+        self._anchor_values = None
+        self._anchors = None
 
     def __str__(self) -> str:
-        return f"Dimension id:{self.id} length:{self.length:.0f} anchors:{len(self.anchors)}"
+        return f"Dimension id:{self.id} length:{self.length:.0f} anchors:{len(self.anchor_values)}"
 
     def __hash__(self):
+        # must not depend on the anchors, they are loaded lazily and may change while the dimension is in a set
         return hash(self.cadwork_guid)
 
     def __eq__(self, other: Dimension):
@@ -71,21 +79,41 @@ class Dimension(Element):
         if self.cadwork_guid != other.cadwork_guid:
             return False
 
-        if len(self.anchors) != len(other.anchors):
+        if len(self.anchor_values) != len(other.anchor_values):
             return False
 
-        for point_self, point_other in zip(self.anchors, other.anchors):
-            if point_self != point_other:
-                return False
+        for values_self, values_other in zip(self.anchor_values, other.anchor_values):
+            for value_self, value_other in zip(values_self, values_other):
+                if not TOL.is_close(value_self, value_other):
+                    return False
         return True
 
+    @property
+    def anchors(self):
+        if self._anchors is None:
+            self._anchors = tuple(AnchorPoint(Point(x, y, z), distance, Vector(dx, dy, dz)) for x, y, z, distance, dx, dy, dz in self.anchor_values)
+        return self._anchors
+
+    @property
+    def anchor_values(self):
+        """tuple(tuple(float)): For each anchor, its location, distance and direction as a flat tuple of 7 floats."""
+        if self._anchor_values is None:
+            self._anchor_values = self._load_anchor_values()
+        return self._anchor_values
+
+    @property
+    def anchor_fingerprint(self) -> int:
+        """int: A compact hash of the anchor values, which can be stored to detect modifications of the dimension."""
+        # rounded to avoid reporting numerical noise as a modification
+        return hash(tuple(tuple(round(value, FINGERPRINT_PRECISION) for value in values) for values in self.anchor_values))
+
     @property
     def frame(self):
         if not self._frame:
             zaxis = -self.text_normal
             xaxis = vector_to_compas(dc.get_plane_xl(self.id))
             yaxis = xaxis.cross(zaxis).unitized()
-            self._frame = Frame(self.anchors[0].location, xaxis, yaxis)
+            self._frame = Frame(Point(*self.anchor_values[0][:3]), xaxis, yaxis)
         return self._frame
 
     @property
@@ -94,14 +122,14 @@ class Dimension(Element):
 
     @property
     def length(self):
-        start: Point = self.anchors[0].location
-        end: Point = self.anchors[-1].location
-        return start.distance_to_point(end)
+        start = self.anchor_values[0][:3]
+        end = self.anchor_values[-1][:3]
+        return math.dist(start, end)
 
-    def _init_anchors(self):
-        anchors = []
+    def _load_anchor_values(self):
+        values = []
         for index, point in enumerate(dc.get_dimension_points(self.id)):
             distance = dc.get_segment_distance(self.id, index)
             direction = dc.get_segment_direction(self.id, index)
-            anchors.append(AnchorPoint(point_to_compas(point), distance, vector_to_compas(direction)))
-        return tuple(anchors)
+            values.append((point.x, point.y, point.z, distance, direction.x, direction.y, direction.z))
+        return tuple(values)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+from array import array
+from collections.abc import MutableSequence
 from dataclasses import dataclass
 from enum import IntEnum
+from typing import Callable
 from typing import Generator
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Union
 
 import attribute_controller as ac
 import bim_controller as bc
@@ -19,10 +25,39 @@ from compas.geometry import Vector
 from compas_cadwork.conversions import point_to_compas
 from compas_cadwork.conversions import vector_to_cadwork
 
+from .cache import cached
+from .cache import invalidate_element
+from .observers import notify_attribute_removed
+from .observers import notify_attribute_set
+from .observers import notify_elements_modified
+from .observers import notify_elements_removed
+from .transaction import current_transaction
+
 
 # These are used to identify instruction elements which were added to the cadwork file by compas_cadwork.
 ATTR_INSTRUCTION_ID = 666
 
+# Number of decimals coordinates and dimensions are rounded to before hashing, so that numerical noise is not reported as a modification.
+FINGERPRINT_PRECISION = 6
+
+
+def _get_grouping_func(grouping_type=None) -> Callable[[int], str]:
+    # the getter of the group or subgroup of an element, depending on the grouping type of the document
+    if grouping_type is None:
+        grouping_type = ac.get_element_grouping_type()
+    if grouping_type == cadwork.element_grouping_type.subgroup:
+        return ac.get_subgroup
+    return ac.get_group
+
+
+def _frame_from_axes(p1, xl, yl) -> Frame:
+    try:
+        return Frame(Point(*p1), Vector(*xl), Vector(*yl))
+    except ZeroDivisionError:
+        # TODO: get to the bottom of this:
+        # sometimes one of the axes comes back as [0,0,0] in the meantime just don't crash
+        return Frame.worldXY()
+
 
 class ElementGroupingType(IntEnum):
     """CADWork Element Grouping Type
@@ -53,10 +88,83 @@ class ElementGroupingType(IntEnum):
         return cadwork.element_grouping_type(self.value)
 
 
-@dataclass
+class ElementGroupElements(MutableSequence):
+    """A list-like view of the Elements of an :class:`ElementGroup`.
+
+    Only the element ids are stored. :class:`Element` objects are created on access.
+    Modifications such as :meth:`append`, :meth:`extend` or item assignment change the members of the group.
+
+    """
+
+    __slots__ = ("_element_ids",)
+
+    def __init__(self, element_ids: array) -> None:
+        self._element_ids = element_ids
+
+    def __len__(self) -> int:
+        return len(self._element_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Element, List[Element]]:
+        if isinstance(index, slice):
+            return [Element(element_id) for element_id in self._element_ids[index]]
+        return Element(self._element_ids[index])
+
+    def __setitem__(self, index: Union[int, slice], value: Union[Element, Iterable[Element]]) -> None:
+        if isinstance(index, slice):
+            self._element_ids[index] = array("q", (element.id for element in value))
+        else:
+            self._element_ids[index] = value.id
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self._element_ids[index]
+
+    def __iter__(self) -> Iterator[Element]:
+        return (Element(element_id) for element_id in self._element_ids)
+
+    def __contains__(self, element: Element) -> bool:
+        return isinstance(element, Element) and element.id in self._element_ids
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ElementGroupElements):
+            return self._element_ids == other._element_ids
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(element == other_element for element, other_element in zip(self, other))
+        return NotImplemented
+
+    def __add__(self, other: Iterable[Element]) -> List[Element]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable[Element]) -> List[Element]:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        return f"ElementGroupElements({self._element_ids.tolist()})"
+
+    def insert(self, index: int, element: Element) -> None:
+        self._element_ids.insert(index, element.id)
+
+    def append(self, element: Element) -> None:
+        self._element_ids.append(element.id)
+
+    def extend(self, elements: Iterable[Element]) -> None:
+        self._element_ids.extend(element.id for element in elements)
+
+    def copy(self) -> List[Element]:
+        """Returns the Elements as a new list.
+
+        Returns
+        -------
+        list(:class:`Element`)
+
+        """
+        return list(self)
+
+
 class ElementGroup:
     """Represents a cadwork Element Group
 
+    The ids of the member elements are stored in a compact array. :class:`Element` objects are only created when accessed through :attr:`elements`.
+
     Parameters
     ----------
     name : str
@@ -68,8 +176,10 @@ class ElementGroup:
     ----------
     name : str
         The name of the Element Group
-    elements : list
-        A list of Elements belonging to the Element Group
+    elements : :class:`ElementGroupElements`
+        A list-like view of the Elements belonging to the Element Group
+    element_ids : array
+        The ids of the Elements belonging to the Element Group
     wall_frame_element : Element, optional
         The containing Element (often a wall element) which contains all other elements in the group. If any.
     ifc_guid : str
@@ -77,23 +187,70 @@ class ElementGroup:
 
     """
 
-    name: str
-    elements: list = None
-    wall_frame_element: Element = None
+    __slots__ = ("name", "wall_frame_element", "_element_ids")
+
+    def __init__(self, name: str, elements: Optional[Iterable[Element]] = None, wall_frame_element: Optional[Element] = None) -> None:
+        self.name = name
+        self.wall_frame_element = wall_frame_element
+        self._element_ids = array("q")
+        self.elements = elements
+
+    def __repr__(self) -> str:
+        return f"ElementGroup(name={self.name!r}, elements={len(self._element_ids)}, wall_frame_element={self.wall_frame_element!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ElementGroup):
+            return NotImplemented
+        return self.name == other.name and self._element_ids == other._element_ids and self.wall_frame_element == other.wall_frame_element
+
+    @classmethod
+    def from_element_ids(cls, name: str, element_ids: Iterable[int], wall_frame_element: Optional[Element] = None) -> ElementGroup:
+        """Creates an Element Group from element ids, without creating intermediate Element objects.
+
+        Parameters
+        ----------
+        name : str
+            The name of the Element Group
+        element_ids : iterable(int)
+            The ids of the Elements belonging to the Element Group
+        wall_frame_element : Element, optional
+            The containing Element of the group, if known.
+
+        Returns
+        -------
+        :class:`ElementGroup`
+
+        """
+        group = cls(name, wall_frame_element=wall_frame_element)
+        group._element_ids = array("q", element_ids)
+        return group
+
+    @property
+    def elements(self) -> ElementGroupElements:
+        return ElementGroupElements(self._element_ids)
+
+    @elements.setter
+    def elements(self, elements: Optional[Iterable[Element]]) -> None:
+        self._element_ids = array("q", (element.id for element in elements or ()))
+
+    @property
+    def element_ids(self) -> array:
+        return self._element_ids
 
     def add_element(self, element: Element) -> None:
         """Adds an Element to the Element Group
 
+        The first framed wall, roof or floor Element added becomes the :attr:`wall_frame_element`.
+        Once it is found, subsequently added Elements are not checked anymore.
+
         Parameters
         ----------
         element : Element
             The Element to add to the Element Group
 
         """
-        if self.elements is None:
-            self.elements = []
-        self.elements.append(element)
-        if element.is_wall or element.is_roof or element.is_floor:
+        self._element_ids.append(element.id)
+        if self.wall_frame_element is None and (element.is_wall or element.is_roof or element.is_floor):
             self.wall_frame_element = element
 
     @property
@@ -107,6 +264,8 @@ class ElementGroup:
 class Element:
     """Represents a cadwork Element
 
+    Property values are read from cadwork on every access, unless an :func:`~compas_cadwork.datamodel.element_cache` is active.
+
     Parameters
     ----------
     id : int
@@ -149,100 +308,111 @@ class Element:
 
     """
 
+    __slots__ = ("id",)
+
     id: int
 
     @property
+    @cached
     def name(self) -> str:
         return ac.get_name(self.id)
 
     @property
+    @cached
     def frame(self) -> Frame:
-        try:
-            p1 = Point(*gc.get_p1(self.id))
-            x_axis = Vector(*gc.get_xl(self.id))
-            y_axis = Vector(*gc.get_yl(self.id))
-            return Frame(p1, x_axis, y_axis)
-        except ZeroDivisionError:
-            # TODO: get to the bottom of this:
-            # sometimes one of the axes comes back as [0,0,0] in the meantime just don't crash
-            return Frame.worldXY()
+        return _frame_from_axes(gc.get_p1(self.id), gc.get_xl(self.id), gc.get_yl(self.id))
 
     @property
+    @cached
     def width(self) -> float:
         return gc.get_width(self.id)
 
     @property
+    @cached
     def height(self) -> float:
         return gc.get_height(self.id)
 
     @property
+    @cached
     def length(self) -> float:
         return gc.get_length(self.id)
 
     @property
+    @cached
     def group(self) -> str:
-        if ac.get_element_grouping_type() == cadwork.element_grouping_type.subgroup:
-            return ac.get_subgroup(self.id)
-        else:
-            return ac.get_group(self.id)
+        return _get_grouping_func()(self.id)
 
     @property
+    @cached
     def ifc_base64_guid(self) -> str:
         return bc.get_ifc_base64_guid(self.id)
 
     @property
+    @cached
     def cadwork_guid(self) -> str:
         return ec.get_element_cadwork_guid(self.id)
 
     @property
+    @cached
     def centerline(self) -> Line:
         p1 = point_to_compas(gc.get_p1(self.id))
         p2 = point_to_compas(gc.get_p2(self.id))
         return Line(p1, p2)
 
     @property
+    @cached
     def midpoint(self) -> Point:
         return self.centerline.midpoint
 
     @property
+    @cached
     def ifc_guid(self) -> str:
         return bc.get_ifc_guid(self.id)
 
     @property
+    @cached
     def is_wall(self) -> bool:
         return ac.is_framed_wall(self.id)
 
     @property
+    @cached
     def is_roof(self) -> bool:
         return ac.is_framed_roof(self.id)
 
     @property
+    @cached
     def is_floor(self) -> bool:
         return ac.is_framed_floor(self.id)
 
     @property
+    @cached
     def is_linear_dimension(self) -> bool:
         type_ = ac.get_element_type(self.id)
         return type_.is_dimension()
 
     @property
+    @cached
     def is_drilling(self) -> bool:
         return ac.is_drilling(self.id)
 
     @property
+    @cached
     def is_opening(self) -> bool:
         return ac.is_opening(self.id)
 
     @property
+    @cached
     def is_instruction(self) -> bool:
         return ac.get_user_attribute(self.id, ATTR_INSTRUCTION_ID) != ""
 
     @property
+    @cached
     def is_gridline(self) -> bool:
         type_ = ac.get_element_type(self.id)
         return type_.is_surface() or "GL_" in self.group
 
     @property
+    @cached
     def is_beam(self) -> bool:
         type_ = ac.get_element_type(self.id)
         return type_.is_rectangular_beam() or type_.is_circular_beam()
@@ -276,10 +446,20 @@ class Element:
         if value is None:
             user_attribute_value = name_or_value
         else:
-            ac.set_user_attribute_name(attribute_number, name_or_value)
             user_attribute_value = value
 
+        transaction = current_transaction()
+        if transaction is not None:
+            if value is not None:
+                transaction.set_attribute_name(attribute_number, name_or_value)
+            transaction.set_attribute(self.id, attribute_number, user_attribute_value)
+            return
+
+        if value is not None:
+            ac.set_user_attribute_name(attribute_number, name_or_value)
         ac.set_user_attribute([self.id], attribute_number, user_attribute_value)
+        invalidate_element(self.id)
+        notify_attribute_set([self.id], attribute_number, user_attribute_value)
 
     # actully this only use the user_attribute number; no pass the elment id
     # I am not sure how it defines which element to remove the attribute from
@@ -294,10 +474,18 @@ class Element:
             The attribute value to remove from the user attribute list.
 
         """
+        transaction = current_transaction()
+        if transaction is not None:
+            transaction.remove_attribute(attribute_number, value)
+            return
+
         if value is None:
             ac.delete_user_attribute(attribute_number)
         else:
             ac.delete_item_from_user_attribute_list(attribute_number, value)
+        # the removal is not scoped to this element, cached values of other elements may be affected as well
+        invalidate_element()
+        notify_attribute_removed(attribute_number)
 
     def set_is_instruction(self, value: bool, instruction_id: Optional[str] = None):
         """Sets the is_instruction attribute on the Element
@@ -336,7 +524,14 @@ class Element:
 
     def remove(self):
         """Removes the Element from the cadwork file"""
+        transaction = current_transaction()
+        if transaction is not None:
+            transaction.remove(self.id)
+            return
+
         ec.delete_elements([self.id])
+        invalidate_element(self.id)
+        notify_elements_removed([self.id])
 
     def translate(self, vector: Vector) -> None:
         """Translates the Element by the given vector.
@@ -347,4 +542,20 @@ class Element:
             The vector by which to translate the Element
 
         """
+        transaction = current_transaction()
+        if transaction is not None:
+            transaction.translate(self.id, vector)
+            return
+
         ec.move_element([self.id], vector_to_cadwork(vector))
+        invalidate_element(self.id)
+        notify_elements_modified([self.id])
+
+    def invalidate(self) -> None:
+        """Discards any cached property values of this Element.
+
+        Only relevant while an :func:`~compas_cadwork.datamodel.element_cache` is active.
+        Call this after modifying the Element by means other than the methods of this class.
+
+        """
+        invalidate_element(self.id)
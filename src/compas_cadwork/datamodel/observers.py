@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Iterable
+from typing import List
+from weakref import WeakSet
+
+_OBSERVERS: WeakSet[ElementObserver] = WeakSet()
+
+
+class ElementObserver:
+    """Base class for objects which are notified about changes made to elements through :class:`~compas_cadwork.datamodel.Element`.
+
+    Instances register themselves on creation and are unregistered when garbage collected.
+    Subclasses override the callbacks they are interested in.
+
+    """
+
+    def __init__(self) -> None:
+        _OBSERVERS.add(self)
+
+    def elements_modified(self, element_ids: List[int]) -> None:
+        """Called after the geometry of the given elements was modified."""
+        pass
+
+    def elements_removed(self, element_ids: List[int]) -> None:
+        """Called after the given elements were deleted from the document."""
+        pass
+
+    def attribute_set(self, element_ids: List[int], attribute_number: int, value: str) -> None:
+        """Called after a user attribute was set on the given elements."""
+        pass
+
+    def attribute_removed(self, attribute_number: int) -> None:
+        """Called after a user attribute was removed."""
+        pass
+
+
+def notify_elements_modified(element_ids: Iterable[int]) -> None:
+    element_ids = list(element_ids)
+    for observer in list(_OBSERVERS):
+        observer.elements_modified(element_ids)
+
+
+def notify_elements_removed(element_ids: Iterable[int]) -> None:
+    element_ids = list(element_ids)
+    for observer in list(_OBSERVERS):
+        observer.elements_removed(element_ids)
+
+
+def notify_attribute_set(element_ids: Iterable[int], attribute_number: int, value: str) -> None:
+    element_ids = list(element_ids)
+    for observer in list(_OBSERVERS):
+        observer.attribute_set(element_ids, attribute_number, value)
+
+
+def notify_attribute_removed(attribute_number: int) -> None:
+    for observer in list(_OBSERVERS):
+        observer.attribute_removed(attribute_number)
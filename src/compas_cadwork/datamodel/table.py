@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+import attribute_controller as ac
+import bim_controller as bc
+import element_controller as ec
+import geometry_controller as gc
+from compas.geometry import Line
+
+from compas_cadwork.conversions import point_to_compas
+
+from .element import ATTR_INSTRUCTION_ID
+from .element import _frame_from_axes
+from .element import _get_grouping_func
+
+
+def _get_instruction_id(element_id: int) -> str:
+    return ac.get_user_attribute(element_id, ATTR_INSTRUCTION_ID)
+
+
+# Raw columns map 1:1 to a cadwork controller getter. Each one is fetched at most once per table,
+# regardless of how many of the requested fields depend on it.
+# The value is a factory so that per-document settings (e.g. the grouping type) are resolved once per table.
+_RAW_COLUMNS: Dict[str, Callable[[], Callable[[int], Any]]] = {
+    "name": lambda: ac.get_name,
+    "group": _get_grouping_func,
+    "p1": lambda: gc.get_p1,
+    "p2": lambda: gc.get_p2,
+    "xl": lambda: gc.get_xl,
+    "yl": lambda: gc.get_yl,
+    "width": lambda: gc.get_width,
+    "height": lambda: gc.get_height,
+    "length": lambda: gc.get_length,
+    "ifc_base64_guid": lambda: bc.get_ifc_base64_guid,
+    "ifc_guid": lambda: bc.get_ifc_guid,
+    "cadwork_guid": lambda: ec.get_element_cadwork_guid,
+    "element_type": lambda: ac.get_element_type,
+    "instruction_id": lambda: _get_instruction_id,
+    "is_wall": lambda: ac.is_framed_wall,
+    "is_roof": lambda: ac.is_framed_roof,
+    "is_floor": lambda: ac.is_framed_floor,
+    "is_drilling": lambda: ac.is_drilling,
+    "is_opening": lambda: ac.is_opening,
+}
+
+
+def _centerline(p1, p2) -> Line:
+    return Line(point_to_compas(p1), point_to_compas(p2))
+
+
+def _is_beam(type_) -> bool:
+    return type_.is_rectangular_beam() or type_.is_circular_beam()
+
+
+def _is_gridline(type_, group) -> bool:
+    return type_.is_surface() or "GL_" in group
+
+
+# Derived fields are computed in Python from one or more raw columns, without additional controller calls.
+_DERIVED_FIELDS: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any]]] = {
+    "frame": (("p1", "xl", "yl"), _frame_from_axes),
+    "centerline": (("p1", "p2"), _centerline),
+    "midpoint": (("p1", "p2"), lambda p1, p2: _centerline(p1, p2).midpoint),
+    "is_beam": (("element_type",), _is_beam),
+    "is_linear_dimension": (("element_type",), lambda type_: type_.is_dimension()),
+    "is_gridline": (("element_type", "group"), _is_gridline),
+    "is_instruction": (("instruction_id",), lambda instruction_id: instruction_id != ""),
+}
+
+# These raw columns only exist to feed derived fields and cannot be requested directly.
+_INTERNAL_COLUMNS = ("p1", "p2", "xl", "yl", "element_type", "instruction_id")
+
+FIELDS = tuple(sorted([name for name in _RAW_COLUMNS if name not in _INTERNAL_COLUMNS] + list(_DERIVED_FIELDS)))
+
+
+class ElementSnapshot:
+    """A read-only record of the values fetched for a single element of an :class:`ElementTable`.
+
+    The requested fields are accessible as attributes with the same names as the corresponding :class:`Element` properties.
+    The record itself only references its row in the table, values are stored column-wise in the table.
+
+    Attributes
+    ----------
+    id : int
+        The ID of the element.
+
+    """
+
+    __slots__ = ("id", "_table", "_row")
+
+    def __init__(self, table: ElementTable, row: int) -> None:
+        self.id = table.ids[row]
+        self._table = table
+        self._row = row
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            column = self._table._columns[name]
+        except KeyError:
+            raise AttributeError(f"Field '{name}' was not fetched for element {self.id}. Fetched fields: {self._table.fields}")
+        return column[self._row]
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._table.fields)
+        return f"ElementSnapshot(id={self.id}, {values})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the fetched values as a dictionary.
+
+        Returns
+        -------
+        dict
+            Dictionary mapping field names to the fetched values, including ``id``.
+
+        """
+        result = {"id": self.id}
+        for field in self._table.fields:
+            result[field] = getattr(self, field)
+        return result
+
+
+class ElementTable:
+    """Fetches a set of properties for many elements in a single, column-oriented pass.
+
+    Reading properties from :class:`Element` makes one or more controller calls per property access.
+    Instead, :class:`ElementTable` fetches each underlying controller value exactly once per element,
+    shares it between all fields which depend on it (e.g. ``frame``, ``centerline`` and ``midpoint`` all use ``p1``)
+    and resolves document-wide settings such as the grouping type only once.
+
+    Parameters
+    ----------
+    element_ids : iterable(int)
+        The IDs of the elements to fetch.
+    fields : iterable(str)
+        The names of the :class:`Element` properties to fetch. See :attr:`ElementTable.FIELDS` for the available fields.
+
+    Attributes
+    ----------
+    ids : list(int)
+        The IDs of the fetched elements, in the order they were given.
+    fields : tuple(str)
+        The names of the fetched fields.
+
+    Examples
+    --------
+    >>> table = ElementTable(ec.get_all_identifiable_element_ids(), ["name", "frame", "group"])
+    >>> for record in table:
+    ...     print(record.id, record.name, record.group)
+
+    """
+
+    FIELDS = FIELDS
+
+    def __init__(self, element_ids: Iterable[int], fields: Iterable[str]) -> None:
+        self.ids: List[int] = list(element_ids)
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(fields))
+
+        unknown = [field for field in self.fields if field not in self.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown element fields: {unknown}. Available fields: {self.FIELDS}")
+
+        self._rows = {element_id: row for row, element_id in enumerate(self.ids)}
+        self._columns: Dict[str, list] = {}
+        self._fetch()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[ElementSnapshot]:
+        return (ElementSnapshot(self, row) for row in range(len(self.ids)))
+
+    def __contains__(self, element_id: int) -> bool:
+        return element_id in self._rows
+
+    def __getitem__(self, element_id: int) -> ElementSnapshot:
+        try:
+            return ElementSnapshot(self, self._rows[element_id])
+        except KeyError:
+            raise KeyError(f"Element {element_id} is not part of this table")
+
+    def _fetch(self) -> None:
+        raw_names = []
+        for field in self.fields:
+            if field in _DERIVED_FIELDS:
+                raw_names.extend(_DERIVED_FIELDS[field][0])
+            else:
+                raw_names.append(field)
+
+        raw = {}
+        for name in dict.fromkeys(raw_names):
+            getter = _RAW_COLUMNS[name]()
+            raw[name] = [getter(element_id) for element_id in self.ids]
+
+        for field in self.fields:
+            if field in _DERIVED_FIELDS:
+                dependencies, builder = _DERIVED_FIELDS[field]
+                self._columns[field] = [builder(*values) for values in zip(*(raw[name] for name in dependencies))]
+            else:
+                self._columns[field] = raw[field]
+
+    def column(self, field: str) -> list:
+        """Returns the fetched values of a field for all elements, in the order of :attr:`ids`.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field.
+
+        Returns
+        -------
+        list
+            The values of the field.
+
+        """
+        try:
+            return self._columns[field]
+        except KeyError:
+            raise KeyError(f"Field '{field}' was not fetched. Fetched fields: {self.fields}")
+
+    def filter(self, field: str, value: Any = True) -> List[int]:
+        """Returns the IDs of the elements for which the given field has the given value.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field.
+        value : any, optional
+            The value to compare with. Defaults to ``True``, which is useful for the ``is_*`` fields.
+
+        Returns
+        -------
+        list(int)
+            The matching element IDs.
+
+        """
+        return [element_id for element_id, field_value in zip(self.ids, self.column(field)) if field_value == value]
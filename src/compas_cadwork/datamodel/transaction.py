@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import attribute_controller as ac
+import element_controller as ec
+from compas.geometry import Vector
+
+from compas_cadwork.conversions import vector_to_cadwork
+
+from .cache import invalidate_element
+from .observers import notify_attribute_removed
+from .observers import notify_attribute_set
+from .observers import notify_elements_modified
+from .observers import notify_elements_removed
+
+_ACTIVE_TRANSACTIONS: List[Transaction] = []
+
+_SET = "set"
+_NAME = "name"
+_REMOVE = "remove"
+
+
+@dataclass
+class _AttributeOperation:
+    # one entry of the ordered log of attribute operations of a transaction
+    operation: str
+    attribute_number: int
+    # the value, name or removed value
+    argument: Optional[str]
+    # dict is used as an insertion ordered set, only used by set operations
+    element_ids: Dict[int, None] = field(default_factory=dict)
+
+
+class Transaction:
+    """Records mutations of :class:`~compas_cadwork.datamodel.Element` objects and applies them together on :meth:`commit`.
+
+    Use :func:`transaction` to activate a transaction. While active, :meth:`Element.translate`, :meth:`Element.set_attribute`,
+    :meth:`Element.remove_attribute` and :meth:`Element.remove` are recorded instead of being sent to cadwork.
+    On commit, the recorded mutations are coalesced and grouped by operation and argument, and each group is applied
+    with one cadwork call:
+
+    * translations of an element are summed up, elements with the same total translation are moved together
+    * user attribute operations are applied in the order they were recorded. Values set for the same attribute are
+      combined into one call per value, and only the last value set for an attribute of an element is kept,
+      unless the attribute was removed in between. Removing an attribute does not discard values recorded before,
+      as cadwork only deletes attributes which are not in use.
+    * elements which are removed are neither moved nor are their attributes set
+
+    Note
+    ----
+    Until the transaction is committed, property values read from elements do not reflect the recorded mutations.
+
+    Attributes
+    ----------
+    calls : int
+        The number of cadwork calls made by :meth:`commit`.
+
+    """
+
+    def __init__(self) -> None:
+        self._translations: Dict[int, Vector] = {}
+        self._attribute_log: List[_AttributeOperation] = []
+        # positions in the attribute log, used to coalesce operations whose order does not matter
+        # (attribute number, value) -> the last entry setting the value
+        self._set_entries: Dict[Tuple[int, str], int] = {}
+        # (element id, attribute number) -> the entry setting the last value of the element
+        self._element_entries: Dict[Tuple[int, int], int] = {}
+        # attribute number -> the last entry setting the name
+        self._name_entries: Dict[int, int] = {}
+        # attribute number -> the last entry removing the attribute or one of its values, operations are not moved across it
+        self._barriers: Dict[int, int] = {}
+        # dict is used as an insertion ordered set
+        self._removed: Dict[int, None] = {}
+        self._closed = False
+        self.calls = 0
+
+    def __len__(self) -> int:
+        attribute_operations = sum(len(entry.element_ids) if entry.operation == _SET else 1 for entry in self._attribute_log)
+        return len(self._translations) + attribute_operations + len(self._removed)
+
+    def __repr__(self) -> str:
+        return f"Transaction(pending={len(self)}, closed={self._closed})"
+
+    @property
+    def is_closed(self) -> bool:
+        """bool: True once the transaction was committed, or discarded because its context exited with an exception."""
+        return self._closed
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("The transaction was already closed.")
+
+    def translate(self, element_id: int, vector: Vector) -> None:
+        """Records a translation of an element.
+
+        Parameters
+        ----------
+        element_id : int
+            The ID of the element.
+        vector : :class:`~compas.geometry.Vector`
+            The translation vector.
+
+        """
+        self._check_open()
+        previous = self._translations.get(element_id)
+        self._translations[element_id] = Vector(*vector) if previous is None else previous + vector
+
+    def set_attribute(self, element_id: int, attribute_number: int, value: str) -> None:
+        """Records setting a user attribute of an element.
+
+        Parameters
+        ----------
+        element_id : int
+            The ID of the element.
+        attribute_number : int
+            The number of the user attribute.
+        value : str
+            The value of the user attribute.
+
+        """
+        self._check_open()
+        log = self._attribute_log
+        barrier = self._barriers.get(attribute_number, -1)
+        previous = self._element_entries.get((element_id, attribute_number))
+        if previous is not None and previous > barrier:
+            # the previous value is overwritten before anything could depend on it
+            del log[previous].element_ids[element_id]
+
+        position = self._set_entries.get((attribute_number, value))
+        if position is None or position < barrier:
+            position = len(log)
+            log.append(_AttributeOperation(_SET, attribute_number, value))
+            self._set_entries[(attribute_number, value)] = position
+        log[position].element_ids[element_id] = None
+        self._element_entries[(element_id, attribute_number)] = position
+
+    def set_attribute_name(self, attribute_number: int, name: str) -> None:
+        """Records setting the name of a user attribute.
+
+        Parameters
+        ----------
+        attribute_number : int
+            The number of the user attribute.
+        name : str
+            The name of the user attribute.
+
+        """
+        self._check_open()
+        position = self._name_entries.get(attribute_number)
+        if position is not None and position > self._barriers.get(attribute_number, -1):
+            self._attribute_log[position].argument = name
+            return
+        self._name_entries[attribute_number] = len(self._attribute_log)
+        self._attribute_log.append(_AttributeOperation(_NAME, attribute_number, name))
+
+    def remove_attribute(self, attribute_number: int, value: Optional[str] = None) -> None:
+        """Records removing a user attribute, or one of its values, from the document.
+
+        Like in cadwork, values of the attribute recorded before are kept, and the attribute is only deleted if it is not in use on commit.
+
+        Parameters
+        ----------
+        attribute_number : int
+            The number of the user attribute.
+        value : str, optional
+            The attribute value to remove from the user attribute list. If None, the attribute is removed.
+
+        """
+        self._check_open()
+        log = self._attribute_log
+        if log and log[-1] == _AttributeOperation(_REMOVE, attribute_number, value):
+            return
+        self._barriers[attribute_number] = len(log)
+        log.append(_AttributeOperation(_REMOVE, attribute_number, value))
+
+    def remove(self, element_id: int) -> None:
+        """Records removing an element from the document.
+
+        Parameters
+        ----------
+        element_id : int
+            The ID of the element.
+
+        """
+        self._check_open()
+        self._removed[element_id] = None
+
+    def rollback(self) -> None:
+        """Discards all mutations recorded so far. Mutations recorded afterwards are committed as usual."""
+        self._translations.clear()
+        self._attribute_log.clear()
+        self._set_entries.clear()
+        self._element_entries.clear()
+        self._name_entries.clear()
+        self._barriers.clear()
+        self._removed.clear()
+
+    def commit(self) -> None:
+        """Applies the recorded mutations with one cadwork call per operation and argument, with the automatic refresh suspended.
+
+        Called when the context of :func:`transaction` exits without an exception.
+
+        """
+        # imported here, as compas_cadwork.utilities depends on this package
+        from compas_cadwork.utilities.refresh import suspended_refresh
+
+        self._check_open()
+        self._closed = True
+
+        translations: Dict[Tuple[float, float, float], List[int]] = {}
+        for element_id, vector in self._translations.items():
+            if element_id not in self._removed:
+                translations.setdefault(tuple(vector), []).append(element_id)
+        attribute_log = []
+        for entry in self._attribute_log:
+            element_ids = [element_id for element_id in entry.element_ids if element_id not in self._removed]
+            if entry.operation != _SET or element_ids:
+                attribute_log.append((entry.operation, entry.attribute_number, entry.argument, element_ids))
+        removed = list(self._removed)
+        self.rollback()
+
+        with suspended_refresh():
+            for operation, attribute_number, argument, element_ids in attribute_log:
+                if operation == _NAME:
+                    ac.set_user_attribute_name(attribute_number, argument)
+                    self.calls += 1
+                elif operation == _REMOVE:
+                    if argument is None:
+                        ac.delete_user_attribute(attribute_number)
+                    else:
+                        ac.delete_item_from_user_attribute_list(attribute_number, argument)
+                    self.calls += 1
+                    invalidate_element()
+                    notify_attribute_removed(attribute_number)
+                else:
+                    ac.set_user_attribute(element_ids, attribute_number, argument)
+                    self.calls += 1
+                    for element_id in element_ids:
+                        invalidate_element(element_id)
+                    notify_attribute_set(element_ids, attribute_number, argument)
+            for vector, element_ids in translations.items():
+                ec.move_element(element_ids, vector_to_cadwork(Vector(*vector)))
+                self.calls += 1
+                for element_id in element_ids:
+                    invalidate_element(element_id)
+                notify_elements_modified(element_ids)
+            if removed:
+                ec.delete_elements(removed)
+                self.calls += 1
+                for element_id in removed:
+                    invalidate_element(element_id)
+                notify_elements_removed(removed)
+
+    def _close(self) -> None:
+        self.rollback()
+        self._closed = True
+
+
+def current_transaction() -> Optional[Transaction]:
+    """Returns the active transaction, if any.
+
+    Returns
+    -------
+    :class:`Transaction`, optional
+
+    """
+    return _ACTIVE_TRANSACTIONS[-1] if _ACTIVE_TRANSACTIONS else None
+
+
+@contextmanager
+def transaction() -> Generator[Transaction, None, None]:
+    """Records mutations of elements within the context and applies them in batches when the context exits.
+
+    If the context exits with an exception, the recorded mutations are discarded and nothing is sent to cadwork.
+    A nested context joins the transaction of the outermost one. See :class:`Transaction` for details.
+
+    Yields
+    ------
+    :class:`Transaction`
+        The active transaction.
+
+    Examples
+    --------
+    >>> with transaction() as tx:
+    ...     for element in elements:
+    ...         element.translate(Vector(0, 0, 100))
+    ...         element.set_attribute(5, "moved")
+    >>> tx.calls
+    2
+
+    """
+    if _ACTIVE_TRANSACTIONS:
+        yield _ACTIVE_TRANSACTIONS[-1]
+        return
+
+    tx = Transaction()
+    _ACTIVE_TRANSACTIONS.append(tx)
+    try:
+        yield tx
+    except BaseException:
+        _ACTIVE_TRANSACTIONS.remove(tx)
+        tx._close()
+        raise
+    _ACTIVE_TRANSACTIONS.remove(tx)
+    tx.commit()
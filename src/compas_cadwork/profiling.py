@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import types
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# the cadwork modules whose calls are recorded
+CONTROLLER_MODULES = (
+    "attribute_controller",
+    "bim_controller",
+    "dimension_controller",
+    "element_controller",
+    "geometry_controller",
+    "utility_controller",
+    "visualization_controller",
+)
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class FunctionStats:
+    """Calls of a single controller function recorded by :func:`profile_bridge`.
+
+    Attributes
+    ----------
+    name : str
+        The name of the function, e.g. ``"element_controller.get_p1"``.
+    calls : int
+        Number of calls.
+    total_time : float
+        Cumulative time in seconds spent in the function.
+    latencies : array
+        The duration in seconds of each call.
+    callers : dict(str, int)
+        Number of calls by the ``compas_cadwork`` API which made them, e.g. ``"get_element_groups"`` or ``"BeamSceneObject.draw"``.
+
+    """
+
+    name: str
+    calls: int = 0
+    total_time: float = 0.0
+    latencies: array = field(default_factory=lambda: array("d"), repr=False)
+    callers: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_time(self) -> float:
+        """float: The mean duration of a call in seconds."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Returns the given percentile of the call durations, using the nearest-rank method.
+
+        Parameters
+        ----------
+        q : float
+            The percentile, between 0 and 100.
+
+        Returns
+        -------
+        float
+            The duration in seconds.
+
+        """
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        rank = max(int(-(-q * len(latencies) // 100)), 1)
+        return latencies[min(rank, len(latencies)) - 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"calls": self.calls, "total_time": self.total_time, "mean_time": self.mean_time}
+        result.update({f"p{q}": self.percentile(q) for q in PERCENTILES})
+        result["max_time"] = max(self.latencies, default=0.0)
+        result["callers"] = dict(sorted(self.callers.items(), key=lambda item: -item[1]))
+        return result
+
+
+@dataclass
+class BridgeStats:
+    """Controller calls recorded by :func:`profile_bridge`.
+
+    Attributes
+    ----------
+    functions : dict(str, :class:`FunctionStats`)
+        The statistics of each called controller function.
+    wall_time : float
+        Time in seconds the profile was active.
+
+    """
+
+    functions: Dict[str, FunctionStats] = field(default_factory=dict)
+    wall_time: float = 0.0
+
+    @property
+    def total_calls(self) -> int:
+        """int: The number of calls to all controller functions."""
+        return sum(stats.calls for stats in self.functions.values())
+
+    @property
+    def total_time(self) -> float:
+        """float: The time in seconds spent in all controller functions."""
+        return sum(stats.total_time for stats in self.functions.values())
+
+    def record(self, name: str, elapsed: float, caller: str) -> None:
+        """Records a single call.
+
+        Parameters
+        ----------
+        name : str
+            The name of the controller function.
+        elapsed : float
+            The duration of the call in seconds.
+        caller : str
+            The ``compas_cadwork`` API which made the call.
+
+        """
+        stats = self.functions.get(name)
+        if stats is None:
+            stats = self.functions[name] = FunctionStats(name)
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.latencies.append(elapsed)
+        stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+    def by_caller(self) -> Dict[str, int]:
+        """Returns the number of controller calls made by each ``compas_cadwork`` API, most first.
+
+        Returns
+        -------
+        dict(str, int)
+
+        """
+        calls: Dict[str, int] = {}
+        for stats in self.functions.values():
+            for caller, count in stats.callers.items():
+                calls[caller] = calls.get(caller, 0) + count
+        return dict(sorted(calls.items(), key=lambda item: -item[1]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the statistics as a JSON serializable dictionary.
+
+        Returns
+        -------
+        dict
+
+        """
+        functions = sorted(self.functions.values(), key=lambda stats: -stats.total_time)
+        return {
+            "wall_time": self.wall_time,
+            "total_calls": self.total_calls,
+            "total_time": self.total_time,
+            "functions": {stats.name: stats.to_dict() for stats in functions},
+            "callers": self.by_caller(),
+        }
+
+    def dump(self, filepath: str) -> None:
+        """Writes the statistics to a JSON file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path of the file.
+
+        """
+        with open(filepath, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def report(self, top: int = 20) -> str:
+        """Returns a table of the controller functions which took the most time.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of functions to list.
+
+        Returns
+        -------
+        str
+
+        """
+        lines = [f"{'function':<50} {'calls':>8} {'total ms':>10} {'p50 ms':>8} {'p99 ms':>8}  top caller"]
+        for stats in sorted(self.functions.values(), key=lambda stats: -stats.total_time)[:top]:
+            caller = max(stats.callers, key=stats.callers.get)
+            lines.append(f"{stats.name:<50} {stats.calls:>8} {stats.total_time * 1e3:>10.2f} {stats.percentile(50) * 1e3:>8.3f} {stats.percentile(99) * 1e3:>8.3f}  {caller}")
+        lines.append(f"{self.total_calls} calls, {self.total_time * 1e3:.2f} ms in cadwork, {self.wall_time * 1e3:.2f} ms wall time")
+        return "\n".join(lines)
+
+
+_ACTIVE: List[BridgeStats] = []
+_LOCK = threading.Lock()
+# (module, attribute name, original controller module) of each patched reference
+_PATCHED: List[Tuple[types.ModuleType, str, types.ModuleType]] = []
+
+
+def _is_own_frame(frame) -> bool:
+    module = frame.f_globals.get("__name__", "")
+    return module.startswith("compas_cadwork") and module != __name__
+
+
+def _is_bridge_frame(frame) -> bool:
+    return frame.f_globals.get("__name__", "") == "compas_cadwork.bridge"
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    if code.co_argcount and code.co_varnames[0] in ("self", "cls"):
+        owner = frame.f_locals.get(code.co_varnames[0])
+        if owner is not None:
+            owner = owner if isinstance(owner, type) else type(owner)
+            return f"{owner.__name__}.{code.co_name}"
+    return getattr(code, "co_qualname", code.co_name)
+
+
+def _api_caller(frame) -> str:
+    # the outermost compas_cadwork frame of the innermost contiguous run of compas_cadwork frames,
+    # i.e. the API which was called from user code (or from compas, e.g. by Scene.draw)
+    # frames of the BridgeExecutor end a run as well, so that calls made by a job are attributed to the job function
+    api = None
+    while frame is not None:
+        if _is_bridge_frame(frame):
+            if api is not None:
+                break
+        elif _is_own_frame(frame):
+            api = frame
+        elif api is not None:
+            break
+        frame = frame.f_back
+    return _frame_name(api) if api is not None else "<external>"
+
+
+def _instrument(name: str, func: Callable) -> Callable:
+    def wrapper(*args, **kwargs):
+        # functions captured while profiling, e.g. stored on an object, keep the wrapper after the scope ends
+        if not _ACTIVE:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            caller = _api_caller(sys._getframe(1))
+            with _LOCK:
+                for stats in _ACTIVE:
+                    stats.record(name, elapsed, caller)
+
+    wrapper.__name__ = getattr(func, "__name__", name)
+    wrapper.__doc__ = getattr(func, "__doc__", None)
+    return wrapper
+
+
+class _ProfiledModule:
+    """Stands in for a controller module while profiling, instrumenting its functions on first access."""
+
+    def __init__(self, module: types.ModuleType) -> None:
+        self._module = module
+        self._attributes: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._attributes[name]
+        except KeyError:
+            pass
+        value = getattr(self._module, name)
+        if callable(value) and not isinstance(value, type):
+            value = _instrument(f"{self._module.__name__}.{name}", value)
+        self._attributes[name] = value
+        return value
+
+
+def _patch() -> None:
+    proxies: Dict[str, _ProfiledModule] = {}
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not module_name.startswith("compas_cadwork") or module_name == __name__:
+            continue
+        for attribute, value in list(vars(module).items()):
+            if isinstance(value, types.ModuleType) and value.__name__ in CONTROLLER_MODULES:
+                proxy = proxies.get(value.__name__)
+                if proxy is None:
+                    proxy = proxies[value.__name__] = _ProfiledModule(value)
+                setattr(module, attribute, proxy)
+                _PATCHED.append((module, attribute, value))
+
+
+def _unpatch() -> None:
+    while _PATCHED:
+        module, attribute, original = _PATCHED.pop()
+        setattr(module, attribute, original)
+
+
+def is_profiling() -> bool:
+    """Returns True if called within a :func:`profile_bridge` scope.
+
+    Returns
+    -------
+    bool
+
+    """
+    return bool(_ACTIVE)
+
+
+@contextmanager
+def profile_bridge(filepath: Optional[str] = None) -> Generator[BridgeStats, None, None]:
+    """Records the calls made by ``compas_cadwork`` to the cadwork controller modules for the duration of the context.
+
+    For each controller function, the number of calls, the cumulative time and the duration of each call are recorded,
+    together with the ``compas_cadwork`` API which made the call, e.g. ``get_element_groups`` or ``BeamSceneObject.draw``.
+
+    While active, the controller modules referenced by the modules of ``compas_cadwork`` are replaced with instrumented
+    stand-ins, which are removed again on exit. Controller functions which were looked up within the context and kept,
+    e.g. by an :class:`~compas_cadwork.utilities.ElementCatalog` built within it, remain wrapped, but only record calls
+    while a context is active.
+    Modules of ``compas_cadwork`` which are first imported within the context are not instrumented.
+
+    Scopes can be nested, each records all calls made within it.
+
+    Parameters
+    ----------
+    filepath : str, optional
+        If given, the statistics are written to this JSON file on exit.
+
+    Yields
+    ------
+    :class:`BridgeStats`
+
+    Examples
+    --------
+    >>> with profile_bridge("profile.json") as stats:
+    ...     groups = get_element_groups()
+    >>> print(stats.report())
+    >>> stats.functions["attribute_controller.get_group"].percentile(99)
+
+    """
+    stats = BridgeStats()
+    with _LOCK:
+        if not _ACTIVE:
+            _patch()
+        _ACTIVE.append(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.wall_time = time.perf_counter() - start
+        with _LOCK:
+            _ACTIVE.remove(stats)
+            if not _ACTIVE:
+                _unpatch()
+        if filepath:
+            stats.dump(filepath)
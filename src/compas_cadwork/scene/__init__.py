@@ -1,38 +1,85 @@
 from compas.plugins import plugin
 from compas.scene import register
 
-from compas_timber.elements import Beam
+from compas_cadwork._lazy import attach
 
-from .camera import Camera
-from .scene import CadworkSceneObject
-from .instructionobject import Text3dSceneObject
-from .instructionobject import LinearDimensionSceneObject
-from .beamobject import BeamSceneObject
+# The contents of this package are imported on first access, so that loading the plugin through ``__all_plugins__``
+# does not import compas_timber or the rest of compas_cadwork before a scene is actually used.
+_LAZY_IMPORTS = {
+    "Camera": ".camera",
+    "CameraKeyframe": ".camera",
+    "CameraPath": ".camera",
+    "CameraPathStats": ".camera",
+    "DrawnElementRegistry": ".registry",
+    "get_registry": ".registry",
+    "share_registry": ".registry",
+    "CadworkSceneObject": ".scene",
+    "clear_drawn_elements": ".scene",
+    "DrawBatch": ".scene",
+    "batch_draw": ".scene",
+    "begin_batch": ".scene",
+    "end_batch": ".scene",
+    "Text3dSceneObject": ".instructionobject",
+    "LinearDimensionSceneObject": ".instructionobject",
+    "BeamSceneObject": ".beamobject",
+}
 
 __all__ = [
     "Camera",
+    "CameraKeyframe",
+    "CameraPath",
+    "CameraPathStats",
     "CadworkSceneObject",
     "Text3dSceneObject",
     "LinearDimensionSceneObject",
     "BeamSceneObject",
+    "DrawBatch",
+    "DrawnElementRegistry",
+    "batch_draw",
+    "begin_batch",
+    "end_batch",
+    "clear_drawn_elements",
+    "get_registry",
+    "share_registry",
 ]
 
 
+__getattr__, __dir__ = attach(globals(), _LAZY_IMPORTS)
+
+
 CONTEXT = "cadwork"
 
 
 @plugin(category="drawing-utils", requires=[CONTEXT])
-def clear(*args, **kwargs):
-    CadworkSceneObject.clear()
+def clear(guids=None, *args, **kwargs):
+    from .scene import clear_drawn_elements
+
+    clear_drawn_elements(guids)
+
+
+@plugin(category="drawing-utils", requires=[CONTEXT])
+def before_draw(*args, **kwargs):
+    from .scene import _begin_scene_batch
+
+    _begin_scene_batch()
 
 
 @plugin(category="drawing-utils", requires=[CONTEXT])
 def after_draw(*args, **kwargs):
-    CadworkSceneObject.refresh()
+    from .scene import _end_scene_batch
+
+    _end_scene_batch()
 
 
 @plugin(category="factories", requires=[CONTEXT])
 def register_scene_objects():
+    # called by compas when the first scene object is created in the cadwork context
+    from compas_timber.elements import Beam
+
+    from .beamobject import BeamSceneObject
+    from .instructionobject import LinearDimensionSceneObject
+    from .instructionobject import Text3dSceneObject
+
     register(Beam, BeamSceneObject, context=CONTEXT)
     try:
         from compas_monosashi.sequencer import Text3d
@@ -1,4 +1,3 @@
-import attribute_controller as ac
 import element_controller as ec
 from compas_timber.elements import Beam
 
@@ -20,7 +19,15 @@ class BeamSceneObject(CadworkSceneObject):
     def __init__(self, item: Beam, **kwargs) -> None:
         super().__init__(item)
 
-    def draw(self):
+    def content_hash(self):
+        beam = self._item
+        frame = beam.frame
+        return self._rounded(beam.width, beam.height, beam.length, frame.xaxis, frame.normal)
+
+    def content_position(self):
+        return self._item.frame.point
+
+    def draw_elements(self):
         """Draw the beam object in the scene.
 
         Returns
@@ -33,7 +40,15 @@ class BeamSceneObject(CadworkSceneObject):
         xaxis = vector_to_cadwork(beam.frame.xaxis)
         zaxis = vector_to_cadwork(beam.frame.normal)
         element_id = ec.create_rectangular_beam_vectors(beam.width, beam.height, beam.length, origin, xaxis, zaxis)
-        beam.attributes["cadwork_id"] = element_id
-        beam.attributes["name"] = f"beam_{beam.guid}"
-        ac.set_name([element_id], beam.attributes["name"])
+        self.add_element(element_id)
+        self.set_element_name(element_id, f"beam_{beam.guid}")
         return [element_id]
+
+    def elements_taken_over(self, element_ids):
+        # the name contains the guid of the beam, which is new if the beam was created again
+        self.set_element_name(element_ids[0], f"beam_{self._item.guid}")
+
+    def item_drawn(self, element_ids):
+        beam = self._item
+        beam.attributes["cadwork_id"] = element_ids[0]
+        beam.attributes["name"] = f"beam_{beam.guid}"
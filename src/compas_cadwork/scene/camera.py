@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Generator
+from typing import List
+from typing import Optional
 
 import cadwork
 import visualization_controller as vc
@@ -16,6 +23,7 @@ from compas_cadwork.conversions import point_to_cadwork
 from compas_cadwork.conversions import point_to_compas
 from compas_cadwork.conversions import vector_to_cadwork
 from compas_cadwork.conversions import vector_to_compas
+from compas_cadwork.utilities import suspended_refresh
 
 
 class ProjectionType(Enum):
@@ -108,6 +116,8 @@ class Camera(Data):
         self._fheight = fheight
         self._target = target
         self._projection_type = projection_type
+        self._batch_depth = 0
+        self._is_apply_pending = False
 
     def __repr__(self) -> str:
         return f"Camera({self._frame}, {self._fov}, {self._fwidth}, {self._fheight}, {self._target}, {self._projection_type})"
@@ -217,27 +227,304 @@ class Camera(Data):
         self._fheight = cam_data.get_field_height()
         self._projection_type = ProjectionType(cam_data.get_projection_type())
 
+    @contextmanager
+    def batch(self) -> Generator[Camera, None, None]:
+        """Applies all changes made to the camera within the context at once, when the outermost batch exits.
+
+        Yields
+        ------
+        :class:`Camera`
+            This camera.
+
+        Examples
+        --------
+        >>> with camera.batch():
+        ...     camera.position = Point(10, 0, 5)
+        ...     camera.target = Point(0, 0, 0)
+
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0 and self._is_apply_pending:
+            self.apply_camera()
+
+    def update(
+        self,
+        position: Optional[Point] = None,
+        target: Optional[Point] = None,
+        up_vector: Optional[Vector] = None,
+        fov: Optional[float] = None,
+        fov_width: Optional[float] = None,
+        fov_height: Optional[float] = None,
+        projection_type: Optional[ProjectionType] = None,
+    ) -> None:
+        """Changes any of the given camera settings and applies them once.
+
+        Parameters
+        ----------
+        position : Point, optional
+            The new position of the camera.
+        target : Point, optional
+            The new point the camera is looking at.
+        up_vector : Vector, optional
+            The new up vector, in the same sense as in :meth:`look_at`. Unlike :meth:`look_at`, it does not have to be
+            orthogonal to the camera-to-target vector.
+        fov : float, optional
+            The new field of view.
+        fov_width : float, optional
+            The new field width.
+        fov_height : float, optional
+            The new field height.
+        projection_type : ProjectionType, optional
+            The new projection type.
+
+        """
+        with self.batch():
+            if position is not None:
+                self._frame.point = position.copy()
+            if target is not None:
+                self._target = target.copy()
+            if up_vector is not None:
+                self._frame = self._frame_from_camera_data(self.position, self._target, up_vector)
+            if fov is not None:
+                self._fov = fov
+            if fov_width is not None:
+                self._fwidth = fov_width
+            if fov_height is not None:
+                self._fheight = fov_height
+            if projection_type is not None:
+                self._projection_type = projection_type
+            self._is_apply_pending = True
+
     def apply_camera(self) -> None:
-        """Apply the camera settings to the currently active cadwork document."""
-        cam_data: cadwork.camera_data = vc.get_camera_data()
-        cam_data.set_position(point_to_cadwork(self.position))
-        cam_data.set_target(point_to_cadwork(self._target))
-        cam_data.set_up_vector(vector_to_cadwork(self.up_vector))
-        cam_data.set_field_of_view(self._fov)
-        cam_data.set_field_width(self._fwidth)
-        cam_data.set_field_height(self._fheight)
-        cam_data.set_projection_type(cadwork.projection_type(self._projection_type.value))
-        vc.set_camera_data(cam_data)
-        vc.refresh()
+        """Apply the camera settings to the currently active cadwork document.
+
+        Within a :meth:`batch`, the settings are applied when the outermost batch exits.
+        The viewport is refreshed once, when the outermost :func:`~compas_cadwork.utilities.suspended_refresh` scope exits.
+
+        """
+        if self._batch_depth:
+            self._is_apply_pending = True
+            return
+        self._is_apply_pending = False
+        with suspended_refresh():
+            cam_data: cadwork.camera_data = vc.get_camera_data()
+            cam_data.set_position(point_to_cadwork(self.position))
+            cam_data.set_target(point_to_cadwork(self._target))
+            cam_data.set_up_vector(vector_to_cadwork(self.up_vector))
+            cam_data.set_field_of_view(self._fov)
+            cam_data.set_field_width(self._fwidth)
+            cam_data.set_field_height(self._fheight)
+            cam_data.set_projection_type(cadwork.projection_type(self._projection_type.value))
+            vc.set_camera_data(cam_data)
 
     def zoom_active_element(self) -> None:
         """Zoom the camera to the currently active element."""
-        vc.zoom_active_elements()
-        vc.refresh()
+        with suspended_refresh():
+            vc.zoom_active_elements()
         self.reload_camera()
 
     def reset_view(self) -> None:
         """Reset the camera to the standard axonometric view."""
-        vc.show_view_standard_axo()
-        vc.refresh()
+        with suspended_refresh():
+            vc.show_view_standard_axo()
         self.reload_camera()
+
+
+def _lerp(a: float, b: float, t: float) -> float:
+    return a + (b - a) * t
+
+
+@dataclass
+class CameraKeyframe:
+    """A camera state along a :class:`CameraPath`.
+
+    Attributes
+    ----------
+    position : Point
+        The position of the camera.
+    target : Point
+        The point the camera is looking at.
+    up_vector : Vector
+        The up vector, in the same sense as in :meth:`Camera.look_at`.
+    fov : float, optional
+        The field of view. If None, the field of view of the camera is not changed.
+    duration : float
+        Time in seconds to move from the previous keyframe to this one. Ignored for the first keyframe.
+
+    """
+
+    position: Point
+    target: Point
+    up_vector: Vector
+    fov: Optional[float] = None
+    duration: float = 1.0
+
+    @classmethod
+    def from_camera(cls, camera: Camera, duration: float = 1.0) -> CameraKeyframe:
+        """Creates a keyframe from the current state of a camera.
+
+        Parameters
+        ----------
+        camera : :class:`Camera`
+            The camera.
+        duration : float, optional
+            Time in seconds to move from the previous keyframe to this one.
+
+        Returns
+        -------
+        :class:`CameraKeyframe`
+
+        """
+        # the camera frame's z-axis points opposite to the up vector passed to look_at
+        return cls(camera.position.copy(), camera.target.copy(), camera.up_vector.inverted(), camera.fov, duration)
+
+
+@dataclass
+class CameraPathStats:
+    """Timing statistics of a :meth:`CameraPath.play`.
+
+    Attributes
+    ----------
+    frames : int
+        The number of frames applied to the camera.
+    dropped_frames : int
+        The number of frames skipped to keep up with the frame rate.
+    duration : float
+        Time in seconds the playback took.
+    mean_frame_time : float
+        Average time in seconds it took to apply a frame.
+    max_frame_time : float
+        Longest time in seconds it took to apply a frame.
+
+    """
+
+    frames: int = 0
+    dropped_frames: int = 0
+    duration: float = 0.0
+    mean_frame_time: float = 0.0
+    max_frame_time: float = 0.0
+
+    @property
+    def fps(self) -> float:
+        """float: The achieved frame rate."""
+        return self.frames / self.duration if self.duration else 0.0
+
+
+class CameraPath:
+    """A camera animation through a list of keyframes, with all intermediate frames precomputed.
+
+    Positions, targets, up vectors and fields of view are interpolated linearly between keyframes.
+
+    Parameters
+    ----------
+    keyframes : list(:class:`CameraKeyframe`)
+        At least one keyframe.
+    fps : float, optional
+        The target frame rate.
+
+    Attributes
+    ----------
+    frames : list(:class:`CameraKeyframe`)
+        The precomputed frames, one for each frame of the animation.
+
+    Examples
+    --------
+    >>> start = CameraKeyframe.from_camera(camera)
+    >>> end = CameraKeyframe(position, element.midpoint, Vector.Zaxis(), duration=2.0)
+    >>> stats = CameraPath([start, end], fps=30).play(camera)
+    >>> stats.fps
+    29.8
+
+    """
+
+    def __init__(self, keyframes: List[CameraKeyframe], fps: float = 30.0) -> None:
+        if not keyframes:
+            raise ValueError("A camera path needs at least one keyframe.")
+        self.keyframes = list(keyframes)
+        self.fps = fps
+        self.frames = self._interpolate()
+
+    @property
+    def duration(self) -> float:
+        """float: The duration of the animation in seconds."""
+        return sum(keyframe.duration for keyframe in self.keyframes[1:])
+
+    def _interpolate(self) -> List[CameraKeyframe]:
+        frames = [self.keyframes[0]]
+        for start, end in zip(self.keyframes, self.keyframes[1:]):
+            count = max(1, round(end.duration * self.fps))
+            fov = start.fov if start.fov is not None and end.fov is not None else None
+            for i in range(1, count + 1):
+                t = i / count
+                frames.append(
+                    CameraKeyframe(
+                        start.position + (end.position - start.position) * t,
+                        start.target + (end.target - start.target) * t,
+                        (start.up_vector + (end.up_vector - start.up_vector) * t).unitized(),
+                        _lerp(fov, end.fov, t) if fov is not None else end.fov,
+                        1.0 / self.fps,
+                    )
+                )
+        return frames
+
+    def play(
+        self,
+        camera: Camera,
+        drop_frames: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> CameraPathStats:
+        """Applies the frames of the path to the camera at the target frame rate.
+
+        Parameters
+        ----------
+        camera : :class:`Camera`
+            The camera to animate.
+        drop_frames : bool, optional
+            If True, frames are skipped when applying them takes longer than the frame rate allows, so that the animation keeps its duration.
+        clock : callable, optional
+            Returns the current time in seconds.
+        sleep : callable, optional
+            Waits for the given number of seconds, e.g. while processing UI events.
+
+        Returns
+        -------
+        :class:`CameraPathStats`
+
+        """
+        stats = CameraPathStats()
+        frame_interval = 1.0 / self.fps
+        start = clock()
+        total_frame_time = 0.0
+        index = 0
+        while index < len(self.frames):
+            frame = self.frames[index]
+            frame_start = clock()
+            camera.update(position=frame.position, target=frame.target, up_vector=frame.up_vector, fov=frame.fov)
+            frame_end = clock()
+
+            frame_time = frame_end - frame_start
+            total_frame_time += frame_time
+            stats.max_frame_time = max(stats.max_frame_time, frame_time)
+            stats.frames += 1
+
+            next_index = index + 1
+            if drop_frames:
+                # the frame which is due now, but never skip the last one
+                due_index = min(int((frame_end - start) / frame_interval) + 1, len(self.frames) - 1)
+                if due_index > next_index:
+                    stats.dropped_frames += due_index - next_index
+                    next_index = due_index
+            if next_index < len(self.frames):
+                remaining = start + next_index * frame_interval - clock()
+                if remaining > 0:
+                    sleep(remaining)
+            index = next_index
+
+        stats.duration = clock() - start
+        stats.mean_frame_time = total_frame_time / stats.frames
+        return stats
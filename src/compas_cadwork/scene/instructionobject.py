@@ -13,6 +13,7 @@ import element_controller as ec
 
 from compas_cadwork.conversions import point_to_cadwork
 from compas_cadwork.conversions import point_to_compas
+from compas_cadwork.conversions import points_to_cadwork
 from compas_cadwork.conversions import vector_to_cadwork
 from compas_cadwork.scene import CadworkSceneObject
 
@@ -69,7 +70,19 @@ class Text3dSceneObject(CadworkSceneObject):
             height = d1
         return width, height
 
-    def draw(self, *args, **kwargs):
+    @property
+    def item_key(self):
+        return self._text_instruction.id
+
+    def content_hash(self):
+        text = self._text_instruction
+        loc = text.location
+        return self._rounded(text.text, text.size, text.centered, loc.xaxis, loc.yaxis)
+
+    def content_position(self):
+        return self._text_instruction.location.point.copy()
+
+    def draw_elements(self):
         """Adds a text element with the text included in the provided text instruction.
 
         Returns
@@ -96,7 +109,7 @@ class Text3dSceneObject(CadworkSceneObject):
             translation = self._generate_translation_vectors(element_id, self._text_instruction.location)
             element.translate(translation)
 
-        element.set_is_instruction(True, self._text_instruction.id)
+        self.set_element_instruction(element_id, self._text_instruction.id)
         return [element_id]
 
 
@@ -114,7 +127,21 @@ class LinearDimensionSceneObject(CadworkSceneObject):
         super().__init__(item)
         self._linear_dimension = item
 
-    def draw(self, *args, **kwargs):
+    @property
+    def item_key(self):
+        return self._linear_dimension.id
+
+    def content_hash(self):
+        dimension = self._linear_dimension
+        loc = dimension.location
+        # points relative to the location, so that moving the whole dimension does not change the hash
+        relative_points = [point - loc.point for point in dimension.points]
+        return self._rounded(loc.xaxis, loc.yaxis, dimension.line_offset, *relative_points)
+
+    def content_position(self):
+        return self._linear_dimension.location.point.copy()
+
+    def draw_elements(self):
         """Adds a new dimension to the cadwork document.
 
         Returns
@@ -130,8 +157,8 @@ class LinearDimensionSceneObject(CadworkSceneObject):
             vector_to_cadwork(inst_frame.xaxis),
             vector_to_cadwork(text_plane_normal),
             vector_to_cadwork(distance_vector),
-            [point_to_cadwork(point) for point in self._linear_dimension.points],
+            points_to_cadwork(self._linear_dimension.points),
         )
-        element = self.add_element(element_id)
-        element.set_is_instruction(True, self._linear_dimension.id)
+        self.add_element(element_id)
+        self.set_element_instruction(element_id, self._linear_dimension.id)
         return [element_id]
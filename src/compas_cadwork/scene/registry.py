@@ -0,0 +1,542 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from weakref import WeakKeyDictionary
+from weakref import WeakSet
+from weakref import WeakValueDictionary
+from weakref import finalize
+
+from compas.geometry import Point
+from compas.scene import Scene
+from compas.scene import SceneObject
+
+from compas_cadwork.datamodel import FINGERPRINT_PRECISION
+from compas_cadwork.datamodel import ElementObserver
+
+
+class DrawnElementRegistry(ElementObserver):
+    """Keeps track of the cadwork elements drawn by the scene objects of a scene.
+
+    Elements are recorded under the key of the item which was drawn, see :meth:`claim`. Keys are tuples of the
+    :attr:`~compas_cadwork.scene.CadworkSceneObject.item_key` of an item and a number which tells apart items with
+    the same item key. Keys are matched to items by content hash and position first and only then by drawing order.
+    Since they do not depend on the identity of the item or the scene object, a scene object which draws the same item
+    again finds the elements drawn before, also if the items of the scene were created again. With :func:`share_registry`,
+    this extends to a new scene, e.g. when a design script is run again.
+
+    Element ids are stored in one set per key, together with a reverse mapping from element id to key. This allows
+    removing the elements of a single scene object in constant time, independent of the number of drawn elements.
+    Elements added since the last call to :meth:`take_dirty` are tracked separately, so that only those need to be
+    recreated when the viewport is refreshed.
+
+    For each key, the registry also remembers the content hash of the item it drew (see :meth:`record`).
+    This allows :meth:`CadworkSceneObject.draw` to keep, move or replace the elements of an item on redraw instead of
+    always creating new ones.
+
+    Scene objects are only referenced weakly, so that they are released as usual.
+
+    Elements deleted through :class:`~compas_cadwork.datamodel.Element` or :func:`~compas_cadwork.utilities.remove_elements`
+    are removed from the registry automatically.
+
+    Use :func:`get_registry` to get the registry of a scene. The registry is stored on the scene, so that it is released
+    together with the scene. The elements of a released registry are adopted by the registry of scene objects without
+    scene, so that :func:`~compas_cadwork.scene.clear_drawn_elements` still removes them.
+
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._ids_by_key: Dict[Hashable, Set[int]] = {}
+        self._key_by_id: Dict[int, Hashable] = {}
+        self._dirty: Set[int] = set()
+        # key -> (content hash, position) of the drawn item
+        self._state_by_key: Dict[Hashable, Tuple[Hashable, Optional[Point]]] = {}
+        # key -> scene object which drew its elements, scene object -> its current key
+        self._owner_by_key: WeakValueDictionary[Hashable, SceneObject] = WeakValueDictionary()
+        self._key_by_object: WeakKeyDictionary[SceneObject, Hashable] = WeakKeyDictionary()
+        # keys claimed since the beginning of the current pass, and the next number of each item key
+        self._claimed: Set[Hashable] = set()
+        self._counts: Dict[Hashable, int] = {}
+        self._in_pass = False
+        # the keys recorded before the current pass, by (item key, content hash) and by (item key, content hash, position)
+        self._pool_by_hash: Dict[Hashable, List[Hashable]] = {}
+        self._pool_by_position: Dict[Hashable, List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._key_by_id)
+
+    def __contains__(self, element_id: int) -> bool:
+        return element_id in self._key_by_id
+
+    @property
+    def sceneobjects(self) -> List[SceneObject]:
+        """list(:class:`~compas.scene.SceneObject`): The live scene objects which have drawn elements."""
+        return [sceneobject for key, sceneobject in self._owner_by_key.items() if key in self._ids_by_key]
+
+    @property
+    def dirty_ids(self) -> Set[int]:
+        """set(int): The ids of the elements added since the last call to :meth:`take_dirty`."""
+        return set(self._dirty)
+
+    def claim(self, sceneobject: SceneObject, item_key: Hashable = None, content_hash: Hashable = None, position: Optional[Point] = None) -> Hashable:
+        """Assigns a key to the given scene object, under which its elements are recorded.
+
+        Keys are tuples ``(item_key, n)``. Elements recorded under the key by another scene object are taken over.
+        A scene object keeps its key until the next pass, see :meth:`begin_pass`. In a pass, the key is chosen among
+        the keys with the same ``item_key`` which were recorded before the pass and not claimed yet:
+
+        1. a key recorded with the same ``content_hash`` and ``position``,
+        2. the previous key of the scene object, if it was recorded with the same ``content_hash``,
+        3. the first key recorded with the same ``content_hash``, in the order of the previous pass,
+        4. the previous key of the scene object,
+        5. a new key.
+
+        This way, leaving out or adding an item does not shift the keys of the other items with the same ``item_key``.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`
+            The scene object.
+        item_key : hashable, optional
+            Identifies the item of the scene object across draws.
+        content_hash : hashable, optional
+            The content of the item, see :meth:`record`.
+        position : :class:`~compas.geometry.Point`, optional
+            The location of the item, see :meth:`record`.
+
+        Returns
+        -------
+        hashable
+            The key of the scene object.
+
+        """
+        own_key = self._key_by_object.get(sceneobject)
+        if own_key is not None and own_key[0] != item_key:
+            own_key = None
+        if own_key is not None and own_key in self._claimed:
+            return own_key
+
+        key = None
+        if content_hash is not None:
+            if position is not None:
+                key = self._take(self._pool_by_position.get((item_key, content_hash, _rounded_point(position))))
+            if key is None and own_key is not None and self._state_by_key.get(own_key, (None,))[0] == content_hash:
+                key = own_key
+            if key is None:
+                key = self._take(self._pool_by_hash.get((item_key, content_hash)))
+        if key is None and own_key is not None:
+            key = own_key
+        if key is None:
+            number = self._counts.get(item_key, 0)
+            while (item_key, number) in self._claimed or (item_key, number) in self._ids_by_key:
+                number += 1
+            self._counts[item_key] = number + 1
+            key = (item_key, number)
+        self._claimed.add(key)
+        self._key_by_object[sceneobject] = key
+        return key
+
+    def _take(self, pool: Optional[List[Hashable]]) -> Optional[Hashable]:
+        # pools are reversed, keys claimed otherwise or removed since the beginning of the pass are skipped
+        while pool:
+            key = pool.pop()
+            if key not in self._claimed and key in self._ids_by_key:
+                return key
+        return None
+
+    def key(self, sceneobject: SceneObject) -> Optional[Hashable]:
+        """Returns the key claimed by the given scene object.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`
+            The scene object.
+
+        Returns
+        -------
+        hashable, optional
+            None, if the scene object did not claim a key.
+
+        """
+        return self._key_by_object.get(sceneobject)
+
+    def add(self, sceneobject: SceneObject, element_id: int) -> None:
+        """Records an element drawn by the given scene object.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`
+            The scene object which drew the element. Claims a key without item key, if it did not claim one yet.
+        element_id : int
+            The id of the drawn element.
+
+        """
+        key = self._key_by_object.get(sceneobject)
+        if key is None:
+            key = self.claim(sceneobject)
+        self._ids_by_key.setdefault(key, set()).add(element_id)
+        self._key_by_id[element_id] = key
+        self._owner_by_key[key] = sceneobject
+        self._dirty.add(element_id)
+        _DIRTY_REGISTRIES.add(self)
+
+    def element_ids(self, sceneobject: Optional[SceneObject] = None) -> Set[int]:
+        """Returns the ids of the elements recorded under the key of the given scene object.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`, optional
+            The scene object. If None, the ids of all elements are returned.
+
+        Returns
+        -------
+        set(int)
+
+        """
+        if sceneobject is None:
+            return set(self._key_by_id)
+        key = self._key_by_object.get(sceneobject)
+        return set(self._ids_by_key.get(key, ()))
+
+    def owner(self, element_id: int) -> Optional[SceneObject]:
+        """Returns the scene object which drew the given element.
+
+        Parameters
+        ----------
+        element_id : int
+            The id of the element.
+
+        Returns
+        -------
+        :class:`~compas.scene.SceneObject`, optional
+            None, if the element is not in the registry or its scene object was released.
+
+        """
+        key = self._key_by_id.get(element_id)
+        if key is None:
+            return None
+        return self._owner_by_key.get(key)
+
+    def record(self, sceneobject: SceneObject, content_hash: Hashable, position: Optional[Point] = None) -> None:
+        """Remembers the item drawn by the given scene object under its key.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`
+            The scene object, which must have claimed a key.
+        content_hash : hashable
+            A hash of the content of the item which is not covered by ``position``.
+        position : :class:`~compas.geometry.Point`, optional
+            The location of the item. If only the position changes, the drawn elements can be moved rather than replaced.
+
+        """
+        key = self._key_by_object[sceneobject]
+        self._state_by_key[key] = (content_hash, position)
+        self._owner_by_key[key] = sceneobject
+
+    def find(self, key: Hashable) -> Optional[SceneObject]:
+        """Returns the scene object which last drew the elements recorded under the given key.
+
+        Parameters
+        ----------
+        key : hashable
+            The key, see :meth:`claim`.
+
+        Returns
+        -------
+        :class:`~compas.scene.SceneObject`, optional
+            None, if no elements are recorded under the key or their scene object was released.
+
+        """
+        return self._owner_by_key.get(key)
+
+    def state(self, sceneobject: SceneObject) -> Optional[Tuple[Hashable, Optional[Point]]]:
+        """Returns the content hash and position recorded under the key of the given scene object.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`
+            The scene object.
+
+        Returns
+        -------
+        tuple(hashable, :class:`~compas.geometry.Point`), optional
+            None, if nothing was recorded.
+
+        """
+        key = self._key_by_object.get(sceneobject)
+        return self._state_by_key.get(key)
+
+    def remove(self, sceneobject: SceneObject) -> Set[int]:
+        """Removes all elements recorded under the key of the given scene object from the registry.
+
+        Parameters
+        ----------
+        sceneobject : :class:`~compas.scene.SceneObject`
+            The scene object.
+
+        Returns
+        -------
+        set(int)
+            The ids of the removed elements.
+
+        """
+        key = self._key_by_object.get(sceneobject)
+        if key is None:
+            return set()
+        return self._remove_key(key)
+
+    def discard(self, element_ids: Iterable[int]) -> List[int]:
+        """Removes the given elements from the registry. Ids which are not in the registry are ignored.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements.
+
+        Returns
+        -------
+        list(int)
+            The ids of the elements which were removed.
+
+        """
+        removed = []
+        for element_id in element_ids:
+            key = self._key_by_id.pop(element_id, None)
+            if key is None:
+                continue
+            owned = self._ids_by_key[key]
+            owned.discard(element_id)
+            if not owned:
+                # nothing left to keep on redraw
+                del self._ids_by_key[key]
+                self._state_by_key.pop(key, None)
+            self._dirty.discard(element_id)
+            removed.append(element_id)
+        return removed
+
+    def take_dirty(self) -> List[int]:
+        """Returns the ids of the elements added since the last call and resets them.
+
+        Returns
+        -------
+        list(int)
+
+        """
+        dirty = list(self._dirty)
+        self._dirty.clear()
+        _DIRTY_REGISTRIES.discard(self)
+        return dirty
+
+    @property
+    def in_pass(self) -> bool:
+        """bool: True, between :meth:`begin_pass` and :meth:`end_pass`."""
+        return self._in_pass
+
+    def begin_pass(self) -> None:
+        """Starts a pass, in which scene objects claim their keys in the order they are drawn, see :meth:`end_pass`.
+
+        :meth:`compas.scene.Scene.draw` starts a pass in the ``cadwork`` context.
+
+        """
+        self._claimed.clear()
+        self._counts.clear()
+        self._in_pass = True
+        self._pool_by_hash.clear()
+        self._pool_by_position.clear()
+        # in reverse drawing order, so that the first key is taken first
+        for key in sorted(self._state_by_key, key=_key_number, reverse=True):
+            if key not in self._ids_by_key:
+                continue
+            content_hash, position = self._state_by_key[key]
+            self._pool_by_hash.setdefault((key[0], content_hash), []).append(key)
+            if position is not None:
+                self._pool_by_position.setdefault((key[0], content_hash, _rounded_point(position)), []).append(key)
+
+    def end_pass(self) -> List[int]:
+        """Ends the current pass and removes the elements of the items which were not drawn again.
+
+        These are the items whose keys were not claimed in the pass, e.g. because their scene object was removed from
+        the scene or because a design script which was run again created fewer items.
+
+        Returns
+        -------
+        list(int)
+            The ids of the removed elements, which should be deleted from the cadwork model.
+
+        """
+        if not self._in_pass:
+            return []
+        self._in_pass = False
+        self._pool_by_hash.clear()
+        self._pool_by_position.clear()
+        stale = [key for key in self._ids_by_key if key not in self._claimed and key is not _RELEASED]
+        removed = []
+        for key in stale:
+            removed.extend(self._remove_key(key))
+        return removed
+
+    def adopt(self, element_ids: Iterable[int]) -> None:
+        """Records elements which are no longer drawn by any scene object, e.g. those of a released scene.
+
+        They are never kept or removed by a redraw, but still removed by :meth:`clear` and :meth:`discard`.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements.
+
+        """
+        adopted = self._ids_by_key.setdefault(_RELEASED, set())
+        for element_id in element_ids:
+            adopted.add(element_id)
+            self._key_by_id[element_id] = _RELEASED
+
+    def clear(self) -> List[int]:
+        """Removes all elements from the registry.
+
+        Returns
+        -------
+        list(int)
+            The ids of the removed elements.
+
+        """
+        element_ids = list(self._key_by_id)
+        self._ids_by_key.clear()
+        self._key_by_id.clear()
+        self._dirty.clear()
+        self._state_by_key.clear()
+        self._owner_by_key.clear()
+        self._key_by_object.clear()
+        self._claimed.clear()
+        self._counts.clear()
+        self._pool_by_hash.clear()
+        self._pool_by_position.clear()
+        return element_ids
+
+    def _remove_key(self, key: Hashable) -> Set[int]:
+        element_ids = self._ids_by_key.pop(key, set())
+        for element_id in element_ids:
+            del self._key_by_id[element_id]
+        self._dirty.difference_update(element_ids)
+        self._state_by_key.pop(key, None)
+        return element_ids
+
+    def elements_removed(self, element_ids: List[int]) -> None:
+        self.discard(element_ids)
+
+
+def _key_number(key: Hashable) -> int:
+    return key[1]
+
+
+def _rounded_point(point: Point) -> Tuple[float, float, float]:
+    return tuple(round(coordinate, FINGERPRINT_PRECISION) for coordinate in point)
+
+
+# the attribute of a scene which holds its registry
+_SCENE_ATTRIBUTE = "_cadwork_registry"
+# the registries of live scenes, the scenes hold their registries, these sets do not keep them alive
+_REGISTRIES: WeakSet[DrawnElementRegistry] = WeakSet()
+_DIRTY_REGISTRIES: WeakSet[DrawnElementRegistry] = WeakSet()
+# registries which outlive their scenes, see share_registry
+_SHARED_REGISTRIES: Dict[str, DrawnElementRegistry] = {}
+# used by scene objects which are not part of a scene, adopts the elements of released registries
+_DEFAULT_REGISTRY = DrawnElementRegistry()
+# the key of the adopted elements, never claimed by a scene object
+_RELEASED = object()
+
+
+def _release(key_by_id: Dict[int, Hashable]) -> None:
+    # called when a registry is garbage collected, its elements are still in the model
+    _DEFAULT_REGISTRY.adopt(list(key_by_id))
+
+
+def _track(registry: DrawnElementRegistry) -> None:
+    _REGISTRIES.add(registry)
+    # refers to the dictionary, not the registry, so that the registry can be collected
+    finalize(registry, _release, registry._key_by_id)
+
+
+def get_registry(scene: Optional[Scene] = None) -> DrawnElementRegistry:
+    """Returns the registry of elements drawn by the given scene.
+
+    Parameters
+    ----------
+    scene : :class:`~compas.scene.Scene`, optional
+        The scene. If None, the registry shared by all scene objects which are not part of a scene is returned.
+
+    Returns
+    -------
+    :class:`DrawnElementRegistry`
+
+    """
+    if scene is None:
+        return _DEFAULT_REGISTRY
+    registry = getattr(scene, _SCENE_ATTRIBUTE, None)
+    if registry is None:
+        registry = DrawnElementRegistry()
+        setattr(scene, _SCENE_ATTRIBUTE, registry)
+        _track(registry)
+    return registry
+
+
+def share_registry(scene: Scene, name: str) -> DrawnElementRegistry:
+    """Makes the given scene record its elements in the registry with the given name, which outlives the scene.
+
+    A new scene which shares the registry of an earlier one, e.g. when a design script which builds a new scene is run
+    again, keeps the elements of the items drawn by the earlier scene, and removes those of the items it does not draw again.
+    Must be called before the scene is drawn.
+
+    Parameters
+    ----------
+    scene : :class:`~compas.scene.Scene`
+        The scene.
+    name : str
+        The name of the registry.
+
+    Returns
+    -------
+    :class:`DrawnElementRegistry`
+
+    Examples
+    --------
+    >>> scene = Scene(context="cadwork")
+    >>> share_registry(scene, "my_design")
+    >>> scene.add(beam)
+    >>> scene.draw()
+
+    """
+    registry = _SHARED_REGISTRIES.get(name)
+    if registry is None:
+        registry = _SHARED_REGISTRIES[name] = DrawnElementRegistry()
+        _track(registry)
+    setattr(scene, _SCENE_ATTRIBUTE, registry)
+    return registry
+
+
+def iter_registries(dirty: bool = False) -> Iterator[DrawnElementRegistry]:
+    """Yields the registries of all live and shared scenes, followed by the registry of scene objects without a scene.
+
+    Parameters
+    ----------
+    dirty : bool, optional
+        If True, only the registries with elements added since their last :meth:`DrawnElementRegistry.take_dirty` are yielded.
+
+    Yields
+    ------
+    :class:`DrawnElementRegistry`
+
+    """
+    if dirty:
+        yield from list(_DIRTY_REGISTRIES)
+        return
+    yield from list(_REGISTRIES)
+    yield _DEFAULT_REGISTRY
@@ -1,14 +1,335 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Dict
+from typing import Generator
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
 import element_controller as ec
-import visualization_controller as vc
+from compas.geometry import Point
+from compas.geometry import Vector
 from compas.scene import SceneObject
+from compas.tolerance import TOL
 
+from compas_cadwork.datamodel import ATTR_INSTRUCTION_ID
+from compas_cadwork.datamodel import FINGERPRINT_PRECISION
 from compas_cadwork.datamodel import Element
+from compas_cadwork.utilities import remove_elements
+from compas_cadwork.utilities import set_name
+from compas_cadwork.utilities import set_user_attribute
+from compas_cadwork.utilities import suspended_refresh
+from compas_cadwork.utilities.refresh import resume_refresh
+from compas_cadwork.utilities.refresh import suspend_refresh
+
+from .registry import DrawnElementRegistry
+from .registry import get_registry
+from .registry import iter_registries
+
+
+class DrawBatch:
+    """Collects names and user attributes of newly drawn elements and applies them with one cadwork call per distinct value.
+
+    Use :func:`batch_draw` to activate a batch.
+
+    """
+
+    def __init__(self) -> None:
+        self._names: Dict[str, List[int]] = {}
+        self._attributes: Dict[Tuple[int, str], List[int]] = {}
+        # True, if a scene was drawn in this batch, see DrawnElementRegistry.begin_pass
+        self.scene_drawn = False
+        # the registries in which a pass was started in this batch
+        self._passes: List[DrawnElementRegistry] = []
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._names.values()) + sum(len(ids) for ids in self._attributes.values())
+
+    def set_name(self, element_id: int, name: str) -> None:
+        self._names.setdefault(name, []).append(element_id)
+
+    def set_attribute(self, element_id: int, attribute_number: int, value: str) -> None:
+        self._attributes.setdefault((attribute_number, value), []).append(element_id)
+
+    def begin_pass(self, registry: DrawnElementRegistry) -> None:
+        """Starts a pass in the given registry, if a scene was drawn in this batch and none was started yet."""
+        if self.scene_drawn and not registry.in_pass:
+            registry.begin_pass()
+            self._passes.append(registry)
+
+    def end_passes(self) -> List[int]:
+        """Ends the passes started in this batch and returns the ids of the elements of the items which were not drawn again."""
+        passes, self._passes = self._passes, []
+        return [element_id for registry in passes for element_id in registry.end_pass()]
+
+    def flush(self) -> None:
+        """Applies all collected names and attributes."""
+        names, self._names = self._names, {}
+        attributes, self._attributes = self._attributes, {}
+        for name, element_ids in names.items():
+            set_name(element_ids, name)
+        for (attribute_number, value), element_ids in attributes.items():
+            set_user_attribute(element_ids, attribute_number, value)
+
+
+_ACTIVE_BATCH: Optional[DrawBatch] = None
+
+
+def begin_batch() -> DrawBatch:
+    """Starts a draw batch, if none is active. See :func:`batch_draw`.
+
+    Returns
+    -------
+    :class:`DrawBatch`
+        The active batch.
+
+    """
+    global _ACTIVE_BATCH
+    if _ACTIVE_BATCH is None:
+        suspend_refresh()
+        _ACTIVE_BATCH = DrawBatch()
+    return _ACTIVE_BATCH
+
+
+def end_batch() -> None:
+    """Applies the collected names and attributes of the active draw batch, if any, and refreshes the drawn elements once."""
+    global _ACTIVE_BATCH
+    batch, _ACTIVE_BATCH = _ACTIVE_BATCH, None
+    if batch is None:
+        return
+    try:
+        stale_ids = batch.end_passes()
+        if stale_ids:
+            remove_elements(stale_ids)
+        batch.flush()
+        CadworkSceneObject.refresh()
+    finally:
+        resume_refresh()
+
+
+# the batch started by the before_draw hook of Scene.draw, if any
+_SCENE_BATCH: Optional[DrawBatch] = None
+
+
+def _begin_scene_batch() -> None:
+    global _SCENE_BATCH
+    # Scene.draw does not call after_draw if drawing a scene object raised, the batch of that draw is still active
+    _end_scene_batch()
+    if _ACTIVE_BATCH is None:
+        _SCENE_BATCH = begin_batch()
+    # the registries of all scenes drawn within one batch are drawn in one pass each, started by their first scene object
+    _ACTIVE_BATCH.scene_drawn = True
+
+
+def _end_scene_batch() -> None:
+    global _SCENE_BATCH
+    batch, _SCENE_BATCH = _SCENE_BATCH, None
+    # within a batch_draw context, the context applies its batch
+    if batch is not None and batch is _ACTIVE_BATCH:
+        end_batch()
+
+
+@contextmanager
+def batch_draw() -> Generator[DrawBatch, None, None]:
+    """Draws all scene objects within the context in batch mode.
+
+    The automatic refresh of the cadwork viewport is suspended for the whole batch, see :func:`~compas_cadwork.utilities.suspended_refresh`.
+    Elements are created as the scene objects are drawn, but their names and instruction attributes are collected
+    and applied at the end with one cadwork call per distinct value. The viewport is refreshed once on exit.
+
+    :meth:`compas.scene.Scene.draw` uses batch mode automatically in the ``cadwork`` context. At the end of a batch in
+    which a scene was drawn, the elements of the items of that scene which were not drawn again are removed, see
+    :meth:`~compas_cadwork.scene.DrawnElementRegistry.end_pass`.
+
+    Yields
+    ------
+    :class:`DrawBatch`
+
+    Examples
+    --------
+    >>> with batch_draw():
+    ...     for sceneobject in sceneobjects:
+    ...         sceneobject.draw()
+
+    """
+    if _ACTIVE_BATCH is not None:
+        # nested, the outermost context applies the batch
+        yield _ACTIVE_BATCH
+        return
+
+    batch = begin_batch()
+    try:
+        yield batch
+    finally:
+        end_batch()
 
 
 class CadworkSceneObject(SceneObject):
-    """Base class for all of cadwork's SceneObject."""
+    """Base class for all of cadwork's SceneObject.
+
+    Elements drawn by a scene object are recorded in the :class:`~compas_cadwork.scene.DrawnElementRegistry` of its scene.
+
+    Subclasses create their elements in :meth:`draw_elements`. Those which implement :meth:`content_hash` are redrawn
+    incrementally: :meth:`draw` remembers the hash of each drawn item under its :attr:`item_key` and on the next draw
+    of an item with the same key, the existing elements are kept if the hash is unchanged, moved if only
+    :meth:`content_position` changed, and replaced otherwise. Elements of items which are not drawn again are removed
+    at the end of the scene draw, see :func:`batch_draw`. To reuse the elements of the items of an earlier scene, e.g.
+    when a design script which builds a new scene is run again, let both scenes use one registry, see
+    :func:`~compas_cadwork.scene.share_registry`.
 
-    DRAWN_ELEMENTS = []
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._registry: Optional[DrawnElementRegistry] = None
+
+    @property
+    def registry(self) -> DrawnElementRegistry:
+        """:class:`~compas_cadwork.scene.DrawnElementRegistry`: The registry of the elements drawn by the scene of this object."""
+        # once elements are drawn, stick to the registry they are recorded in, even if this object is removed from the scene
+        return self._registry if self._registry is not None else get_registry(self.scene)
+
+    @property
+    def guids(self) -> List[int]:
+        """list(int): The ids of the elements drawn by this scene object."""
+        return list(self.registry.element_ids(self))
+
+    @property
+    def item_key(self) -> Hashable:
+        """hashable: Identifies the item across redraws. Defaults to the name of the item.
+
+        Items with the same key are told apart by their :meth:`content_hash` and position, and only then by the order
+        in which they are drawn, see :meth:`DrawnElementRegistry.claim`. Override this to match items by something
+        else than their name, e.g. a guid.
+
+        """
+        return self.item.name
+
+    def content_hash(self) -> Optional[Hashable]:
+        """Returns the content of the item which determines its drawn elements, excluding :meth:`content_position`.
+
+        Items are compared by equality of their content hashes, return the rounded values themselves, see :meth:`_rounded`,
+        rather than a ``hash()`` of them, which can collide.
+
+        Returns
+        -------
+        hashable, optional
+            None, if the item should be redrawn on every draw. This is the default.
+
+        """
+        return None
+
+    def content_position(self) -> Optional[Point]:
+        """Returns the location of the item. If only the location of an item changed, its elements are moved instead of replaced.
+
+        Returns
+        -------
+        :class:`~compas.geometry.Point`, optional
+            None, if elements can not be moved. This is the default.
+
+        """
+        return None
+
+    @staticmethod
+    def _rounded(*values) -> tuple:
+        # rounds numbers and the coordinates of points and vectors, so that numerical noise does not cause a redraw
+        rounded = []
+        for value in values:
+            if isinstance(value, float):
+                rounded.append(round(value, FINGERPRINT_PRECISION))
+            elif isinstance(value, (Point, Vector)):
+                rounded.append(tuple(round(coordinate, FINGERPRINT_PRECISION) for coordinate in value))
+            else:
+                rounded.append(value)
+        return tuple(rounded)
+
+    def draw_elements(self) -> List[int]:
+        """Creates the cadwork elements of the item. Elements must be recorded using :meth:`add_element`.
+
+        Returns
+        -------
+        list(int)
+            The ids of the created elements.
+
+        """
+        raise NotImplementedError
+
+    def draw(self) -> List[int]:
+        """Draws the item, reusing the elements of a previous draw of the same item where possible.
+
+        Returns
+        -------
+        list(int)
+            The ids of the elements of the item.
+
+        """
+        try:
+            return self._draw()
+        except BaseException:
+            # Scene.draw does not call after_draw if a scene object raises, do not leave the viewport suspended until the next draw
+            _end_scene_batch()
+            raise
+
+    def _draw(self) -> List[int]:
+        registry = self.registry
+        if _ACTIVE_BATCH is not None and self.scene is not None:
+            _ACTIVE_BATCH.begin_pass(registry)
+        content_hash = self.content_hash()
+        position = self.content_position()
+        key = registry.claim(self, self.item_key, content_hash, position)
+
+        previous = registry.find(key)
+        state = registry.state(self)
+        element_ids = list(registry.element_ids(self))
+        if state is not None and content_hash is not None and element_ids and all(ec.check_element_id(element_id) for element_id in element_ids):
+            previous_hash, previous_position = state
+            if previous_hash == content_hash:
+                if position is not None and previous_position is not None and not TOL.is_allclose(position, previous_position):
+                    translation = Vector.from_start_end(previous_position, position)
+                    for element_id in element_ids:
+                        Element(element_id).translate(translation)
+                registry.record(self, content_hash, position)
+                if previous is not self:
+                    self.elements_taken_over(element_ids)
+                self.item_drawn(element_ids)
+                return element_ids
+
+        stale_ids = registry.remove(self)
+        if stale_ids:
+            remove_elements(list(stale_ids))
+
+        element_ids = self.draw_elements()
+        if content_hash is not None:
+            registry.record(self, content_hash, position)
+        self.item_drawn(element_ids)
+        return element_ids
+
+    def elements_taken_over(self, element_ids: List[int]) -> None:
+        """Called when the elements drawn by another scene object for an item with the same key are kept for this item.
+
+        Use this to update properties of the elements which are not covered by :meth:`content_hash`, e.g. names.
+
+        Parameters
+        ----------
+        element_ids : list(int)
+            The ids of the elements of the item.
+
+        """
+        pass
+
+    def item_drawn(self, element_ids: List[int]) -> None:
+        """Called after the item was drawn, either with newly created or with reused elements.
+
+        Parameters
+        ----------
+        element_ids : list(int)
+            The ids of the elements of the item.
+
+        """
+        pass
 
     def add_element(self, element_id) -> Element:
         """Records the given element_id to track elements added by the :class:`~compas_cadwork.scene.CadworkSceneObject`.
@@ -19,19 +340,79 @@ class CadworkSceneObject(SceneObject):
             The element ID to add to tracking.
 
         """
-        self.DRAWN_ELEMENTS.append(element_id)
+        self._registry = self.registry
+        self._registry.add(self, element_id)
         return Element(element_id)
 
+    def set_element_name(self, element_id: int, name: str) -> None:
+        """Sets the name of a drawn element. Deferred to the end of the batch, if a :func:`batch_draw` is active.
+
+        Parameters
+        ----------
+        element_id : int
+            The element ID.
+        name : str
+            The name to set.
+
+        """
+        if _ACTIVE_BATCH is not None:
+            _ACTIVE_BATCH.set_name(element_id, name)
+        else:
+            set_name([element_id], name)
+
+    def set_element_instruction(self, element_id: int, instruction_id: str) -> None:
+        """Flags a drawn element as instruction. Deferred to the end of the batch, if a :func:`batch_draw` is active.
+
+        Parameters
+        ----------
+        element_id : int
+            The element ID.
+        instruction_id : str
+            The ID of the instruction.
+
+        """
+        if _ACTIVE_BATCH is not None:
+            _ACTIVE_BATCH.set_attribute(element_id, ATTR_INSTRUCTION_ID, instruction_id)
+        else:
+            Element(element_id).set_is_instruction(True, instruction_id)
+
     @classmethod
     def refresh(cls):
-        if cls.DRAWN_ELEMENTS:
-            ec.recreate_elements(cls.DRAWN_ELEMENTS)
-        vc.refresh()
+        """Recreates the elements drawn since the last refresh and refreshes the viewport once."""
+        dirty_ids = [element_id for registry in iter_registries(dirty=True) for element_id in registry.take_dirty()]
+        with suspended_refresh():
+            if dirty_ids:
+                ec.recreate_elements(dirty_ids)
 
     @classmethod
     def clear(cls, *args, **kwargs):
-        """Removes all elements tracked by the :class:`~compas_cadwork.scene.CadworkSceneObject` from the cadwork model."""
-        if cls.DRAWN_ELEMENTS:
-            ec.delete_elements(cls.DRAWN_ELEMENTS)
-            vc.refresh()
-        cls.DRAWN_ELEMENTS = []
+        """Removes all elements drawn by any :class:`CadworkSceneObject` from the cadwork model, see :func:`clear_drawn_elements`."""
+        clear_drawn_elements()
+
+    def clear_elements(self):
+        """Removes the elements drawn by this scene object from the cadwork model."""
+        element_ids = self.registry.remove(self)
+        if element_ids:
+            with suspended_refresh():
+                remove_elements(list(element_ids))
+        self._guids = None
+
+
+def clear_drawn_elements(element_ids: Optional[Iterable[int]] = None) -> None:
+    """Removes drawn elements from the cadwork model.
+
+    Parameters
+    ----------
+    element_ids : iterable(int), optional
+        The ids of the elements to remove. Elements which were not drawn by a :class:`CadworkSceneObject` are ignored.
+        If None, all elements drawn by any :class:`CadworkSceneObject` are removed.
+
+    """
+    if element_ids is None:
+        removed = [element_id for registry in iter_registries() for element_id in registry.clear()]
+    else:
+        element_ids = list(element_ids)
+        removed = [element_id for registry in iter_registries() for element_id in registry.discard(element_ids)]
+    if removed:
+        with suspended_refresh():
+            remove_elements(removed)
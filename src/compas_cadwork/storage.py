@@ -1,13 +1,28 @@
+import asyncio
+import gzip
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
+from itertools import islice
 from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
+import utility_controller as uc
 from compas.data import Data
+from compas.data import DataDecoder
+from compas.data import DataEncoder
 from compas.data import json_dump
 from compas.data import json_dumps
 from compas.data import json_load
 from compas.data import json_loads
-from utility_controller import get_project_data
-from utility_controller import set_project_data
+
+from compas_cadwork.bridge import BridgeExecutor
 
 LOG = logging.getLogger(__name__)
 
@@ -30,19 +45,77 @@ class Storage:
         raise NotImplementedError
 
 
+class MemoryProjectData:
+    """In-memory stand-in for the project data functions of cadwork's ``utility_controller``.
+
+    Can be passed as ``backend`` to :class:`ProjectStorage`, e.g. for testing outside of cadwork.
+
+    Attributes
+    ----------
+    data : dict(str, str)
+        The stored project data.
+    writes : int
+        The number of calls to :meth:`set_project_data`.
+
+    """
+
+    def __init__(self, data: Optional[Dict[str, str]] = None):
+        self.data = dict(data or {})
+        self.writes = 0
+
+    def get_project_data(self, key: str) -> str:
+        return self.data.get(key, "")
+
+    def set_project_data(self, key: str, data: str) -> None:
+        self.writes += 1
+        self.data[key] = data
+
+    def delete_project_data(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def get_project_data_keys(self) -> List[str]:
+        return list(self.data)
+
+
+def _digest(data_str: str) -> str:
+    return hashlib.blake2b(data_str.encode("utf-8"), digest_size=16).hexdigest()
+
+
 class ProjectStorage(Storage):
     """Saves stuff to persistency using the project data storage.
 
     This will store said stuff inside the currently open cadwork 3d project file.
 
+    In incremental mode, the top-level entries of the data are stored as separate chunks under ``<key>/<entry>``,
+    with a small manifest under ``key``. The manifest holds a hash of each chunk. :meth:`save` reads the stored manifest
+    and only writes the chunks whose hash differs, followed by the manifest. Saving unchanged data makes no writes at all.
+    Since the stored manifest is compared, changes made by other storages or to another document are never missed.
+    Data saved in incremental mode can only be loaded in incremental mode. Data saved in normal mode can be loaded in both modes.
+
     Parameters
     ----------
     key : str
         A project-wide unique key to store the data under.
+    incremental : bool, optional
+        If True, the data is stored in chunks and only changed chunks are written.
+    backend : object, optional
+        Provides ``get_project_data``, ``set_project_data`` and ``delete_project_data``.
+        Defaults to cadwork's ``utility_controller``, see :class:`MemoryProjectData` for an in-memory alternative.
     """
 
-    def __init__(self, key: str):
+    MANIFEST_FORMAT = "compas_cadwork.chunked"
+
+    def __init__(self, key: str, incremental: bool = False, backend=None):
         self._key = key
+        self.incremental = incremental
+        self._backend = backend or uc
+
+    def _chunk_key(self, name: str) -> str:
+        return f"{self._key}/{name}"
+
+    def _write(self, key: str, data_str: str) -> None:
+        LOG.debug("save to key:%s data: %s", key, data_str)
+        self._backend.set_project_data(key, data_str)
 
     def save(self, data: Dict | Data):
         """Save the data to the project storage.
@@ -57,10 +130,57 @@ class ProjectStorage(Storage):
             The data to save.
 
         """
-        data_str = json_dumps(data)
-        LOG.debug(f"save to key:{self._key} data: {data_str}")
-        set_project_data(self._key, data_str)
-        # TODO: should we trigger a file save here? otherwise the data is not really saved
+        if not self.incremental:
+            data_str = json_dumps(data)
+            LOG.debug("save to key:%s data: %s", self._key, data_str)
+            self._backend.set_project_data(self._key, data_str)
+            # TODO: should we trigger a file save here? otherwise the data is not really saved
+            return
+
+        if isinstance(data, Data):
+            document = data.__jsondump__()
+            payload = document.pop("data")
+        else:
+            document = None
+            payload = data
+        if isinstance(payload, dict):
+            chunks = {str(name): value for name, value in payload.items()}
+        else:
+            chunks = None
+
+        manifest_str = self._backend.get_project_data(self._key)
+        previous_digests = self._stored_digests(manifest_str)
+        manifest = {"format": self.MANIFEST_FORMAT, "keys": list(chunks) if chunks is not None else None, "document": document}
+        if chunks is None:
+            manifest["data"] = json_dumps(payload)
+        else:
+            digests = {}
+            for name, value in chunks.items():
+                chunk_str = json_dumps(value)
+                digests[name] = _digest(chunk_str)
+                if previous_digests.get(name) != digests[name]:
+                    self._write(self._chunk_key(name), chunk_str)
+            manifest["digests"] = digests
+        # the manifest is written last, so that it never references missing chunks
+        new_manifest_str = json_dumps(manifest)
+        if new_manifest_str != manifest_str:
+            self._write(self._key, new_manifest_str)
+
+        for name in previous_digests:
+            if chunks is None or name not in chunks:
+                self._backend.delete_project_data(self._chunk_key(name))
+
+    def _stored_digests(self, manifest_str: str) -> Dict[str, Optional[str]]:
+        # chunk name -> digest of the chunk, according to the stored manifest
+        try:
+            manifest = json.loads(manifest_str or "null")
+        except Exception:
+            return {}
+        if not (isinstance(manifest, dict) and manifest.get("format") == self.MANIFEST_FORMAT):
+            return {}
+        # manifests written before digests were stored list the chunks only, these are all written again
+        digests = manifest.get("digests") or {}
+        return {name: digests.get(name) for name in manifest["keys"] or ()}
 
     def load(self) -> Dict | Data:
         """Load the data from the project storage.
@@ -75,11 +195,73 @@ class ProjectStorage(Storage):
         dict or :class:`compas.data.Data`
             The loaded data.
         """
-        data_str = get_project_data(self._key)
-        LOG.debug(f"load from key:{self._key} data: {data_str}")
+        return self._decode(*self._read())
+
+    async def load_async(self, executor=None) -> Dict | Data:
+        """Loads the data without blocking the cadwork host thread for longer than reading the project data.
+
+        The project data is read with one job on the :class:`~compas_cadwork.bridge.BridgeExecutor`,
+        the decoding runs on a worker thread of the running event loop.
+
+        Parameters
+        ----------
+        executor : :class:`~compas_cadwork.bridge.BridgeExecutor`, optional
+            The executor of the host thread. Defaults to the current executor.
+
+        Raises
+        ------
+        StorageError
+            If no data is found for the key.
+
+        Returns
+        -------
+        dict or :class:`compas.data.Data`
+            The loaded data.
+
+        """
+        executor = executor or BridgeExecutor.current()
+        raw = await executor.call_async(self._read)
+        return await asyncio.get_running_loop().run_in_executor(None, self._decode, *raw)
+
+    def _read(self) -> Tuple[str, Optional[dict], Optional[Dict[str, str]]]:
+        # reads the stored strings, the only part of loading which calls cadwork
+        data_str = self._backend.get_project_data(self._key)
+        LOG.debug("load from key:%s data: %s", self._key, data_str)
         if not data_str:
             raise StorageError(f"No data found for key: {self._key}")
-        return json_loads(data_str)
+        if not self.incremental:
+            return data_str, None, None
+
+        # the manifest is parsed without decoding, as its document entry is not a complete compas data object
+        manifest = json.loads(data_str)
+        if not (isinstance(manifest, dict) and manifest.get("format") == self.MANIFEST_FORMAT):
+            return data_str, None, None
+
+        chunks = {}
+        for name in manifest["keys"] or ():
+            chunk_key = self._chunk_key(name)
+            chunk_str = self._backend.get_project_data(chunk_key)
+            if not chunk_str:
+                raise StorageError(f"No data found for key: {chunk_key}")
+            chunks[name] = chunk_str
+        return data_str, manifest, chunks
+
+    def _decode(self, data_str: str, manifest: Optional[dict], chunks: Optional[Dict[str, str]]) -> Dict | Data:
+        if manifest is None:
+            return json_loads(data_str)
+
+        if manifest["keys"] is None:
+            payload = json_loads(manifest["data"])
+        else:
+            payload = {}
+            for name, chunk_str in chunks.items():
+                payload[name] = json_loads(chunk_str)
+
+        document = manifest["document"]
+        if document is None:
+            return payload
+        document["data"] = payload
+        return DataDecoder().object_hook(document)
 
 
 class FileStorage(Storage):
@@ -130,3 +312,363 @@ class FileStorage(Storage):
             return json_load(self.filepath)
         except Exception as e:
             raise StorageError(f"Failed to load data from file: {e}")
+
+
+class JsonLinesFileStorage(Storage):
+    """Saves stuff to a local file as compact JSON lines, optionally gzip compressed.
+
+    The first line of the file is a header which lists the top-level keys of the data.
+    Each following line holds the value of one key, in the same order.
+    This allows loading a single top-level entry with :meth:`load` without parsing the rest of the file.
+
+    Files are written to a temporary file first, which then replaces the target file. An interrupted save therefore never leaves a partially written file behind.
+
+    Parameters
+    ----------
+    filepath : str
+        The path to the file to save to.
+    compress : bool, optional
+        If True, the file is gzip compressed. Compressed and uncompressed files are both recognized on load, regardless of this setting.
+    compresslevel : int, optional
+        The gzip compression level, from 1 (fastest) to 9 (smallest).
+
+    Examples
+    --------
+    >>> storage = JsonLinesFileStorage("sequence.jsonl.gz", compress=True)
+    >>> storage.save({"settings": settings, "steps": steps})
+    >>> storage.keys()
+    ['settings', 'steps']
+    >>> settings = storage.load("settings")
+
+    """
+
+    FORMAT = "compas_cadwork.jsonl"
+    VERSION = 1
+
+    def __init__(self, filepath: str, compress: bool = False, compresslevel: int = 6):
+        self.filepath = filepath
+        self.compress = compress
+        self.compresslevel = compresslevel
+
+    def save(self, data: Dict | Data):
+        """Save the data to the file.
+
+        If ``data`` is a dictionary, or a :class:`compas.data.Data` whose data is a dictionary, each of its top-level entries is written to a separate line.
+
+        Raises
+        ------
+        StorageError
+            If the save operation fails.
+
+        Parameters
+        ----------
+        data : dict or :class:`compas.data.Data`
+            The data to save.
+        """
+        if isinstance(data, Data):
+            document = data.__jsondump__()
+            payload = document.pop("data")
+        else:
+            document = None
+            payload = data
+
+        if isinstance(payload, dict):
+            keys = [str(key) for key in payload]
+            values = payload.values()
+        else:
+            keys = None
+            values = [payload]
+        header = {"format": self.FORMAT, "version": self.VERSION, "keys": keys, "document": document}
+
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.filepath)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                if self.compress:
+                    with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self.compresslevel) as stream:
+                        self._write_lines(stream, header, values)
+                else:
+                    self._write_lines(raw, header, values)
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(temp_path, self.filepath)
+            LOG.debug("Data saved successfully to file.")
+        except Exception as e:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise StorageError(f"Failed to save data to file: {e}")
+
+    @staticmethod
+    def _write_lines(stream, header, values):
+        stream.write(json.dumps(header).encode("utf-8"))
+        stream.write(b"\n")
+        for value in values:
+            # json escapes line breaks within strings, so every value takes exactly one line
+            stream.write(json.dumps(value, cls=DataEncoder, separators=(",", ":")).encode("utf-8"))
+            stream.write(b"\n")
+
+    def _open(self):
+        with open(self.filepath, "rb") as f:
+            is_compressed = f.read(2) == b"\x1f\x8b"
+        return gzip.open(self.filepath, "rb") if is_compressed else open(self.filepath, "rb")
+
+    def _read_header(self, lines) -> dict:
+        header = json.loads(next(lines))
+        if header.get("format") != self.FORMAT:
+            raise ValueError(f"Not a {self.FORMAT} file.")
+        return header
+
+    def keys(self) -> List[str]:
+        """Returns the top-level keys of the stored data. Only the header of the file is read.
+
+        Raises
+        ------
+        StorageError
+            If the file can not be read.
+
+        Returns
+        -------
+        list(str)
+            The keys. Empty if the stored data is not a dictionary.
+
+        """
+        try:
+            with self._open() as f:
+                return self._read_header(f)["keys"] or []
+        except Exception as e:
+            raise StorageError(f"Failed to load data from file: {e}")
+
+    def load(self, key: Optional[str] = None) -> Dict | Data:
+        """Load the data from the file.
+
+        Raises
+        ------
+        StorageError
+            If the load operation fails or the given key is not found.
+
+        Parameters
+        ----------
+        key : str, optional
+            If given, only the value of this top-level key is parsed and returned.
+
+        Returns
+        -------
+        dict or :class:`compas.data.Data`
+            The loaded data, or the value of ``key``.
+        """
+        try:
+            with self._open() as f:
+                header = self._read_header(f)
+                keys = header["keys"]
+                if key is not None:
+                    if keys is None or key not in keys:
+                        raise KeyError(key)
+                    # skipped lines are neither decoded nor parsed
+                    line = next(islice(f, keys.index(key), None))
+                    return json.loads(line, cls=DataDecoder)
+                values = [json.loads(line, cls=DataDecoder) for line in f]
+        except Exception as e:
+            raise StorageError(f"Failed to load data from file: {e!r}")
+
+        payload = dict(zip(keys, values)) if keys is not None else values[0]
+        document = header["document"]
+        if document is None:
+            return payload
+        document["data"] = payload
+        return DataDecoder().object_hook(document)
+
+
+class CachedStorage(Storage):
+    """Write-behind cache in front of another :class:`Storage`.
+
+    :meth:`load` reads from the wrapped storage only once and is served from memory afterwards.
+    :meth:`save` only updates the cached data and returns immediately. The data is written to the wrapped storage
+    once no further save was made for ``delay`` seconds, on a background thread, or when :meth:`flush` is called.
+    Used as a context manager, pending data is flushed on exit.
+
+    Errors raised while saving on the background thread are kept and raised as :class:`StorageError` by the next call
+    to :meth:`flush`. The data stays pending, so a later flush retries the save.
+
+    Note
+    ----
+    The data passed to :meth:`save` is serialized when it is written, not when :meth:`save` is called.
+    Pass a copy if the data is modified while a save is pending.
+    cadwork's API must only be used from the main thread, therefore a wrapped :class:`ProjectStorage` is not written
+    in the background by default. Call :meth:`flush` at suitable points instead.
+
+    Parameters
+    ----------
+    storage : :class:`Storage`
+        The storage to write to and read from.
+    delay : float, optional
+        Time in seconds without further saves after which pending data is written in the background.
+    background : bool, optional
+        If False, data is only written by :meth:`flush`.
+        Defaults to False if ``storage`` is a :class:`ProjectStorage`, True otherwise.
+
+    Examples
+    --------
+    >>> with CachedStorage(FileStorage("state.json")) as storage:
+    ...     for step in steps:
+    ...         state["step"] = step
+    ...         storage.save(state)  # does not block
+
+    """
+
+    def __init__(self, storage: Storage, delay: float = 1.0, background: Optional[bool] = None):
+        self.storage = storage
+        self.delay = delay
+        if background is None:
+            background = not isinstance(storage, ProjectStorage)
+        self.background = background
+        self._condition = threading.Condition(threading.RLock())
+        # serializes writes to the wrapped storage
+        self._write_lock = threading.Lock()
+        self._data = None
+        self._is_cached = False
+        self._is_dirty = False
+        self._deadline: Optional[float] = None
+        self._error: Optional[Exception] = None
+        self._worker: Optional[threading.Thread] = None
+        self._is_closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def is_dirty(self) -> bool:
+        """bool: True if saved data was not yet written to the wrapped storage."""
+        return self._is_dirty
+
+    def save(self, data: Dict | Data):
+        """Caches the data and schedules it to be written to the wrapped storage.
+
+        Parameters
+        ----------
+        data : dict or :class:`compas.data.Data`
+            The data to save.
+
+        """
+        with self._condition:
+            if self._is_closed:
+                raise StorageError("Cannot save to a closed CachedStorage.")
+            self._data = data
+            self._is_cached = True
+            self._is_dirty = True
+            if self.background:
+                self._deadline = time.monotonic() + self.delay
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="CachedStorage", daemon=True)
+                    self._worker.start()
+                self._condition.notify()
+
+    def load(self) -> Dict | Data:
+        """Load the data, from memory if it was loaded or saved before.
+
+        Raises
+        ------
+        StorageError
+            If the wrapped storage fails to load the data.
+
+        Returns
+        -------
+        dict or :class:`compas.data.Data`
+            The loaded data.
+        """
+        with self._condition:
+            if self._is_cached:
+                return self._data
+        data = self.storage.load()
+        with self._condition:
+            if not self._is_cached:
+                self._data = data
+                self._is_cached = True
+            return self._data
+
+    def invalidate(self) -> None:
+        """Discards the cached data, unless a save is pending. The next :meth:`load` reads from the wrapped storage."""
+        with self._condition:
+            if not self._is_dirty:
+                self._data = None
+                self._is_cached = False
+
+    def flush(self) -> None:
+        """Writes pending data to the wrapped storage.
+
+        Raises
+        ------
+        StorageError
+            If saving failed, either now or on the background thread since the last flush.
+
+        """
+        with self._condition:
+            error, self._error = self._error, None
+        if error is not None:
+            raise StorageError(f"Failed to save data in the background: {error}") from error
+        try:
+            self._write()
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"Failed to save data: {e}") from e
+
+    def close(self) -> None:
+        """Flushes pending data and stops the background thread.
+
+        Raises
+        ------
+        StorageError
+            If saving failed.
+
+        """
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._is_closed = True
+                worker, self._worker = self._worker, None
+                self._condition.notify()
+            if worker is not None:
+                worker.join()
+
+    def _write(self) -> None:
+        with self._write_lock:
+            with self._condition:
+                if not self._is_dirty:
+                    return
+                data = self._data
+                self._is_dirty = False
+                self._deadline = None
+            try:
+                self.storage.save(data)
+            except Exception:
+                with self._condition:
+                    self._is_dirty = True
+                raise
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._is_closed:
+                    if self._is_dirty and self._deadline is not None:
+                        remaining = self._deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._is_closed:
+                    return
+            try:
+                self._write()
+            except Exception as e:
+                LOG.warning("Failed to save data in the background: %s", e)
+                with self._condition:
+                    self._error = e
+                    # wait for the next save or flush before retrying
+                    self._deadline = None
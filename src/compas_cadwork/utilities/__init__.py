@@ -1,21 +1,53 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from typing import Dict
 from typing import Generator
+from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Union
 
 import attribute_controller as ac
-import cadwork
 import element_controller as ec
 import utility_controller as uc
 import visualization_controller as vc
 from compas.geometry import Point
+from compas_cadwork._lazy import attach
+from compas_cadwork.bridge import BridgeExecutor
 from compas_cadwork.conversions import point_to_compas
-from compas_cadwork.datamodel import Dimension
+from compas_cadwork.conversions import points_to_compas
+from compas_cadwork.datamodel import ATTR_INSTRUCTION_ID
 from compas_cadwork.datamodel import Element
 from compas_cadwork.datamodel import ElementGroup
+from compas_cadwork.datamodel.cache import invalidate_element
+from compas_cadwork.datamodel.observers import notify_attribute_set
+from compas_cadwork.datamodel.observers import notify_elements_removed
+
+from .catalog import ElementCatalog
+from .groups import GroupIndex
+from .refresh import RefreshStats
+from .refresh import disable_autorefresh
+from .refresh import enable_autorefresh
+from .refresh import force_refresh
+from .refresh import get_refresh_stats
+from .refresh import reset_refresh_stats
+from .refresh import suspended_refresh
+
+if TYPE_CHECKING:
+    from compas_cadwork.datamodel import AttributeIndex
+    from compas_cadwork.datamodel import ElementTable
+
+# imported on first access, they pull in dependencies which most users of this package never need
+_LAZY_IMPORTS = {
+    "IFCExporter": ".ifc_export",
+    "IFCExportResult": ".ifc_export",
+    "IFCExportSettings": ".ifc_export",
+    "SpatialIndex": ".spatial",
+}
+
 
-from .ifc_export import IFCExporter
-from .ifc_export import IFCExportSettings
+__getattr__, __dir__ = attach(globals(), _LAZY_IMPORTS)
 
 
 def zoom_active_elements():
@@ -81,7 +113,7 @@ def get_bounding_box_from_cadwork_object(element: Union[int, Element]) -> List[P
     """
     element_id = element.id if isinstance(element, Element) else element
     bbox = ec.get_bounding_box_vertices_local(element_id, [element_id])
-    return [point_to_compas(p) for p in bbox]
+    return points_to_compas(bbox)
 
 
 def is_cadwork_window_in_dark_mode() -> bool:
@@ -99,7 +131,24 @@ def get_filename() -> str:
     return uc.get_3d_file_name()
 
 
-def get_dimensions():
+def get_dimensions(catalog: Optional[ElementCatalog] = None):
+    """Returns the linear dimensions of the document.
+
+    Parameters
+    ----------
+    catalog : :class:`ElementCatalog`, optional
+        If given, the dimensions are taken from the catalog instead of checking the type of every element.
+
+    Returns
+    -------
+    list(:class:`~compas_cadwork.datamodel.Dimension`)
+
+    """
+    if catalog is not None:
+        return catalog.dimensions
+
+    from compas_cadwork.datamodel import Dimension
+
     result = []
     for dim in filter(lambda element: element.is_linear_dimension, get_all_elements(include_instructions=True)):
         result.append(Dimension(dim.id))
@@ -109,6 +158,8 @@ def get_dimensions():
 def get_element_groups(is_wall_frame: bool = True) -> Dict[str, ElementGroup]:
     """Returns a dictionary mapping names of the available building subgroups to their elements.
 
+    Use :class:`GroupIndex` directly to repeatedly look up groups or to update the groups incrementally.
+
     Parameters
     ----------
     is_wall_frame : bool, optional
@@ -120,57 +171,46 @@ def get_element_groups(is_wall_frame: bool = True) -> Dict[str, ElementGroup]:
         Dictionary of building group names mapped to an instance of ElementGroup.
 
     """
-    get_grouping_name = _get_grouping_func()
-
-    groups_elements = {}
-    for element_id in ec.get_all_identifiable_element_ids():
-        group_name = get_grouping_name(element_id)
+    return GroupIndex.from_document().to_element_groups(is_wall_frame)
 
-        if not group_name:
-            continue
 
-        if group_name not in groups_elements:
-            groups_elements[group_name] = ElementGroup(group_name)
-        groups_elements[group_name].add_element(Element(element_id))
+async def get_element_groups_async(is_wall_frame: bool = True, executor: Optional[BridgeExecutor] = None) -> Dict[str, ElementGroup]:
+    """Like :func:`get_element_groups`, but awaitable from a coroutine running outside of the cadwork host thread.
 
-    if is_wall_frame:
-        _remove_wallless_groups(groups_elements)
+    The groups are collected with a single job on the host thread, see :class:`~compas_cadwork.bridge.BridgeExecutor`.
 
-    return groups_elements
+    Note
+    ----
+    The groups only hold element ids, their :attr:`~compas_cadwork.datamodel.ElementGroup.name`,
+    :attr:`~compas_cadwork.datamodel.ElementGroup.element_ids` and the ``id`` of their elements can be used on any thread.
+    Properties of the elements call cadwork and must be read in a job, e.g. with an :class:`~compas_cadwork.datamodel.ElementTable`:
+    ``await executor.call_async(ElementTable, group.element_ids, ["name", "frame"])``.
 
+    Parameters
+    ----------
+    is_wall_frame : bool, optional
+        If True, only wall groups which contain a wall frame elements are returned, otherwise all groups are returned.
+    executor : :class:`~compas_cadwork.bridge.BridgeExecutor`, optional
+        The executor of the host thread. Defaults to the current executor.
 
-def get_element_groups_from_selection(is_wall_frame: bool = True) -> Dict[str, ElementGroup]:
-    """Return a dictionary of ElementGroups built from the currently selected elements."""
-
-    get_grouping_name = _get_grouping_func()
-
-    groups_elements = {}
-    for element_id in ec.get_active_identifiable_element_ids():
-        group_name = get_grouping_name(element_id)
-        if not group_name:
-            group_name = "Ungrouped"
-
-        if group_name not in groups_elements:
-            groups_elements[group_name] = ElementGroup(group_name)
-        groups_elements[group_name].add_element(Element(element_id))
-
-    if is_wall_frame:
-        _remove_wallless_groups(groups_elements)
+    Returns
+    -------
+    dict(str, :class:`~compas_cadwork.datamodel.ElementGroup`)
+        Dictionary of building group names mapped to an instance of ElementGroup.
 
-    return groups_elements
+    """
+    executor = executor or BridgeExecutor.current()
+    return await executor.call_async(get_element_groups, is_wall_frame)
 
 
-def _get_grouping_func() -> callable:
-    if ac.get_element_grouping_type() == cadwork.element_grouping_type.subgroup:
-        return ac.get_subgroup
-    else:
-        return ac.get_group
+def get_element_groups_from_selection(is_wall_frame: bool = True) -> Dict[str, ElementGroup]:
+    """Return a dictionary of ElementGroups built from the currently selected elements.
 
+    Selected elements which do not belong to any group are returned in the group ``"Ungrouped"``,
+    together with the selected elements of a group of that name, if any.
 
-def _remove_wallless_groups(groups: Dict[str, ElementGroup]) -> None:
-    to_remove = [group for group in groups.values() if group.wall_frame_element is None]
-    for group in to_remove:
-        del groups[group.name]
+    """
+    return GroupIndex.from_selection().to_element_groups(is_wall_frame, ungrouped_name="Ungrouped")
 
 
 def activate_elements(elements: List[Union[Element, int]]) -> None:
@@ -261,28 +301,15 @@ def hide_all_elements() -> None:
     vc.hide_all_elements()
 
 
-def disable_autorefresh() -> None:
-    """Disables the automatic refresh of the cadwork viewport."""
-    uc.disable_auto_display_refresh()
-
-
-def enable_autorefresh() -> None:
-    """Enables the automatic refresh of the cadwork viewport."""
-    uc.enable_auto_display_refresh()
-
-
-def force_refresh() -> None:
-    """Forces a refresh of the cadwork viewport."""
-    vc.refresh()
-
-
-def get_all_element_ids(include_instructions: bool = False) -> Generator[int, None, None]:
+def get_all_element_ids(include_instructions: bool = False, index: Optional[AttributeIndex] = None) -> Generator[int, None, None]:
     """Returns all element ids of the currently open cadwork document.
 
     Parameters
     ----------
     include_instructions : bool, optional
         If True, also include instruction elements in the result.
+    index : :class:`compas_cadwork.datamodel.AttributeIndex`, optional
+        If given, instruction elements are filtered using the index.
 
     Returns
     -------
@@ -290,7 +317,7 @@ def get_all_element_ids(include_instructions: bool = False) -> Generator[int, No
         Generator of element ids.
 
     """
-    for element in get_all_elements(include_instructions):
+    for element in get_all_elements(include_instructions, index):
         yield element.id
 
 
@@ -304,13 +331,15 @@ def get_user_point():
     return point_to_compas(uc.get_user_point())
 
 
-def get_all_elements(include_instructions: bool = False) -> Generator[Element, None, None]:
+def get_all_elements(include_instructions: bool = False, index: Optional[AttributeIndex] = None) -> Generator[Element, None, None]:
     """Returns all element ids of the currently open cadwork document.
 
     Parameters
     ----------
     include_instructions : bool, optional
         If True, also include instruction elements in the result.
+    index : :class:`compas_cadwork.datamodel.AttributeIndex`, optional
+        If given, instruction elements are filtered using the index instead of reading the attribute of every element.
 
     Returns
     -------
@@ -318,13 +347,61 @@ def get_all_elements(include_instructions: bool = False) -> Generator[Element, N
         Generator of elements.
 
     """
-    for element_id in ec.get_all_identifiable_element_ids():
-        element = Element(element_id)
-        if include_instructions or not element.is_instruction:
-            yield element
+    if include_instructions:
+        for element_id in ec.get_all_identifiable_element_ids():
+            yield Element(element_id)
+    elif index is not None:
+        instruction_ids = index.ids_with_attribute(ATTR_INSTRUCTION_ID)
+        for element_id in ec.get_all_identifiable_element_ids():
+            if element_id not in instruction_ids:
+                yield Element(element_id)
+    else:
+        for element_id in ec.get_all_identifiable_element_ids():
+            element = Element(element_id)
+            if not element.is_instruction:
+                yield element
+
+
+async def get_all_elements_async(
+    include_instructions: bool = False,
+    index: Optional[AttributeIndex] = None,
+    fields: Iterable[str] = (),
+    executor: Optional[BridgeExecutor] = None,
+) -> ElementTable:
+    """Like :func:`get_all_elements`, but awaitable from a coroutine running outside of the cadwork host thread.
+
+    The elements and the requested fields are fetched with a single job on the host thread, see :class:`~compas_cadwork.bridge.BridgeExecutor`.
+    Unlike :class:`~compas_cadwork.datamodel.Element`, the records of the result do not call cadwork and can be used on any thread.
+
+    Parameters
+    ----------
+    include_instructions : bool, optional
+        If True, instruction elements are included in the result.
+    index : :class:`compas_cadwork.datamodel.AttributeIndex`, optional
+        If given, instructions are looked up in the index instead of reading the attribute of every element.
+    fields : iterable(str), optional
+        The names of the :class:`~compas_cadwork.datamodel.Element` properties to fetch, see :attr:`~compas_cadwork.datamodel.ElementTable.FIELDS`.
+        By default, only the ids are fetched.
+    executor : :class:`~compas_cadwork.bridge.BridgeExecutor`, optional
+        The executor of the host thread. Defaults to the current executor.
+
+    Returns
+    -------
+    :class:`compas_cadwork.datamodel.ElementTable`
+        One :class:`~compas_cadwork.datamodel.ElementSnapshot` per element.
+
+    """
+    executor = executor or BridgeExecutor.current()
+    return await executor.call_async(_get_element_table, include_instructions, index, list(fields))
+
+
+def _get_element_table(include_instructions: bool, index: Optional[AttributeIndex], fields: List[str]) -> ElementTable:
+    from compas_cadwork.datamodel import ElementTable
+
+    return ElementTable([element.id for element in get_all_elements(include_instructions, index)], fields)
 
 
-def get_all_elements_with_attrib(attrib_number, attrib_value=None):
+def get_all_elements_with_attrib(attrib_number, attrib_value=None, index: Optional[AttributeIndex] = None):
     """Returns a generator containing all elements with the given user attribute set to the given value.
 
     Parameters
@@ -333,12 +410,22 @@ def get_all_elements_with_attrib(attrib_number, attrib_value=None):
         The user attribute number to filter by.
     attrib_value : str, optional
         The value the user attribute should have.
+    index : :class:`compas_cadwork.datamodel.AttributeIndex`, optional
+        If given, the elements are looked up in the index instead of reading the attribute of every element.
 
     Returns
     -------
     generator(:class:`compas_cadwork.datamodel.Element`)
         Generator of elements
     """
+    if index is not None:
+        matching_ids = index.lookup(attrib_number, attrib_value)
+        # iterate the document to keep its order and to skip elements which were deleted in the meantime
+        for element_id in ec.get_all_identifiable_element_ids():
+            if element_id in matching_ids:
+                yield Element(element_id)
+        return
+
     for element_id in ec.get_all_identifiable_element_ids():
         if ac.get_user_attribute(element_id, attrib_number) == attrib_value:
             yield Element(element_id)
@@ -354,6 +441,46 @@ def remove_elements(elements: List[Union[Element, int]]) -> None:
     """
     element_ids = [element.id if isinstance(element, Element) else element for element in elements]
     ec.delete_elements(element_ids)
+    for element_id in element_ids:
+        invalidate_element(element_id)
+    notify_elements_removed(element_ids)
+
+
+def set_user_attribute(elements: List[Union[Element, int]], attribute_number: int, value: str) -> None:
+    """Sets a user attribute to the same value on all given elements with a single cadwork call.
+
+    Parameters
+    ----------
+    elements : list(:class:`compas_cadwork.datamodel.Element` or int)
+        List of elements or element ids.
+    attribute_number : int
+        The number of the user attribute.
+    value : str
+        The value of the user attribute.
+
+    """
+    element_ids = [element.id if isinstance(element, Element) else element for element in elements]
+    ac.set_user_attribute(element_ids, attribute_number, value)
+    for element_id in element_ids:
+        invalidate_element(element_id)
+    notify_attribute_set(element_ids, attribute_number, value)
+
+
+def set_name(elements: List[Union[Element, int]], name: str) -> None:
+    """Sets the same name on all given elements with a single cadwork call.
+
+    Parameters
+    ----------
+    elements : list(:class:`compas_cadwork.datamodel.Element` or int)
+        List of elements or element ids.
+    name : str
+        The name to set.
+
+    """
+    element_ids = [element.id if isinstance(element, Element) else element for element in elements]
+    ac.set_name(element_ids, name)
+    for element_id in element_ids:
+        invalidate_element(element_id)
 
 
 def save_project_file():
@@ -362,8 +489,13 @@ def save_project_file():
 
 
 __all__ = [
+    "GroupIndex",
+    "ElementCatalog",
     "IFCExportSettings",
     "IFCExporter",
+    "IFCExportResult",
+    "RefreshStats",
+    "SpatialIndex",
     "activate_elements",
     "disable_autorefresh",
     "enable_autorefresh",
@@ -371,11 +503,14 @@ __all__ = [
     "get_active_elements",
     "get_all_element_ids",
     "get_all_elements",
+    "get_all_elements_async",
     "get_element_groups_from_selection",
     "get_all_elements_with_attrib",
+    "get_refresh_stats",
     "get_bounding_box_from_cadwork_object",
     "get_dimensions",
     "get_element_groups",
+    "get_element_groups_async",
     "get_filename",
     "get_plugin_home",
     "get_user_point",
@@ -384,8 +519,12 @@ __all__ = [
     "is_cadwork_window_in_dark_mode",
     "lock_elements",
     "remove_elements",
+    "reset_refresh_stats",
     "save_project_file",
+    "set_name",
+    "set_user_attribute",
     "show_all_elements",
+    "suspended_refresh",
     "unlock_elements",
     "zoom_active_elements",
 ]
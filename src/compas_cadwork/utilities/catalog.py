@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+import attribute_controller as ac
+import element_controller as ec
+
+from compas_cadwork.datamodel import ATTR_INSTRUCTION_ID
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementObserver
+from compas_cadwork.datamodel.element import _get_grouping_func
+
+if TYPE_CHECKING:
+    from compas_cadwork.datamodel import Dimension
+
+    from .events import ElementChanges
+
+BEAM = "beam"
+DIMENSION = "dimension"
+GRIDLINE = "gridline"
+DRILLING = "drilling"
+OPENING = "opening"
+WALL = "wall"
+ROOF = "roof"
+FLOOR = "floor"
+INSTRUCTION = "instruction"
+
+KINDS = (BEAM, DIMENSION, GRIDLINE, DRILLING, OPENING, WALL, ROOF, FLOOR, INSTRUCTION)
+
+
+class ElementCatalog(ElementObserver):
+    """Partitions elements by kind in a single pass, so that later queries by kind or group do not call cadwork.
+
+    Each element is classified once with one call for its element type, one for its group and one for its instruction attribute.
+    Only elements which are neither beams, dimensions nor surfaces are additionally checked for being drillings, openings
+    or framed walls, roofs or floors, and are at most one of these. cadwork represents each of them with its own element type,
+    so the checks are skipped where their result is known to be False.
+    With this, the kinds match the ``is_<kind>`` properties of :class:`~compas_cadwork.datamodel.Element`, e.g. ``"gridline"``
+    includes surfaces as well as elements of groups whose name contains ``GL_``, like :attr:`Element.is_gridline`.
+    An element can be of several kinds, e.g. an instruction is also a beam or a dimension.
+    Elements removed through :class:`~compas_cadwork.datamodel.Element` and instruction attributes set or removed through it
+    are applied automatically. Other changes are applied with :meth:`update` or :meth:`apply_changes`.
+
+    Parameters
+    ----------
+    element_ids : iterable(int), optional
+        The ids of the elements to classify.
+
+    Attributes
+    ----------
+    KINDS : tuple(str)
+        The names of all kinds.
+
+    Examples
+    --------
+    >>> catalog = ElementCatalog.from_document()
+    >>> catalog.dimensions
+    [Dimension(id=42)]
+    >>> catalog.beams_in_group("Wall_01")
+    [Element(id=12), Element(id=13)]
+    >>> catalog.update(added=new_ids, removed=deleted_ids)
+
+    """
+
+    KINDS = KINDS
+
+    def __init__(self, element_ids: Optional[Iterable[int]] = None) -> None:
+        super().__init__()
+        self._grouping_type = None
+        self._get_grouping_name = None
+        self._kinds_by_id: Dict[int, FrozenSet[str]] = {}
+        self._group_by_id: Dict[int, str] = {}
+        # dicts are used as insertion ordered sets to keep the order of the elements stable
+        self._ids_by_kind: Dict[str, Dict[int, None]] = {kind: {} for kind in KINDS}
+        self._ids_by_group: Dict[str, Dict[int, None]] = {}
+        self.build(element_ids or [])
+
+    def __len__(self) -> int:
+        return len(self._kinds_by_id)
+
+    def __contains__(self, element_id: int) -> bool:
+        return element_id in self._kinds_by_id
+
+    @classmethod
+    def from_document(cls) -> ElementCatalog:
+        """Creates a catalog of all identifiable elements of the currently open cadwork document.
+
+        Returns
+        -------
+        :class:`ElementCatalog`
+
+        """
+        return cls(ec.get_all_identifiable_element_ids())
+
+    @property
+    def beams(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The rectangular and circular beams."""
+        return self.elements(BEAM)
+
+    @property
+    def dimensions(self) -> List[Dimension]:
+        """list(:class:`~compas_cadwork.datamodel.Dimension`): The linear dimensions."""
+        from compas_cadwork.datamodel import Dimension
+
+        return [Dimension(element_id) for element_id in self._ids_by_kind[DIMENSION]]
+
+    @property
+    def gridlines(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The surfaces and the elements of groups whose name contains ``GL_``."""
+        return self.elements(GRIDLINE)
+
+    @property
+    def drillings(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The drillings."""
+        return self.elements(DRILLING)
+
+    @property
+    def openings(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The openings."""
+        return self.elements(OPENING)
+
+    @property
+    def walls(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The framed walls."""
+        return self.elements(WALL)
+
+    @property
+    def roofs(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The framed roofs."""
+        return self.elements(ROOF)
+
+    @property
+    def floors(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The framed floors."""
+        return self.elements(FLOOR)
+
+    @property
+    def instructions(self) -> List[Element]:
+        """list(:class:`~compas_cadwork.datamodel.Element`): The instruction elements added by compas_cadwork."""
+        return self.elements(INSTRUCTION)
+
+    @property
+    def group_names(self) -> List[str]:
+        """list(str): The names of all catalogued groups, excluding the empty group name of ungrouped elements."""
+        return [name for name in self._ids_by_group if name]
+
+    def build(self, element_ids: Iterable[int]) -> None:
+        """Discards the current contents of the catalog and classifies the given elements.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements to classify.
+
+        """
+        self._grouping_type = ac.get_element_grouping_type()
+        self._get_grouping_name = _get_grouping_func(self._grouping_type)
+        self._kinds_by_id.clear()
+        self._group_by_id.clear()
+        self._ids_by_group.clear()
+        for ids in self._ids_by_kind.values():
+            ids.clear()
+        for element_id in element_ids:
+            self._add(element_id)
+
+    def update(self, added: Iterable[int] = (), removed: Iterable[int] = ()) -> None:
+        """Updates the catalog for the given elements only.
+
+        Added elements which are already catalogued are classified again, e.g. after they were modified.
+        If the grouping type of the document changed since the catalog was built, all elements are classified again.
+
+        Parameters
+        ----------
+        added : iterable(int), optional
+            The ids of added or modified elements.
+        removed : iterable(int), optional
+            The ids of removed elements.
+
+        """
+        self.discard(removed)
+        added = list(added)
+        if ac.get_element_grouping_type() != self._grouping_type:
+            self.build(list(self._kinds_by_id) + [element_id for element_id in added if element_id not in self._kinds_by_id])
+            return
+        for element_id in added:
+            self._remove(element_id)
+            self._add(element_id)
+
+    def apply_changes(self, changes: ElementChanges) -> None:
+        """Updates the catalog with the result of a :meth:`ChangeTracker.poll <compas_cadwork.utilities.events.ChangeTracker.poll>`.
+
+        Parameters
+        ----------
+        changes : :class:`~compas_cadwork.utilities.events.ElementChanges`
+            The added, removed and modified elements.
+
+        """
+        self.update(added=changes.added + changes.modified, removed=changes.removed)
+
+    def discard(self, element_ids: Iterable[int]) -> None:
+        """Removes the given elements from the catalog.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements to remove.
+
+        """
+        for element_id in element_ids:
+            self._remove(element_id)
+
+    def kinds_of(self, element_id: int) -> FrozenSet[str]:
+        """Returns the kinds of the given element.
+
+        Parameters
+        ----------
+        element_id : int
+            The id of the element.
+
+        Returns
+        -------
+        frozenset(str)
+            The kinds, see :attr:`KINDS`. Empty if the element is not catalogued.
+
+        """
+        return self._kinds_by_id.get(element_id, frozenset())
+
+    def group_of(self, element_id: int) -> Optional[str]:
+        """Returns the name of the group the given element belongs to.
+
+        Parameters
+        ----------
+        element_id : int
+            The id of the element.
+
+        Returns
+        -------
+        str, optional
+            The name of the group. Empty string if the element is not grouped, None if the element is not catalogued.
+
+        """
+        return self._group_by_id.get(element_id)
+
+    def element_ids(self, kind: str) -> List[int]:
+        """Returns the ids of the elements of the given kind.
+
+        Parameters
+        ----------
+        kind : str
+            One of :attr:`KINDS`.
+
+        Returns
+        -------
+        list(int)
+
+        """
+        return list(self._ids_by_kind[kind])
+
+    def elements(self, kind: str) -> List[Element]:
+        """Returns the elements of the given kind.
+
+        Parameters
+        ----------
+        kind : str
+            One of :attr:`KINDS`.
+
+        Returns
+        -------
+        list(:class:`~compas_cadwork.datamodel.Element`)
+
+        """
+        return [Element(element_id) for element_id in self._ids_by_kind[kind]]
+
+    def elements_in_group(self, group_name: str, kind: Optional[str] = None) -> List[Element]:
+        """Returns the elements of the given group, optionally only those of the given kind.
+
+        Parameters
+        ----------
+        group_name : str
+            The name of the group.
+        kind : str, optional
+            One of :attr:`KINDS`. If None, all elements of the group are returned.
+
+        Returns
+        -------
+        list(:class:`~compas_cadwork.datamodel.Element`)
+
+        """
+        element_ids = self._ids_by_group.get(group_name, ())
+        if kind is not None:
+            of_kind = self._ids_by_kind[kind]
+            element_ids = [element_id for element_id in element_ids if element_id in of_kind]
+        return [Element(element_id) for element_id in element_ids]
+
+    def beams_in_group(self, group_name: str) -> List[Element]:
+        """Returns the beams of the given group.
+
+        Parameters
+        ----------
+        group_name : str
+            The name of the group.
+
+        Returns
+        -------
+        list(:class:`~compas_cadwork.datamodel.Element`)
+
+        """
+        return self.elements_in_group(group_name, BEAM)
+
+    def _classify(self, element_id: int, group_name: str) -> Set[str]:
+        kinds = set()
+        type_ = ac.get_element_type(element_id)
+        if type_.is_rectangular_beam() or type_.is_circular_beam():
+            kinds.add(BEAM)
+        elif type_.is_dimension():
+            kinds.add(DIMENSION)
+        elif type_.is_surface():
+            kinds.add(GRIDLINE)
+        elif ac.is_drilling(element_id):
+            kinds.add(DRILLING)
+        elif ac.is_opening(element_id):
+            kinds.add(OPENING)
+        elif ac.is_framed_wall(element_id):
+            kinds.add(WALL)
+        elif ac.is_framed_roof(element_id):
+            kinds.add(ROOF)
+        elif ac.is_framed_floor(element_id):
+            kinds.add(FLOOR)
+        if "GL_" in group_name:
+            kinds.add(GRIDLINE)
+        if ac.get_user_attribute(element_id, ATTR_INSTRUCTION_ID) != "":
+            kinds.add(INSTRUCTION)
+        return kinds
+
+    def _add(self, element_id: int) -> None:
+        group_name = self._get_grouping_name(element_id)
+        kinds = self._classify(element_id, group_name)
+        self._kinds_by_id[element_id] = frozenset(kinds)
+        self._group_by_id[element_id] = group_name
+        self._ids_by_group.setdefault(group_name, {})[element_id] = None
+        for kind in kinds:
+            self._ids_by_kind[kind][element_id] = None
+
+    def _remove(self, element_id: int) -> None:
+        kinds = self._kinds_by_id.pop(element_id, None)
+        if kinds is None:
+            return
+        for kind in kinds:
+            del self._ids_by_kind[kind][element_id]
+        group_name = self._group_by_id.pop(element_id)
+        members = self._ids_by_group[group_name]
+        del members[element_id]
+        if not members:
+            del self._ids_by_group[group_name]
+
+    def _set_instruction(self, element_id: int, is_instruction: bool) -> None:
+        kinds = self._kinds_by_id.get(element_id)
+        if kinds is None or (INSTRUCTION in kinds) == is_instruction:
+            return
+        if is_instruction:
+            self._kinds_by_id[element_id] = kinds | {INSTRUCTION}
+            self._ids_by_kind[INSTRUCTION][element_id] = None
+        else:
+            self._kinds_by_id[element_id] = kinds - {INSTRUCTION}
+            del self._ids_by_kind[INSTRUCTION][element_id]
+
+    def elements_removed(self, element_ids: List[int]) -> None:
+        self.discard(element_ids)
+
+    def attribute_set(self, element_ids: List[int], attribute_number: int, value: str) -> None:
+        if attribute_number == ATTR_INSTRUCTION_ID:
+            for element_id in element_ids:
+                self._set_instruction(element_id, value != "")
+
+    def attribute_removed(self, attribute_number: int) -> None:
+        if attribute_number == ATTR_INSTRUCTION_ID:
+            # a removed list item does not tell which elements had it, re-read the attribute of the instructions
+            for element_id in list(self._ids_by_kind[INSTRUCTION]):
+                self._set_instruction(element_id, ac.get_user_attribute(element_id, ATTR_INSTRUCTION_ID) != "")
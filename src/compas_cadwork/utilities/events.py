@@ -1,15 +1,266 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+import attribute_controller as ac
+import element_controller as ec
+import geometry_controller as gc
+
+from compas_cadwork.datamodel import FINGERPRINT_PRECISION
+from compas_cadwork.datamodel import Dimension
 from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementObserver
+
+
+def _point_key(point) -> tuple:
+    return (round(point.x, FINGERPRINT_PRECISION), round(point.y, FINGERPRINT_PRECISION), round(point.z, FINGERPRINT_PRECISION))
+
+
+def fingerprint_element(element_id: int, attribute_numbers: Iterable[int] = ()) -> int:
+    """Returns a compact hash of an element's geometry and attributes.
+
+    For dimensions, the hash covers the dimension's anchor points, for all other elements it covers the
+    element's axis, cross section and length.
+
+    Parameters
+    ----------
+    element_id : int
+        The id of the element.
+    attribute_numbers : iterable(int), optional
+        Numbers of user attributes to include in the hash.
+
+    Returns
+    -------
+    int
+
+    """
+    if ac.get_element_type(element_id).is_dimension():
+        geometry = Dimension(element_id).anchor_fingerprint
+    else:
+        geometry = (
+            _point_key(gc.get_p1(element_id)),
+            _point_key(gc.get_p2(element_id)),
+            _point_key(gc.get_xl(element_id)),
+            _point_key(gc.get_yl(element_id)),
+            round(gc.get_width(element_id), FINGERPRINT_PRECISION),
+            round(gc.get_height(element_id), FINGERPRINT_PRECISION),
+        )
+    attributes = tuple(ac.get_user_attribute(element_id, number) for number in attribute_numbers)
+    return hash((geometry, ac.get_name(element_id), attributes))
+
+
+@dataclass
+class ElementChanges:
+    """The result of a :meth:`ChangeTracker.poll`.
+
+    Attributes
+    ----------
+    added : list(int)
+        Ids of elements added since the last poll.
+    removed : list(int)
+        Ids of elements removed since the last poll.
+    modified : list(int)
+        Ids of elements which were modified since the last poll.
+
+    """
+
+    added: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    modified: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class ChangeTracker(ElementObserver):
+    """Detects added, removed and modified elements by comparing compact per-element fingerprints.
+
+    Each poll makes one bulk call for the ids of the document. Only new elements are classified and fingerprinted,
+    and only elements which could have been modified since the last poll are re-fingerprinted:
+
+    * elements modified through :class:`~compas_cadwork.datamodel.Element` (e.g. :meth:`Element.translate`),
+    * elements explicitly passed to :meth:`mark_dirty`,
+    * the currently selected elements, if ``watch_selection`` is True, as these are what the user edits in cadwork.
+
+    The cost of a poll therefore scales with the number of changes rather than with the size of the document.
+    Use ``poll(full=True)`` to re-fingerprint all tracked elements.
+
+    Parameters
+    ----------
+    element_filter : callable, optional
+        Called once with the id of each newly seen element, returns True if the element should be tracked.
+        By default, all elements are tracked.
+    attribute_numbers : iterable(int), optional
+        Numbers of user attributes to include in the fingerprints.
+    track_modifications : bool, optional
+        If False, only additions and removals are tracked and no fingerprints are computed.
+    watch_selection : bool, optional
+        If True, the currently selected elements are re-fingerprinted on each poll.
+    fingerprint : callable, optional
+        Called with an element id and ``attribute_numbers``, returns a hashable fingerprint. Defaults to :func:`fingerprint_element`.
+
+    Examples
+    --------
+    >>> tracker = ChangeTracker()
+    >>> changes = tracker.poll()
+    >>> changes.added, changes.removed, changes.modified
+    ([], [], [])
+
+    """
+
+    def __init__(
+        self,
+        element_filter: Optional[Callable[[int], bool]] = None,
+        attribute_numbers: Iterable[int] = (),
+        track_modifications: bool = True,
+        watch_selection: bool = True,
+        fingerprint: Optional[Callable[[int, Iterable[int]], Hashable]] = None,
+    ) -> None:
+        super().__init__()
+        self.element_filter = element_filter
+        self.attribute_numbers = tuple(attribute_numbers)
+        self.track_modifications = track_modifications
+        self.watch_selection = watch_selection
+        self.fingerprint = fingerprint or fingerprint_element
+        # every id seen so far, mapped to whether it is tracked. avoids re-classifying untracked elements on every poll.
+        self._seen: Dict[int, bool] = {}
+        # the same for ids added since the baseline, which are kept out of it by poll(update=False)
+        self._pending: Dict[int, bool] = {}
+        self._fingerprints: Dict[int, Hashable] = {}
+        self._dirty: Set[int] = set()
+        self.reset()
 
-from . import get_all_element_ids
-from . import get_dimensions
+    @property
+    def tracked_ids(self) -> List[int]:
+        """list(int): The ids of the currently tracked elements."""
+        return [element_id for element_id, is_tracked in self._seen.items() if is_tracked]
+
+    def _is_tracked(self, element_id: int) -> bool:
+        return self.element_filter is None or self.element_filter(element_id)
+
+    def _fingerprint(self, element_id: int) -> Hashable:
+        return self.fingerprint(element_id, self.attribute_numbers)
+
+    def reset(self) -> None:
+        """Takes a new baseline. Changes are reported relative to the state of the document at this point."""
+        self._seen.clear()
+        self._pending.clear()
+        self._fingerprints.clear()
+        self._dirty.clear()
+        for element_id in ec.get_all_identifiable_element_ids():
+            is_tracked = self._seen[element_id] = self._is_tracked(element_id)
+            if is_tracked and self.track_modifications:
+                self._fingerprints[element_id] = self._fingerprint(element_id)
+
+    def mark_dirty(self, element_ids: Iterable[int]) -> None:
+        """Marks elements as possibly modified, they are re-fingerprinted on the next poll.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements.
+
+        """
+        self._dirty.update(element_ids)
+
+    def poll(self, full: bool = False, update: bool = True) -> ElementChanges:
+        """Returns the changes since the last poll (or since :meth:`reset`).
+
+        Parameters
+        ----------
+        full : bool, optional
+            If True, all tracked elements are re-fingerprinted, not only those which could have changed.
+        update : bool, optional
+            If True, the current state becomes the baseline for the next poll.
+            If False, the next poll reports changes relative to the same baseline again.
+
+        Returns
+        -------
+        :class:`ElementChanges`
+
+        """
+        current_ids = ec.get_all_identifiable_element_ids()
+        current_set = set(current_ids)
+        changes = ElementChanges()
+
+        new_seen = {}
+        for element_id in current_ids:
+            if element_id not in self._seen:
+                is_tracked = self._pending.get(element_id)
+                if is_tracked is None:
+                    is_tracked = self._is_tracked(element_id)
+                new_seen[element_id] = is_tracked
+                if is_tracked:
+                    changes.added.append(element_id)
+
+        gone_ids = [element_id for element_id in self._seen if element_id not in current_set]
+        changes.removed = [element_id for element_id in gone_ids if self._seen[element_id]]
+
+        new_fingerprints = {}
+        if self.track_modifications:
+            if full:
+                candidates = set(self._fingerprints)
+            else:
+                candidates = self._dirty & self._fingerprints.keys()
+                if self.watch_selection:
+                    candidates.update(element_id for element_id in ec.get_active_identifiable_element_ids() if element_id in self._fingerprints)
+            candidates -= set(gone_ids)
+
+            for element_id in candidates:
+                fingerprint = self._fingerprint(element_id)
+                if fingerprint != self._fingerprints[element_id]:
+                    changes.modified.append(element_id)
+                    new_fingerprints[element_id] = fingerprint
+            if update:
+                for element_id in changes.added:
+                    new_fingerprints[element_id] = self._fingerprint(element_id)
+
+        if not update:
+            # classified only once, even if they are reported as added again
+            self._pending = new_seen
+        else:
+            self._pending.clear()
+            self._seen.update(new_seen)
+            for element_id in gone_ids:
+                del self._seen[element_id]
+                self._fingerprints.pop(element_id, None)
+            self._fingerprints.update(new_fingerprints)
+            self._dirty.clear()
+        return changes
+
+    def elements_modified(self, element_ids: List[int]) -> None:
+        self._dirty.update(element_ids)
+
+    def attribute_set(self, element_ids: List[int], attribute_number: int, value: str) -> None:
+        if attribute_number in self.attribute_numbers:
+            self._dirty.update(element_ids)
+
+    def attribute_removed(self, attribute_number: int) -> None:
+        if attribute_number in self.attribute_numbers:
+            self._dirty.update(self._fingerprints)
+
+
+def _is_not_instruction(element_id: int) -> bool:
+    return not Element(element_id).is_instruction
+
+
+def _is_dimension(element_id: int) -> bool:
+    return Element(element_id).is_linear_dimension
 
 
 class ElementDelta:
     """Helper for detecting changes in the available element collection"""
 
     def __init__(self):
-        self._known_element_ids = None
-        self.reset()
+        self._tracker = ChangeTracker(element_filter=_is_not_instruction, track_modifications=False)
 
     def check_for_changed_elements(self):
         """Returns a list of element ids added to the file database since the last call.
@@ -19,27 +270,32 @@ class ElementDelta:
         list(:class:`compas_cadwork.datamodel.Element`)
             List of new elements.
         """
-        current_ids = set(get_all_element_ids())
-        new_ids = current_ids - self._known_element_ids
-        removed_ids = self._known_element_ids - current_ids
-        self._known_element_ids = current_ids
-        return [Element(id) for id in new_ids], [Element(id) for id in removed_ids]
+        changes = self._tracker.poll()
+        return [Element(id) for id in changes.added], [Element(id) for id in changes.removed]
 
     def reset(self):
         """Reset the known element ids"""
-        self._known_element_ids = set(get_all_element_ids())
+        self._tracker.reset()
 
 
 class DimensionsDelta:
     """Helper for detecting edits to the dimensions in the document
 
-    TODO: check if and how this can be merged with ElementDelta, seems this could do both jobs, question is just the reset point.
+    By default, all dimensions are checked on each call, at a cost which grows with the number of dimensions.
+
+    Parameters
+    ----------
+    full_scan : bool, optional
+        If False, only the dimensions which could have been modified are checked, like :class:`ChangeTracker` does:
+        those modified through :class:`~compas_cadwork.datamodel.Element`, the currently selected ones, as these are
+        what the user usually edits in cadwork, and those found modified by earlier calls. This is cheaper, but misses
+        dimensions which were edited in cadwork while not selected at the time of a call.
 
     """
 
-    def __init__(self):
-        self._known_dimensions = None
-        self.reset()
+    def __init__(self, full_scan=True):
+        self.full_scan = full_scan
+        self._tracker = ChangeTracker(element_filter=_is_dimension)
 
     def check_for_changed_dimensions(self):
         """Returns a list of dimensions that existed but were modified since the last call to :method:`reset`.
@@ -49,13 +305,11 @@ class DimensionsDelta:
         list(:class:`compas_cadwork.datamodel.Dimension`)
             List of modified dimensions.
         """
-        # Changes will contain additions as well, since the objects are compared as a whole..
-        # However, addtions need to be handled separately. Therefore, new ids are filtered out.
-        current_dimensions = get_dimensions()
-        changes = set(current_dimensions) - self._known_dimensions
-        additions = set([m.id for m in current_dimensions]) - set([m.id for m in self._known_dimensions])
-        return list(filter(lambda m: m.id not in additions, changes))
+        changes = self._tracker.poll(full=self.full_scan, update=False)
+        # keep comparing them to the baseline, they are reported until reset, unless they are changed back
+        self._tracker.mark_dirty(changes.modified)
+        return [Dimension(element_id) for element_id in changes.modified]
 
     def reset(self):
         """Reset the known dimensions. Any changed dimensions after this call will be considered modifications."""
-        self._known_dimensions = set(get_dimensions())
+        self._tracker.reset()
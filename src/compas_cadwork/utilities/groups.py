@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import attribute_controller as ac
+import element_controller as ec
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementGroup
+from compas_cadwork.datamodel.element import _get_grouping_func
+
+
+def _is_wall_frame(element_id: int) -> bool:
+    return ac.is_framed_wall(element_id) or ac.is_framed_roof(element_id) or ac.is_framed_floor(element_id)
+
+
+class GroupIndex:
+    """Maps element ids to the building group (or subgroup) they belong to and vice versa.
+
+    The index is built in a single pass over the given element ids, with one grouping call per element.
+    The wall frame element of a group is looked up when first requested, checking the group's elements
+    only until a framed wall, roof or floor is found. Other lookups do not call cadwork.
+
+    Parameters
+    ----------
+    element_ids : iterable(int), optional
+        The ids of the elements to index.
+
+    Examples
+    --------
+    >>> index = GroupIndex.from_document()
+    >>> index.group_of(element_id)
+    'Wall_01'
+    >>> index.refresh(changed_ids)
+
+    """
+
+    def __init__(self, element_ids: Optional[Iterable[int]] = None) -> None:
+        self._grouping_type = None
+        self._get_grouping_name = None
+        self._group_by_id: Dict[int, str] = {}
+        # dicts are used as insertion ordered sets to keep the order of the elements stable
+        self._ids_by_group: Dict[str, Dict[int, None]] = {}
+        # groups are only checked for a frame element when it is first requested, a missing key means not checked yet
+        self._frame_by_group: Dict[str, Optional[int]] = {}
+        self.build(element_ids or [])
+
+    def __len__(self) -> int:
+        return len(self._group_by_id)
+
+    def __contains__(self, element_id: int) -> bool:
+        return element_id in self._group_by_id
+
+    @classmethod
+    def from_document(cls) -> GroupIndex:
+        """Creates an index of all identifiable elements of the currently open cadwork document.
+
+        Returns
+        -------
+        :class:`GroupIndex`
+
+        """
+        return cls(ec.get_all_identifiable_element_ids())
+
+    @classmethod
+    def from_selection(cls) -> GroupIndex:
+        """Creates an index of the currently selected elements.
+
+        Returns
+        -------
+        :class:`GroupIndex`
+
+        """
+        return cls(ec.get_active_identifiable_element_ids())
+
+    @property
+    def group_names(self) -> List[str]:
+        """list(str): The names of all indexed groups, excluding the empty group name of ungrouped elements."""
+        return [name for name in self._ids_by_group if name]
+
+    def build(self, element_ids: Iterable[int]) -> None:
+        """Discards the current contents of the index and indexes the given elements.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements to index.
+
+        """
+        self._grouping_type = ac.get_element_grouping_type()
+        self._get_grouping_name = _get_grouping_func(self._grouping_type)
+        self._group_by_id.clear()
+        self._ids_by_group.clear()
+        self._frame_by_group.clear()
+        for element_id in element_ids:
+            self._add(element_id, self._get_grouping_name(element_id))
+
+    def refresh(self, changed_ids: Iterable[int]) -> None:
+        """Updates the index for the given elements only.
+
+        Elements which no longer exist in the document are removed, elements which are new or were moved to another group are (re-)assigned.
+        If the grouping type of the document changed since the index was built, all currently indexed elements are re-indexed.
+
+        Parameters
+        ----------
+        changed_ids : iterable(int)
+            The ids of added, removed or modified elements.
+
+        """
+        changed_ids = list(changed_ids)
+        existing_ids = set(ec.get_all_identifiable_element_ids())
+
+        if ac.get_element_grouping_type() != self._grouping_type:
+            indexed_ids = [element_id for element_id in self._group_by_id if element_id in existing_ids]
+            added_ids = [element_id for element_id in changed_ids if element_id in existing_ids and element_id not in self._group_by_id]
+            self.build(indexed_ids + added_ids)
+            return
+
+        for element_id in changed_ids:
+            if element_id not in existing_ids:
+                self._remove(element_id)
+                continue
+
+            group_name = self._get_grouping_name(element_id)
+            if self._group_by_id.get(element_id) != group_name or self._frame_by_group.get(group_name) == element_id:
+                # removing the frame element resets its group's frame, so the group is re-checked on next access
+                self._remove(element_id)
+                self._add(element_id, group_name)
+            elif group_name in self._frame_by_group and self._frame_by_group[group_name] is None:
+                # the element may have become a framed wall, roof or floor, the group is checked again on next access
+                del self._frame_by_group[group_name]
+
+    def group_of(self, element_id: int) -> Optional[str]:
+        """Returns the name of the group the given element belongs to.
+
+        Parameters
+        ----------
+        element_id : int
+            The id of the element.
+
+        Returns
+        -------
+        str, optional
+            The name of the group. Empty string if the element is not grouped, None if the element is not indexed.
+
+        """
+        return self._group_by_id.get(element_id)
+
+    def element_ids(self, group_name: str) -> List[int]:
+        """Returns the ids of the elements in the given group.
+
+        Parameters
+        ----------
+        group_name : str
+            The name of the group.
+
+        Returns
+        -------
+        list(int)
+
+        """
+        return list(self._ids_by_group.get(group_name, ()))
+
+    def wall_frame_id(self, group_name: str) -> Optional[int]:
+        """Returns the id of the framed wall, roof or floor element of the given group, if any.
+
+        Parameters
+        ----------
+        group_name : str
+            The name of the group.
+
+        Returns
+        -------
+        int, optional
+
+        """
+        return self._resolve_frame(group_name)
+
+    def to_element_groups(self, is_wall_frame: bool = True, ungrouped_name: Optional[str] = None) -> Dict[str, ElementGroup]:
+        """Returns the indexed groups as :class:`~compas_cadwork.datamodel.ElementGroup` instances.
+
+        Parameters
+        ----------
+        is_wall_frame : bool, optional
+            If True, only groups which contain a wall frame element are returned.
+        ungrouped_name : str, optional
+            If given, elements which do not belong to any group are returned in a group with this name. Otherwise they are omitted.
+            If a group with this name exists, the elements which do not belong to any group are added to it.
+
+        Returns
+        -------
+        dict(str, :class:`~compas_cadwork.datamodel.ElementGroup`)
+            Dictionary of group names mapped to their ElementGroup.
+
+        """
+        # group name -> names of the indexed groups it is made of, only more than one for the ungrouped name
+        sources: Dict[str, List[str]] = {}
+        for group_name in self._ids_by_group:
+            if not group_name:
+                if ungrouped_name is None:
+                    continue
+                sources.setdefault(ungrouped_name, []).append(group_name)
+            else:
+                sources.setdefault(group_name, []).append(group_name)
+
+        groups = {}
+        for group_name, indexed_names in sources.items():
+            frame_id = next((frame_id for frame_id in map(self._resolve_frame, indexed_names) if frame_id is not None), None)
+            if is_wall_frame and frame_id is None:
+                continue
+            element_ids = [element_id for indexed_name in indexed_names for element_id in self._ids_by_group[indexed_name]]
+            frame_element = Element(frame_id) if frame_id is not None else None
+            groups[group_name] = ElementGroup.from_element_ids(group_name, element_ids, frame_element)
+        return groups
+
+    def _add(self, element_id: int, group_name: str) -> None:
+        self._group_by_id[element_id] = group_name
+        self._ids_by_group.setdefault(group_name, {})[element_id] = None
+        if group_name in self._frame_by_group and self._frame_by_group[group_name] is None and _is_wall_frame(element_id):
+            self._frame_by_group[group_name] = element_id
+
+    def _remove(self, element_id: int) -> None:
+        group_name = self._group_by_id.pop(element_id, None)
+        if group_name is None:
+            return
+
+        members = self._ids_by_group[group_name]
+        del members[element_id]
+        if not members:
+            del self._ids_by_group[group_name]
+            self._frame_by_group.pop(group_name, None)
+        elif self._frame_by_group.get(group_name) == element_id:
+            # resolved again on next access
+            del self._frame_by_group[group_name]
+
+    def _resolve_frame(self, group_name: str) -> Optional[int]:
+        try:
+            return self._frame_by_group[group_name]
+        except KeyError:
+            pass
+
+        frame_id = None
+        for element_id in self._ids_by_group.get(group_name, ()):
+            if _is_wall_frame(element_id):
+                frame_id = element_id
+                break
+        self._frame_by_group[group_name] = frame_id
+        return frame_id
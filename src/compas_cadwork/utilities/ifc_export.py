@@ -1,12 +1,29 @@
+import hashlib
+import json
 import logging
 import os
+import re
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Union
 
 import bim_controller as bc
 import utility_controller as uc
 
+from compas_cadwork.datamodel import FINGERPRINT_PRECISION
+from compas_cadwork.datamodel import ElementGroup
 from compas_cadwork.datamodel import ElementGroupingType
+from compas_cadwork.datamodel import ElementTable
 
 LOG = logging.getLogger(__name__)
 
@@ -53,13 +70,103 @@ class IFCExportSettings:
         return options
 
 
+@dataclass
+class IFCExportResult:
+    """The result of exporting one group with :meth:`IFCExporter.export_groups_to_ifc`.
+
+    Attributes
+    ----------
+    name : str
+        The name of the exported group.
+    filepath : str
+        Path to the ifc file.
+    success : bool
+        True if the export and the post-processing succeeded.
+    export_time : float
+        Time in seconds spent exporting the file in cadwork.
+    postprocess_time : float
+        Time in seconds spent post-processing the file.
+    postprocess_result : any
+        The value returned by the post-processing function, if any.
+    error : Exception, optional
+        The exception raised by the export or the post-processing, if any.
+    skipped : bool
+        True if the group was unchanged since the last incremental export and the existing file was kept.
+    file_hash : str, optional
+        SHA-256 hash of the ifc file, only set by incremental exports.
+
+    """
+
+    name: str
+    filepath: str
+    success: bool = False
+    export_time: float = 0.0
+    postprocess_time: float = 0.0
+    postprocess_result: Any = None
+    error: Optional[Exception] = None
+    skipped: bool = False
+    file_hash: Optional[str] = None
+
+
+def _group_filename(group_name: str) -> str:
+    # replaces characters which are not allowed in file names on windows
+    filename = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", group_name).strip() or "_"
+    if filename != group_name:
+        # e.g. "A/B" and "A:B", the suffix only depends on the group name, so that the file name is the same in each export
+        filename = f"{filename}_{_name_hash(group_name)}"
+    return filename
+
+
+def _group_filenames(group_names: Iterable[str]) -> Dict[str, str]:
+    # file names are compared case-insensitively, as on windows. colliding names are disambiguated by a hash of the group name.
+    filenames = {name: _group_filename(name) for name in group_names}
+    counts = Counter(filename.casefold() for filename in filenames.values())
+    for name, filename in filenames.items():
+        if counts[filename.casefold()] > 1:
+            filenames[name] = f"{filename}_{_name_hash(name)}"
+    return filenames
+
+
+def _name_hash(name: str) -> str:
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()[:8]
+
+
+def _file_hash(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _timed(func: Optional[Callable[[str], Any]], filepath: str, hash_file: bool = False):
+    # runs on a worker thread, hashing is timed as part of the post-processing
+    start = time.perf_counter()
+    file_hash = _file_hash(filepath) if hash_file else None
+    result = func(filepath) if func is not None else None
+    return result, file_hash, time.perf_counter() - start
+
+
+def _rounded(values) -> tuple:
+    # coordinates are rounded before hashing so that numerical noise does not trigger a re-export
+    return tuple(round(value, FINGERPRINT_PRECISION) for value in values)
+
+
 class IFCExporter:
     """Used to export elements to ifc files.
 
     Sets the required global settings for the export and restores them after the export.
 
+    Attributes
+    ----------
+    MANIFEST_FILENAME : str
+        Name of the manifest file written by incremental exports.
+
     """
 
+    MANIFEST_FILENAME = "ifc_manifest.json"
+    MANIFEST_VERSION = 1
+
     def __init__(self, settings: IFCExportSettings = None) -> None:
         self.settings = settings or IFCExportSettings()
         self._translate_local_frame = None
@@ -78,17 +185,218 @@ class IFCExporter:
 
         """
         self.initialize()
-        filepath = os.path.abspath(filepath)
         options = self.settings.get_ifc_options()
         try:
-            LOG.debug(f"""export_ifc4_silently_with_options(element_i_ds={type(element_ids)}({type(element_ids[0])}), file_path={type(filepath)}, options={type(options)})""")
-            success = bc.export_ifc4_silently_with_options(element_ids, filepath, options)
-            LOG.debug(f"export_ifc4_silently_with_options: {success}")
+            self._export(element_ids, filepath, options)
         except Exception as ex:
             LOG.exception(f"Failed to export elements to ifc. {str(ex)}")
         finally:
             self.cleanup()
 
+    def export_groups_to_ifc(
+        self,
+        groups: Union[Dict[str, ElementGroup], Iterable[ElementGroup]],
+        out_dir: str,
+        postprocess: Optional[Callable[[str], Any]] = None,
+        max_workers: Optional[int] = None,
+        incremental: bool = False,
+    ) -> List[IFCExportResult]:
+        """Exports each of the given element groups to its own ifc file.
+
+        The global settings and the ifc options are set up once for all groups.
+        While cadwork exports the next group, the previously exported files are post-processed on a thread pool.
+
+        Parameters
+        ----------
+        groups : dict(str, :class:`~compas_cadwork.datamodel.ElementGroup`) or list(:class:`~compas_cadwork.datamodel.ElementGroup`)
+            The groups to export, e.g. as returned by :func:`~compas_cadwork.utilities.get_element_groups`.
+        out_dir : str
+            The directory to export to. Files are named after the groups. Characters which are not allowed in file names
+            are replaced, and a short hash of the group name is appended where this or differing case would make names collide.
+        postprocess : callable, optional
+            Called with the path of each exported file, e.g. to validate, hash or compress it.
+            Must be pure Python and must not use cadwork's API, as it runs on a worker thread.
+        max_workers : int, optional
+            The maximum number of post-processing threads.
+        incremental : bool, optional
+            If True, groups whose :meth:`fingerprint_groups` did not change since the last incremental export to ``out_dir``
+            and whose file still exists are not exported again. Fingerprints and file hashes are kept in a manifest file
+            in ``out_dir``, see :attr:`MANIFEST_FILENAME`.
+
+        Returns
+        -------
+        list(:class:`IFCExportResult`)
+            One result per exported or skipped group, in the order of ``groups``. Groups without elements are omitted.
+
+        """
+        if isinstance(groups, dict):
+            groups = groups.values()
+        groups = list(groups)
+        filenames = _group_filenames(group.name for group in groups)
+        os.makedirs(out_dir, exist_ok=True)
+
+        manifest = {}
+        fingerprints = {}
+        if incremental:
+            manifest = self.load_manifest(out_dir)
+            fingerprints = self.fingerprint_groups(groups)
+
+        results = []
+        futures: Dict[int, Future] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="IFCExport") as executor:
+            self.initialize()
+            try:
+                options = self.settings.get_ifc_options()
+                for group in groups:
+                    element_ids = list(group.element_ids)
+                    if not element_ids:
+                        LOG.debug("skipping empty group: %s", group.name)
+                        continue
+
+                    result = IFCExportResult(group.name, os.path.join(out_dir, f"{filenames[group.name]}.ifc"))
+                    results.append(result)
+                    if incremental:
+                        entry = manifest.get(group.name)
+                        if entry and entry["fingerprint"] == fingerprints[group.name] and os.path.exists(result.filepath):
+                            result.success = result.skipped = True
+                            result.file_hash = entry["file_hash"]
+                            continue
+
+                    start = time.perf_counter()
+                    try:
+                        result.success = self._export(element_ids, result.filepath, options)
+                    except Exception as ex:
+                        result.error = ex
+                        LOG.exception(f"Failed to export group {group.name} to ifc. {str(ex)}")
+                    result.export_time = time.perf_counter() - start
+
+                    if result.success and (postprocess is not None or incremental):
+                        futures[len(results) - 1] = executor.submit(_timed, postprocess, result.filepath, incremental)
+            finally:
+                self.cleanup()
+
+        for index, future in futures.items():
+            result = results[index]
+            try:
+                result.postprocess_result, result.file_hash, result.postprocess_time = future.result()
+            except Exception as ex:
+                result.success = False
+                result.error = ex
+                LOG.exception(f"Failed to post-process {result.filepath}. {str(ex)}")
+
+        if incremental:
+            for result in results:
+                if result.success and not result.skipped:
+                    manifest[result.name] = {"fingerprint": fingerprints[result.name], "file_hash": result.file_hash}
+                elif not result.success:
+                    # export again next time
+                    manifest.pop(result.name, None)
+            self.save_manifest(out_dir, manifest)
+
+        for result in results:
+            if result.skipped:
+                LOG.info("skipped unchanged %s", result.filepath)
+            else:
+                LOG.info("exported %s in %.3fs, post-processed in %.3fs, success: %s", result.filepath, result.export_time, result.postprocess_time, result.success)
+        return results
+
+    def fingerprint_groups(self, groups: Iterable[ElementGroup]) -> Dict[str, str]:
+        """Computes a fingerprint of the contents of each of the given groups.
+
+        The fingerprint covers the ids, cadwork guids, names and geometry (frame and dimensions) of the group's elements,
+        the group's :attr:`~compas_cadwork.datamodel.ElementGroup.ifc_guid` and the export settings.
+        The element data of all groups is fetched in one pass using :class:`~compas_cadwork.datamodel.ElementTable`.
+
+        Note
+        ----
+        Processings which do not change an element's axis or dimensions, e.g. added drillings, are not covered.
+
+        Parameters
+        ----------
+        groups : list(:class:`~compas_cadwork.datamodel.ElementGroup`)
+            The groups.
+
+        Returns
+        -------
+        dict(str, str)
+            The fingerprint of each group, by group name.
+
+        """
+        groups = list(groups)
+        element_ids = [element_id for group in groups for element_id in group.element_ids]
+        table = ElementTable(element_ids, ["cadwork_guid", "name", "frame", "width", "height", "length"])
+        settings = (self.settings.grouping_type.name, self.settings.export_cover_geometry, self.settings.translate_local_frame)
+
+        fingerprints = {}
+        for group in groups:
+            digest = hashlib.sha256(repr((settings, group.ifc_guid)).encode("utf-8"))
+            for element_id in sorted(group.element_ids):
+                row = table[element_id]
+                frame = row.frame
+                values = (
+                    element_id,
+                    row.cadwork_guid,
+                    row.name,
+                    _rounded(frame.point),
+                    _rounded(frame.xaxis),
+                    _rounded(frame.yaxis),
+                    _rounded((row.width, row.height, row.length)),
+                )
+                digest.update(repr(values).encode("utf-8"))
+            fingerprints[group.name] = digest.hexdigest()
+        return fingerprints
+
+    def load_manifest(self, out_dir: str) -> Dict[str, Dict[str, str]]:
+        """Loads the manifest of the last incremental export to the given directory.
+
+        Parameters
+        ----------
+        out_dir : str
+            The export directory.
+
+        Returns
+        -------
+        dict(str, dict(str, str))
+            The fingerprint and file hash of each exported group, by group name. Empty if there is no valid manifest.
+
+        """
+        try:
+            with open(os.path.join(out_dir, self.MANIFEST_FILENAME), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != self.MANIFEST_VERSION:
+            return {}
+        return manifest["groups"]
+
+    def save_manifest(self, out_dir: str, groups: Dict[str, Dict[str, str]]) -> None:
+        """Saves the manifest of an incremental export to the given directory.
+
+        Parameters
+        ----------
+        out_dir : str
+            The export directory.
+        groups : dict(str, dict(str, str))
+            The fingerprint and file hash of each exported group, by group name.
+
+        """
+        filepath = os.path.join(out_dir, self.MANIFEST_FILENAME)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{self.MANIFEST_FILENAME}.", suffix=".tmp", dir=out_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.MANIFEST_VERSION, "groups": groups}, f, indent=2, sort_keys=True)
+            os.replace(temp_path, filepath)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def _export(self, element_ids: List[int], filepath: str, options) -> bool:
+        filepath = os.path.abspath(filepath)
+        LOG.debug("export_ifc4_silently_with_options(element_i_ds=%s ids, file_path=%s)", len(element_ids), filepath)
+        success = bc.export_ifc4_silently_with_options(element_ids, filepath, options)
+        LOG.debug("export_ifc4_silently_with_options: %s", success)
+        return success
+
     def initialize(self):
         """Sets any global settings that are required for the export."""
         self._translate_local_frame = uc.get_use_of_global_coordinates()
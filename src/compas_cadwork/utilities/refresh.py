@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import fields
+from typing import Generator
+from typing import Optional
+
+import utility_controller as uc
+import visualization_controller as vc
+
+
+@dataclass
+class RefreshStats:
+    """Timing and counters collected by :func:`suspended_refresh`.
+
+    Attributes
+    ----------
+    suspensions : int
+        Number of outermost suspended scopes which were exited.
+    suspended_time : float
+        Total time in seconds the automatic refresh was suspended.
+    last_suspended_time : float
+        Time in seconds the automatic refresh was suspended by the most recent outermost scope.
+    refreshes : int
+        Number of viewport refreshes which were made.
+    coalesced_refreshes : int
+        Number of refreshes which were requested while suspended and merged into the refresh of the outermost scope.
+
+    """
+
+    suspensions: int = 0
+    suspended_time: float = 0.0
+    last_suspended_time: float = 0.0
+    refreshes: int = 0
+    coalesced_refreshes: int = 0
+
+
+_STATS = RefreshStats()
+_DEPTH = 0
+_SUSPENDED_AT: Optional[float] = None
+# the state requested with enable_autorefresh and disable_autorefresh, cadwork starts with the automatic refresh enabled.
+# restored when the outermost suspension ends.
+_AUTOREFRESH = True
+
+
+def disable_autorefresh() -> None:
+    """Disables the automatic refresh of the cadwork viewport.
+
+    Within a :func:`suspended_refresh` scope, the automatic refresh stays disabled when the outermost scope exits.
+
+    """
+    global _AUTOREFRESH
+    _AUTOREFRESH = False
+    if not _DEPTH:
+        uc.disable_auto_display_refresh()
+
+
+def enable_autorefresh() -> None:
+    """Enables the automatic refresh of the cadwork viewport.
+
+    Within a :func:`suspended_refresh` scope, the automatic refresh is enabled when the outermost scope exits.
+
+    """
+    global _AUTOREFRESH
+    _AUTOREFRESH = True
+    if not _DEPTH:
+        uc.enable_auto_display_refresh()
+
+
+def force_refresh() -> None:
+    """Forces a refresh of the cadwork viewport.
+
+    Within a :func:`suspended_refresh` scope, the refresh is deferred to the exit of the outermost scope.
+
+    """
+    if _DEPTH:
+        _STATS.coalesced_refreshes += 1
+        return
+    vc.refresh()
+    _STATS.refreshes += 1
+
+
+def is_refresh_suspended() -> bool:
+    """Returns True if called within a :func:`suspended_refresh` scope.
+
+    Returns
+    -------
+    bool
+
+    """
+    return _DEPTH > 0
+
+
+def suspend_refresh() -> None:
+    """Enters a refresh suspension. Every call must be matched with a call to :func:`resume_refresh`.
+
+    Prefer :func:`suspended_refresh`, which guarantees that the suspension is ended even if an exception is raised.
+
+    """
+    global _DEPTH, _SUSPENDED_AT
+    if _DEPTH == 0:
+        if _AUTOREFRESH:
+            uc.disable_auto_display_refresh()
+        _SUSPENDED_AT = time.perf_counter()
+    _DEPTH += 1
+
+
+def resume_refresh() -> None:
+    """Leaves a refresh suspension entered with :func:`suspend_refresh`.
+
+    Leaving the outermost suspension restores the automatic refresh, unless it was disabled with :func:`disable_autorefresh`,
+    and refreshes the viewport once.
+    Leaving a nested suspension counts as a coalesced refresh.
+
+    """
+    global _DEPTH, _SUSPENDED_AT
+    if _DEPTH == 0:
+        raise RuntimeError("resume_refresh called without matching suspend_refresh.")
+    _DEPTH -= 1
+    if _DEPTH:
+        _STATS.coalesced_refreshes += 1
+        return
+
+    elapsed = time.perf_counter() - _SUSPENDED_AT
+    _SUSPENDED_AT = None
+    _STATS.suspensions += 1
+    _STATS.suspended_time += elapsed
+    _STATS.last_suspended_time = elapsed
+    try:
+        if _AUTOREFRESH:
+            uc.enable_auto_display_refresh()
+    finally:
+        force_refresh()
+
+
+@contextmanager
+def suspended_refresh() -> Generator[RefreshStats, None, None]:
+    """Suspends the automatic refresh of the cadwork viewport for the duration of the context.
+
+    Scopes can be nested. The automatic refresh is disabled when the outermost scope is entered and restored when
+    it is exited, at which point the viewport is refreshed exactly once. If the automatic refresh was disabled with
+    :func:`disable_autorefresh`, it stays disabled. Refreshes requested within the scope,
+    with :func:`force_refresh` or by exiting nested scopes, are coalesced into that single refresh.
+    The automatic refresh is restored even if an exception is raised within the scope.
+
+    Yields
+    ------
+    :class:`RefreshStats`
+        The global refresh statistics, see also :func:`get_refresh_stats`.
+
+    Examples
+    --------
+    >>> with suspended_refresh():
+    ...     for element in elements:
+    ...         element.translate(vector)
+    ...     with suspended_refresh():  # no refresh on exit, merged with the outer scope
+    ...         remove_elements(others)
+
+    """
+    suspend_refresh()
+    try:
+        yield _STATS
+    finally:
+        resume_refresh()
+
+
+def get_refresh_stats() -> RefreshStats:
+    """Returns the statistics collected by :func:`suspended_refresh` and :func:`force_refresh`.
+
+    Returns
+    -------
+    :class:`RefreshStats`
+
+    """
+    return _STATS
+
+
+def reset_refresh_stats() -> None:
+    """Resets the statistics collected by :func:`suspended_refresh` and :func:`force_refresh`."""
+    for field in fields(RefreshStats):
+        setattr(_STATS, field.name, field.default)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+import element_controller as ec
+import numpy as np
+from compas.geometry import Box
+from compas.geometry import Point
+
+from compas_cadwork.conversions import points_to_array
+from compas_cadwork.datamodel import ElementObserver
+
+from .events import ElementChanges
+
+# a query geometry is a point, an axis-aligned box given by its min and max corners, a compas box or an element id
+Query = Union[Point, Tuple[Point, Point], Box, int]
+
+
+def get_axis_aligned_bounding_box(element_id: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the min and max corners of the global axis-aligned bounding box of an element.
+
+    Parameters
+    ----------
+    element_id : int
+        The id of the element.
+
+    Returns
+    -------
+    tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+        The min and max corners, each of shape ``(3,)``.
+
+    """
+    vertices = points_to_array(ec.get_bounding_box_vertices_global([element_id]))
+    return vertices.min(axis=0), vertices.max(axis=0)
+
+
+class SpatialIndex(ElementObserver):
+    """In-memory index of the axis-aligned bounding boxes of elements for proximity queries.
+
+    Bounding boxes are fetched from cadwork once per element and kept in contiguous NumPy arrays.
+    Queries are answered with vectorized tests over all boxes, without calls to cadwork.
+
+    Elements modified or removed through :class:`~compas_cadwork.datamodel.Element` are updated automatically before the next query.
+    Other changes are applied with :meth:`apply_changes`, e.g. with the result of a :meth:`ChangeTracker.poll <compas_cadwork.utilities.events.ChangeTracker.poll>`.
+
+    Parameters
+    ----------
+    element_ids : iterable(int), optional
+        The ids of the elements to index.
+
+    Examples
+    --------
+    >>> index = SpatialIndex.from_document()
+    >>> index.within_distance(Point(1000, 0, 0), 500.0)
+    [12, 57]
+    >>> index.nearest(element_id, k=3)
+    [13, 11, 40]
+    >>> index.apply_changes(tracker.poll())
+
+    """
+
+    def __init__(self, element_ids: Optional[Iterable[int]] = None) -> None:
+        super().__init__()
+        self._mins = np.empty((0, 3))
+        self._maxs = np.empty((0, 3))
+        self._ids = np.empty(0, dtype=np.int64)
+        self._valid = np.empty(0, dtype=bool)
+        self._row_by_id: Dict[int, int] = {}
+        self._free_rows: List[int] = []
+        # elements modified through Element, their boxes are re-fetched before the next query
+        self._stale: Set[int] = set()
+        self.insert(element_ids or [])
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    def __contains__(self, element_id: int) -> bool:
+        return element_id in self._row_by_id
+
+    @classmethod
+    def from_document(cls) -> SpatialIndex:
+        """Creates an index of all identifiable elements of the currently open cadwork document.
+
+        Returns
+        -------
+        :class:`SpatialIndex`
+
+        """
+        return cls(ec.get_all_identifiable_element_ids())
+
+    def bounding_box(self, element_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the indexed bounding box of an element.
+
+        Parameters
+        ----------
+        element_id : int
+            The id of the element.
+
+        Returns
+        -------
+        tuple(:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            The min and max corners.
+
+        """
+        self._refresh_stale()
+        row = self._row_by_id[element_id]
+        return self._mins[row].copy(), self._maxs[row].copy()
+
+    def _grow(self, count: int) -> None:
+        size = len(self._ids)
+        capacity = max(size * 2, size + count, 64)
+        self._mins = np.resize(self._mins, (capacity, 3))
+        self._maxs = np.resize(self._maxs, (capacity, 3))
+        self._ids = np.resize(self._ids, capacity)
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:size] = self._valid
+        self._valid = valid
+        self._free_rows.extend(range(capacity - 1, size - 1, -1))
+
+    def _set(self, element_id: int, box: Tuple[np.ndarray, np.ndarray]) -> None:
+        row = self._row_by_id.get(element_id)
+        if row is None:
+            if not self._free_rows:
+                self._grow(1)
+            row = self._free_rows.pop()
+            self._row_by_id[element_id] = row
+            self._ids[row] = element_id
+            self._valid[row] = True
+        self._mins[row], self._maxs[row] = box
+
+    def insert(self, element_ids: Iterable[int]) -> None:
+        """Adds elements to the index, or updates the bounding boxes of elements which are already indexed.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements.
+
+        """
+        element_ids = list(element_ids)
+        missing = len(element_ids) - len(self._free_rows)
+        if missing > 0:
+            self._grow(missing)
+        for element_id in element_ids:
+            self._set(element_id, get_axis_aligned_bounding_box(element_id))
+            self._stale.discard(element_id)
+
+    def remove(self, element_ids: Iterable[int]) -> None:
+        """Removes elements from the index. Ids which are not indexed are ignored.
+
+        Parameters
+        ----------
+        element_ids : iterable(int)
+            The ids of the elements.
+
+        """
+        for element_id in element_ids:
+            row = self._row_by_id.pop(element_id, None)
+            self._stale.discard(element_id)
+            if row is not None:
+                self._valid[row] = False
+                self._free_rows.append(row)
+
+    def apply_changes(self, changes: ElementChanges) -> None:
+        """Updates the index with the result of a change detection.
+
+        Parameters
+        ----------
+        changes : :class:`~compas_cadwork.utilities.events.ElementChanges`
+            The added, removed and modified elements.
+
+        """
+        self.remove(changes.removed)
+        self.insert(changes.added)
+        self.insert(element_id for element_id in changes.modified if element_id in self._row_by_id)
+
+    def _refresh_stale(self) -> None:
+        if self._stale:
+            stale, self._stale = self._stale, set()
+            self.insert(element_id for element_id in stale if element_id in self._row_by_id)
+
+    def _query_box(self, query: Query) -> Tuple[np.ndarray, np.ndarray]:
+        if isinstance(query, int):
+            return self.bounding_box(query)
+        if isinstance(query, Box):
+            points = np.asarray(query.points, dtype=float)
+            return points.min(axis=0), points.max(axis=0)
+        if isinstance(query, Point):
+            point = np.asarray(query, dtype=float)
+            return point, point
+        box_min, box_max = query
+        return np.asarray(box_min, dtype=float), np.asarray(box_max, dtype=float)
+
+    def _distances(self, query: Query) -> Tuple[np.ndarray, np.ndarray]:
+        # distances between the query box and all indexed boxes, zero where they overlap
+        self._refresh_stale()
+        box_min, box_max = self._query_box(query)
+        rows = np.flatnonzero(self._valid)
+        gaps = np.maximum(np.maximum(self._mins[rows] - box_max, box_min - self._maxs[rows]), 0.0)
+        return rows, np.sqrt(np.einsum("ij,ij->i", gaps, gaps))
+
+    def _exclude_query_element(self, query: Query, element_ids: np.ndarray) -> List[int]:
+        if isinstance(query, int):
+            return [element_id for element_id in element_ids.tolist() if element_id != query]
+        return element_ids.tolist()
+
+    def intersecting(self, query: Query) -> List[int]:
+        """Returns the elements whose bounding boxes intersect or touch the given geometry.
+
+        Parameters
+        ----------
+        query : :class:`~compas.geometry.Point` | tuple | :class:`~compas.geometry.Box` | int
+            A point, an axis-aligned box given as ``(min_corner, max_corner)``, a box or an element id.
+            Boxes are tested using their axis-aligned bounding box. An element is not part of its own result.
+
+        Returns
+        -------
+        list(int)
+            The element ids.
+
+        """
+        rows, distances = self._distances(query)
+        return self._exclude_query_element(query, self._ids[rows[distances <= 0.0]])
+
+    def within_distance(self, query: Query, distance: float) -> List[int]:
+        """Returns the elements whose bounding boxes are within the given distance of the given geometry.
+
+        Parameters
+        ----------
+        query : :class:`~compas.geometry.Point` | tuple | :class:`~compas.geometry.Box` | int
+            See :meth:`intersecting`.
+        distance : float
+            The maximum distance.
+
+        Returns
+        -------
+        list(int)
+            The element ids, closest first.
+
+        """
+        rows, distances = self._distances(query)
+        within = np.flatnonzero(distances <= distance)
+        within = within[np.argsort(distances[within], kind="stable")]
+        return self._exclude_query_element(query, self._ids[rows[within]])
+
+    def nearest(self, query: Query, k: int = 1) -> List[int]:
+        """Returns the k elements whose bounding boxes are closest to the given geometry.
+
+        Parameters
+        ----------
+        query : :class:`~compas.geometry.Point` | tuple | :class:`~compas.geometry.Box` | int
+            See :meth:`intersecting`.
+        k : int, optional
+            The number of elements to return.
+
+        Returns
+        -------
+        list(int)
+            The element ids, closest first.
+
+        """
+        rows, distances = self._distances(query)
+        if isinstance(query, int):
+            distances[self._ids[rows] == query] = np.inf
+            k = min(k, len(rows) - 1)
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+        return self._ids[rows[nearest]].tolist()
+
+    def elements_modified(self, element_ids: List[int]) -> None:
+        self._stale.update(element_id for element_id in element_ids if element_id in self._row_by_id)
+
+    def elements_removed(self, element_ids: List[int]) -> None:
+        self.remove(element_ids)
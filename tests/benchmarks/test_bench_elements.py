@@ -0,0 +1,173 @@
+import tracemalloc
+
+import pytest
+from compas.geometry import Vector
+
+from compas_cadwork.conversions import point_to_compas
+from compas_cadwork.conversions import points_to_array
+from compas_cadwork.datamodel import AttributeIndex
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementGroup
+from compas_cadwork.datamodel import ElementTable
+from compas_cadwork.datamodel import transaction
+from compas_cadwork.datamodel.cache import element_cache
+from compas_cadwork.utilities import ElementCatalog
+from compas_cadwork.utilities import SpatialIndex
+from compas_cadwork.utilities import get_all_elements
+from compas_cadwork.utilities import get_all_elements_with_attrib
+from compas_cadwork.utilities import get_dimensions
+from compas_cadwork.utilities import get_element_groups
+from compas_cadwork.utilities.events import ElementDelta
+
+pytest.importorskip("pytest_benchmark")
+
+ATTRIBUTE = 5
+
+
+def consume(iterable):
+    return sum(1 for _ in iterable)
+
+
+def test_get_all_elements(benchmark, record_calls, stand):
+    record_calls(stand, lambda: consume(get_all_elements()))
+    assert benchmark(lambda: consume(get_all_elements())) == len(stand.document)
+
+
+@pytest.mark.parametrize("indexed", [False, True], ids=["scan", "index"])
+def test_get_all_elements_with_attrib(benchmark, record_calls, stand, indexed):
+    for element in list(stand.document.elements.values())[::7]:
+        element.attributes[ATTRIBUTE] = "marked"
+    index = AttributeIndex(attribute_numbers=[ATTRIBUTE]) if indexed else None
+
+    def run():
+        return consume(get_all_elements_with_attrib(ATTRIBUTE, "marked", index=index))
+
+    record_calls(stand, run)
+    assert benchmark(run) == len(stand.document.elements) // 7 + 1
+
+
+def test_get_element_groups(benchmark, record_calls, stand):
+    record_calls(stand, get_element_groups)
+    assert len(benchmark(get_element_groups)) == len(stand.document.elements) // 33
+
+
+def test_get_dimensions(benchmark, record_calls, stand):
+    record_calls(stand, get_dimensions)
+    assert benchmark(get_dimensions)
+
+
+def test_get_dimensions_catalog(benchmark, record_calls, stand):
+    catalog = ElementCatalog.from_document()
+
+    def run():
+        return get_dimensions(catalog=catalog), catalog.beams_in_group("Wall_0000")
+
+    record_calls(stand, run)
+    dimensions, beams = benchmark(run)
+    assert dimensions and beams
+
+
+def test_element_delta(benchmark, record_calls, stand):
+    delta = ElementDelta()
+
+    def run():
+        element = stand.document.add(name="added")
+        delta.check_for_changed_elements()
+        stand.document.elements.pop(element.id)
+        return element.id, delta.check_for_changed_elements()
+
+    record_calls(stand, run)
+    element_id, (added, removed) = benchmark(run)
+    assert added == []
+    assert [element.id for element in removed] == [element_id]
+
+
+FIELDS = ["name", "group", "width", "height", "length", "frame"]
+
+
+@pytest.mark.parametrize("method", ["properties", "cached", "table"])
+def test_read_element_properties(benchmark, record_calls, stand, method):
+    element_ids = list(stand.document.elements)
+
+    def properties():
+        return [[getattr(Element(element_id), field) for field in FIELDS] for element_id in element_ids]
+
+    def cached():
+        # every field is read twice, as is common when the same element is inspected by several functions
+        with element_cache():
+            properties()
+            return properties()
+
+    def table():
+        return ElementTable(element_ids, FIELDS).column("frame")
+
+    run = {"properties": properties, "cached": cached, "table": table}[method]
+    record_calls(stand, run)
+    benchmark(run)
+
+
+@pytest.mark.parametrize("batched", [False, True], ids=["direct", "transaction"])
+def test_modify_elements(benchmark, record_calls, stand, batched):
+    elements = [Element(element_id) for element_id in stand.document.elements]
+    vector = Vector(0.0, 0.0, 1.0)
+
+    def modify():
+        for element in elements:
+            element.translate(vector)
+            element.set_attribute(ATTRIBUTE, "moved")
+
+    def run():
+        if batched:
+            with transaction():
+                modify()
+        else:
+            modify()
+
+    record_calls(stand, run)
+    benchmark(run)
+
+
+@pytest.mark.parametrize("method", ["points", "array"])
+def test_convert_points(benchmark, stand, method):
+    points = [point for element_id in stand.document.elements for point in stand.element_get_bounding_box_vertices_global([element_id])]
+
+    if method == "points":
+        benchmark(lambda: [point_to_compas(point) for point in points])
+    else:
+        benchmark(points_to_array, points)
+
+
+@pytest.mark.parametrize("method", ["contacts", "index"])
+def test_elements_in_contact(benchmark, record_calls, large_stand, method):
+    # a contact call checks the element against the whole document, query a sample of the 10k elements
+    element_ids = list(large_stand.document.elements)[::200]
+    benchmark.extra_info["elements"] = len(large_stand.document)
+
+    if method == "contacts":
+
+        def run():
+            return [Element(element_id).get_elements_in_contact() for element_id in element_ids]
+
+    else:
+
+        def run():
+            index = SpatialIndex.from_document()
+            return [index.intersecting(element_id) for element_id in element_ids]
+
+    record_calls(large_stand, run)
+    benchmark.pedantic(run, rounds=3)
+
+
+@pytest.mark.parametrize("count", [10_000, 100_000])
+def test_element_group_memory(benchmark, count):
+    def run():
+        return ElementGroup.from_element_ids("group", range(count))
+
+    tracemalloc.start()
+    group = run()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del group
+    benchmark.extra_info["bytes_per_element"] = size / count
+
+    assert len(benchmark(run).elements) == count
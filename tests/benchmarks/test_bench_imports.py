@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+HERE = os.path.dirname(os.path.dirname(__file__))
+
+
+def import_times(module):
+    """Imports a module in a new interpreter with ``-X importtime`` and returns the cumulative import time in microseconds of each module."""
+    code = f"import simulator; simulator.install(); import compas.scene; import {module}"
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=HERE, capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+# generous upper bounds of the cumulative import time in microseconds, a multiple of the time measured locally
+BUDGETS_US = {
+    "compas_cadwork.scene": 25_000,
+    "compas_cadwork.utilities": 250_000,
+}
+
+# modules which must only be imported on first use of their contents
+DEFERRED = {
+    "compas_cadwork.scene": ["compas_timber", "compas_cadwork.scene.scene", "compas_cadwork.scene.camera", "compas_cadwork.utilities", "compas_cadwork.datamodel"],
+    "compas_cadwork.utilities": ["compas_timber", "compas_cadwork.utilities.ifc_export", "compas_cadwork.utilities.spatial", "compas_cadwork.datamodel.table"],
+}
+
+
+@pytest.mark.parametrize("module", ["compas_cadwork.scene", "compas_cadwork.utilities"])
+def test_import_time(benchmark, module):
+    # compas itself is imported up front, as it is when compas discovers the plugin
+    times = benchmark.pedantic(import_times, args=(module,), rounds=3)
+    benchmark.extra_info["import_time_us"] = times[module]
+
+    assert [name for name in DEFERRED[module] if name in times] == []
+    assert times[module] < BUDGETS_US[module]
@@ -0,0 +1,77 @@
+import pytest
+from compas.geometry import Translation
+from compas.scene import Scene
+
+import simulator
+from compas_cadwork.scene import CadworkSceneObject
+from compas_cadwork.scene import clear_drawn_elements
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def scene(request, sim):
+    scene = Scene(context="cadwork")
+    beams = simulator.make_beams(copies=request.config.getoption("--cadwork-copies"))
+    for beam in beams:
+        scene.add(beam)
+    yield scene, beams
+    clear_drawn_elements()
+
+
+def test_draw(benchmark, record_calls, sim, scene):
+    scene, _ = scene
+
+    def setup():
+        clear_drawn_elements()
+
+    calls = record_calls(sim, scene.draw)
+    benchmark.pedantic(scene.draw, setup=setup, rounds=5)
+    # one refresh per draw, however many elements were drawn
+    assert calls["visualization_controller.refresh"] == 1
+
+
+def test_redraw_unchanged(benchmark, record_calls, sim, scene):
+    scene, _ = scene
+    scene.draw()
+
+    record_calls(sim, scene.draw)
+    benchmark(scene.draw)
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == len(sim.document)
+
+
+def test_redraw_moved(benchmark, record_calls, sim, scene):
+    scene, beams = scene
+    scene.draw()
+    translation = Translation.from_vector([10.0, 0.0, 0.0])
+
+    def run():
+        for beam in beams[::10]:
+            beam.transform(translation)
+        scene.draw()
+
+    record_calls(sim, run)
+    benchmark(run)
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == len(sim.document)
+
+
+@pytest.mark.parametrize("draws", [1, 10, 100])
+def test_refresh_after_draws(benchmark, sim, draws):
+    beams = simulator.make_beams()
+    scenes = []
+    for _ in range(draws):
+        scene = Scene(context="cadwork")
+        for beam in beams:
+            scene.add(beam)
+        scene.draw()
+        scenes.append(scene)
+    sceneobject = scenes[-1].objects[0]
+
+    def setup():
+        sceneobject.clear_elements()
+        sceneobject.draw()
+        sim.reset_calls()
+
+    # only the element drawn since the last refresh is recreated, however many scenes drew before
+    benchmark.pedantic(CadworkSceneObject.refresh, setup=setup, rounds=20)
+    assert sim.calls["element_controller.recreate_elements"] == 1
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from compas_cadwork.storage import FileStorage
+from compas_cadwork.storage import JsonLinesFileStorage
+from compas_cadwork.storage import MemoryProjectData
+from compas_cadwork.storage import ProjectStorage
+
+pytest.importorskip("pytest_benchmark")
+
+
+def make_data(count=1000):
+    return {f"element_{i}": {"name": f"beam_{i}", "frame": [[i, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], "attributes": {"5": "Wall"}} for i in range(count)}
+
+
+FILE_STORAGES = {
+    "json": lambda path: FileStorage(path + ".json"),
+    "jsonl": lambda path: JsonLinesFileStorage(path + ".jsonl"),
+    "jsonl.gz": lambda path: JsonLinesFileStorage(path + ".jsonl.gz", compress=True),
+}
+
+
+@pytest.mark.parametrize("kind", FILE_STORAGES)
+def test_file_storage_save(benchmark, tmp_path, kind):
+    storage = FILE_STORAGES[kind](str(tmp_path / "data"))
+    data = make_data()
+    benchmark(storage.save, data)
+    benchmark.extra_info["bytes"] = os.path.getsize(storage.filepath)
+
+
+@pytest.mark.parametrize("kind", FILE_STORAGES)
+def test_file_storage_load(benchmark, tmp_path, kind):
+    storage = FILE_STORAGES[kind](str(tmp_path / "data"))
+    data = make_data()
+    storage.save(data)
+    assert benchmark(storage.load) == data
+
+
+def test_file_storage_load_key(benchmark, tmp_path):
+    storage = JsonLinesFileStorage(str(tmp_path / "data.jsonl"))
+    data = make_data()
+    storage.save(data)
+    assert benchmark(storage.load, "element_999") == data["element_999"]
+
+
+@pytest.mark.parametrize("incremental", [False, True], ids=["full", "incremental"])
+def test_project_storage_save_one_change(benchmark, sim, incremental):
+    backend = MemoryProjectData()
+    storage = ProjectStorage("benchmark", incremental=incremental, backend=backend)
+    data = make_data()
+    storage.save(data)
+    counter = iter(range(10**9))
+
+    def run():
+        data["element_0"]["name"] = f"changed_{next(counter)}"
+        storage.save(data)
+
+    benchmark(run)
+    benchmark.extra_info["writes"] = backend.writes
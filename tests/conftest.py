@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+import simulator
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+# the number of elements in the document of the large_stand fixture
+LARGE_DOCUMENT_SIZE = 10_000
+
+# must happen before compas_cadwork is imported by any test module
+simulator.install()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--cadwork-latency", type=float, default=0.0, help="Simulated latency in seconds of each call to a cadwork controller.")
+    parser.addoption("--cadwork-copies", type=int, default=10, help="Number of copies of the fixture model in the simulated document.")
+    parser.addoption("--run-benchmarks", action="store_true", help="Run the benchmarks in tests/benchmarks, which are skipped by default.")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --run-benchmarks")
+    for item in items:
+        if os.path.abspath(str(item.fspath)).startswith(BENCHMARKS + os.sep):
+            item.add_marker(skip)
+
+
+def _activate(request, document=None):
+    from compas_cadwork.scene.registry import iter_registries
+
+    # element ids start over with each document, ids drawn in other tests must not be found in the registries
+    for registry in iter_registries():
+        registry.clear()
+    return simulator.activate(simulator.Simulator(document, latency=request.config.getoption("--cadwork-latency")))
+
+
+@pytest.fixture
+def sim(request):
+    """An active simulator with an empty document."""
+    return _activate(request)
+
+
+@pytest.fixture
+def stand(request):
+    """An active simulator with a document containing copies of ``data/stand_w_drills.json``."""
+    document = simulator.SimulatedDocument.from_timber_model(copies=request.config.getoption("--cadwork-copies"))
+    return _activate(request, document)
+
+
+@pytest.fixture
+def large_stand(request):
+    """An active simulator with a document of about 10k elements, made of copies of ``data/stand_w_drills.json``."""
+    elements_per_copy = len(simulator.SimulatedDocument.from_timber_model())
+    document = simulator.SimulatedDocument.from_timber_model(copies=-(-LARGE_DOCUMENT_SIZE // elements_per_copy))
+    return _activate(request, document)
+
+
+@pytest.fixture
+def record_calls(benchmark):
+    """Stores the controller calls of one run of a function in the results of a benchmark, see ``--benchmark-json``, and returns them."""
+
+    def record(simulator, func, *args):
+        calls = simulator.count_calls(func, *args)
+        benchmark.extra_info["controller_calls"] = sum(calls.values())
+        benchmark.extra_info["calls"] = dict(calls.most_common(5))
+        return calls
+
+    return record
@@ -0,0 +1,666 @@
+"""A pure-Python simulation of the cadwork controller modules, for testing and benchmarking compas_cadwork without cadwork.
+
+:func:`install` registers simulated ``cadwork``, ``element_controller``, ``attribute_controller``, ``geometry_controller``,
+``bim_controller``, ``dimension_controller``, ``visualization_controller`` and ``utility_controller`` modules in
+``sys.modules``. Calls to the controller modules are forwarded to the currently active :class:`Simulator`,
+which counts them and optionally waits a configurable latency per call, to mimic the cost of crossing into cadwork.
+
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from enum import IntEnum
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "data", "stand_w_drills.json")
+
+CONTROLLERS = (
+    "element_controller",
+    "attribute_controller",
+    "geometry_controller",
+    "bim_controller",
+    "dimension_controller",
+    "visualization_controller",
+    "utility_controller",
+)
+
+
+# ==============================================================================
+# cadwork module
+# ==============================================================================
+
+
+class point_3d:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __repr__(self) -> str:
+        return f"point_3d({self.x}, {self.y}, {self.z})"
+
+    def __add__(self, other: point_3d) -> point_3d:
+        return point_3d(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other: point_3d) -> point_3d:
+        return point_3d(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, factor: float) -> point_3d:
+        return point_3d(self.x * factor, self.y * factor, self.z * factor)
+
+    def cross(self, other: point_3d) -> point_3d:
+        return point_3d(self.y * other.z - self.z * other.y, self.z * other.x - self.x * other.z, self.x * other.y - self.y * other.x)
+
+
+class element_grouping_type(IntEnum):
+    group = 1
+    subgroup = 2
+    none = 3
+
+
+class projection_type(IntEnum):
+    perspective = 0
+    orthographic = 1
+
+
+class camera_data:
+    def __init__(self):
+        self._values = {
+            "position": point_3d(10000.0, -10000.0, 10000.0),
+            "target": point_3d(0.0, 0.0, 0.0),
+            "up_vector": point_3d(0.0, 0.0, 1.0),
+            "field_of_view": 0.8,
+            "field_width": 1.0,
+            "field_height": 1.0,
+            "projection_type": projection_type.perspective,
+        }
+
+    def __getattr__(self, name: str):
+        prefix, _, key = name.partition("_")
+        if key not in self.__dict__.get("_values", {}):
+            raise AttributeError(name)
+        if prefix == "get":
+            return lambda: self._values[key]
+        if prefix == "set":
+            return lambda value: self._values.__setitem__(key, value)
+        raise AttributeError(name)
+
+
+class text_object_options:
+    def __init__(self):
+        self.values = {}
+
+    def __getattr__(self, name: str):
+        if not name.startswith("set_"):
+            raise AttributeError(name)
+        return lambda value: self.values.__setitem__(name[4:], value)
+
+
+class _Options:
+    """Accepts any chain of getters and setters, e.g. the ifc options."""
+
+    def __getattr__(self, name: str):
+        return lambda *args: self
+
+
+raster = 12
+
+
+def _make_cadwork_module() -> types.ModuleType:
+    module = types.ModuleType("cadwork")
+    module.point_3d = point_3d
+    module.element_grouping_type = element_grouping_type
+    module.projection_type = projection_type
+    module.camera_data = camera_data
+    module.text_object_options = text_object_options
+    module.raster = raster
+    return module
+
+
+# ==============================================================================
+# document
+# ==============================================================================
+
+
+class ElementType:
+    """Stand-in for ``cadwork.element_type``. ``is_<kind>()`` returns True for the element's kind only."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def __getattr__(self, name: str):
+        if not name.startswith("is_"):
+            raise AttributeError(name)
+        return lambda: name[3:] == self.kind
+
+
+@dataclass
+class SimulatedElement:
+    id: int
+    kind: str = "rectangular_beam"
+    name: str = ""
+    group: str = ""
+    subgroup: str = ""
+    p1: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    xl: Tuple[float, float, float] = (1.0, 0.0, 0.0)
+    yl: Tuple[float, float, float] = (0.0, 1.0, 0.0)
+    width: float = 100.0
+    height: float = 100.0
+    length: float = 1000.0
+    framed: str = ""
+    attributes: Dict[int, str] = field(default_factory=dict)
+    cadwork_guid: str = field(default_factory=lambda: str(uuid.uuid4()))
+    ifc_guid: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # linear dimensions only
+    dimension_points: List[Tuple[float, float, float]] = field(default_factory=list)
+    dimension_offset: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+
+    @property
+    def zl(self) -> Tuple[float, float, float]:
+        x, y = self.xl, self.yl
+        return (x[1] * y[2] - x[2] * y[1], x[2] * y[0] - x[0] * y[2], x[0] * y[1] - x[1] * y[0])
+
+    @property
+    def p2(self) -> Tuple[float, float, float]:
+        return tuple(p + x * self.length for p, x in zip(self.p1, self.xl))
+
+    def vertices(self) -> List[Tuple[float, float, float]]:
+        if self.kind == "dimension":
+            return list(self.dimension_points)
+        # p1 is on the axis, in the middle of the cross section
+        vertices = []
+        for u in (0.0, self.length):
+            for v in (-0.5 * self.width, 0.5 * self.width):
+                for w in (-0.5 * self.height, 0.5 * self.height):
+                    vertices.append(tuple(p + x * u + y * v + z * w for p, x, y, z in zip(self.p1, self.xl, self.yl, self.zl)))
+        return vertices
+
+    def aabb(self) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        vertices = self.vertices()
+        return tuple(map(min, zip(*vertices))), tuple(map(max, zip(*vertices)))
+
+    def translate(self, vector: Tuple[float, float, float]) -> None:
+        self.p1 = tuple(p + v for p, v in zip(self.p1, vector))
+        self.dimension_points = [tuple(p + v for p, v in zip(point, vector)) for point in self.dimension_points]
+
+
+def load_beam_data(filepath: str) -> List[dict]:
+    """Returns the data of the beams of a serialized ``compas_timber`` model.
+
+    The model is not deserialized, so that fixtures written by older versions of ``compas_timber`` can be used.
+
+    """
+    with open(filepath, "r") as f:
+        model = json.load(f)
+    return [element["data"] for element in model["data"]["elements"] if element["dtype"].endswith("/Beam")]
+
+
+def make_beams(filepath: str = FIXTURE, copies: int = 1, spacing: float = 5000.0) -> list:
+    """Creates ``compas_timber`` beams from the beams of a serialized model, see :meth:`SimulatedDocument.from_timber_model`."""
+    from compas.geometry import Frame
+    from compas_timber.elements import Beam
+
+    beams = []
+    for copy in range(copies):
+        for data in load_beam_data(filepath):
+            frame = data["frame"]["data"]
+            point = [frame["point"][0] + copy * spacing, frame["point"][1], frame["point"][2]]
+            beams.append(Beam(Frame(point, frame["xaxis"], frame["yaxis"]), data["length"], data["width"], data["height"]))
+    return beams
+
+
+class SimulatedDocument:
+    """The contents of a simulated cadwork document."""
+
+    def __init__(self) -> None:
+        self.elements: Dict[int, SimulatedElement] = {}
+        self.active_ids: List[int] = []
+        self.project_data: Dict[str, str] = {}
+        # user attribute number -> name, and -> list of predefined values
+        self.attribute_names: Dict[int, str] = {}
+        self.attribute_lists: Dict[int, List[str]] = {}
+        self.grouping_type = element_grouping_type.group
+        self.use_global_coordinates = False
+        self.camera = camera_data()
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def add(self, **kwargs) -> SimulatedElement:
+        element = SimulatedElement(id=self._next_id, **kwargs)
+        self.elements[element.id] = element
+        self._next_id += 1
+        return element
+
+    @classmethod
+    def from_timber_model(cls, filepath: str = FIXTURE, copies: int = 1, spacing: float = 5000.0, dimensions: bool = True) -> SimulatedDocument:
+        """Creates a document from the beams of a serialized ``compas_timber`` model, e.g. ``data/stand_w_drills.json``.
+
+        Each copy of the model is offset by ``spacing`` along the x-axis and put into its own group, together with a framed wall
+        element and, if ``dimensions`` is True, a linear dimension along its first beam.
+
+        """
+        beams = load_beam_data(filepath)
+        document = cls()
+        for copy in range(copies):
+            offset = copy * spacing
+            group = f"Wall_{copy:04d}"
+            for index, beam in enumerate(beams):
+                frame = beam["frame"]["data"]
+                point = frame["point"]
+                document.add(
+                    name=f"{beam['name']}_{index}",
+                    group=group,
+                    subgroup=f"{group}_{index % 3}",
+                    p1=(point[0] + offset, point[1], point[2]),
+                    xl=tuple(frame["xaxis"]),
+                    yl=tuple(frame["yaxis"]),
+                    width=float(beam["width"]),
+                    height=float(beam["height"]),
+                    length=float(beam["length"]),
+                )
+            first = beams[0]["frame"]["data"]["point"]
+            document.add(kind="wall", name="wall", group=group, subgroup=group, framed="wall", p1=(first[0] + offset, first[1], first[2]), width=1.0, height=1.0, length=1.0)
+            if dimensions:
+                start = (first[0] + offset, first[1], first[2])
+                end = (start[0] + float(beams[0]["length"]), start[1], start[2])
+                document.add(kind="dimension", name="dimension", dimension_points=[start, end], dimension_offset=(0.0, 0.0, 200.0))
+        return document
+
+
+# ==============================================================================
+# controllers
+# ==============================================================================
+
+
+def _p(values) -> point_3d:
+    return point_3d(*values)
+
+
+def _t(point: point_3d) -> Tuple[float, float, float]:
+    return (point.x, point.y, point.z)
+
+
+class Simulator:
+    """Implements the functions of the cadwork controller modules on a :class:`SimulatedDocument`.
+
+    Parameters
+    ----------
+    document : :class:`SimulatedDocument`, optional
+        The document. Defaults to an empty document.
+    latency : float, optional
+        Time in seconds each controller call takes, in addition to its pure-Python cost.
+
+    Attributes
+    ----------
+    calls : Counter
+        The number of calls, by ``"<module>.<function>"``.
+    refreshes : int
+        The number of viewport refreshes.
+    host_thread : int, optional
+        If set, calls from any other thread raise a RuntimeError, like they would in cadwork.
+
+    """
+
+    def __init__(self, document: Optional[SimulatedDocument] = None, latency: float = 0.0) -> None:
+        self.document = document or SimulatedDocument()
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.refreshes = 0
+        self.autorefresh = True
+        self.exported_files: List[str] = []
+        self.host_thread: Optional[int] = None
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_calls(self) -> None:
+        self.calls.clear()
+
+    def count_calls(self, func, *args) -> Counter:
+        """Runs ``func`` once and returns the controller calls it made."""
+        before = Counter(self.calls)
+        func(*args)
+        return self.calls - before
+
+    def call(self, module: str, name: str, *args):
+        func = getattr(self, f"{module.split('_')[0]}_{name}", None)
+        if func is None:
+            raise AttributeError(f"module '{module}' has no attribute '{name}'")
+        if self.host_thread is not None and threading.get_ident() != self.host_thread:
+            raise RuntimeError(f"{module}.{name} called from a thread other than the host thread.")
+        self.calls[f"{module}.{name}"] += 1
+        if self.latency:
+            # busy wait, sleep is too coarse for sub-millisecond latencies
+            end = time.perf_counter() + self.latency
+            while time.perf_counter() < end:
+                pass
+        return func(*args)
+
+    def _element(self, element_id: int) -> SimulatedElement:
+        try:
+            return self.document.elements[element_id]
+        except KeyError:
+            raise RuntimeError(f"Invalid element id: {element_id}")
+
+    # element_controller
+
+    def element_get_all_identifiable_element_ids(self) -> List[int]:
+        return list(self.document.elements)
+
+    def element_get_active_identifiable_element_ids(self) -> List[int]:
+        return [element_id for element_id in self.document.active_ids if element_id in self.document.elements]
+
+    def element_check_element_id(self, element_id: int) -> bool:
+        return element_id in self.document.elements
+
+    def element_get_element_cadwork_guid(self, element_id: int) -> str:
+        return self._element(element_id).cadwork_guid
+
+    def element_create_rectangular_beam_vectors(self, width, height, length, p1, xl, zl) -> int:
+        yl = zl.cross(xl)
+        return self.document.add(width=width, height=height, length=length, p1=_t(p1), xl=_t(xl), yl=_t(yl)).id
+
+    def element_create_text_object_with_options(self, point, xl, yl, options) -> int:
+        text = options.values.get("text", "")
+        size = options.values.get("height", 10.0)
+        return self.document.add(kind="text", name=text, p1=_t(point), xl=_t(xl), yl=_t(yl), width=size, height=0.0, length=size * len(text)).id
+
+    def element_delete_elements(self, element_ids: List[int]) -> None:
+        for element_id in element_ids:
+            self.document.elements.pop(element_id, None)
+
+    def element_recreate_elements(self, element_ids: List[int]) -> None:
+        pass
+
+    def element_move_element(self, element_ids: List[int], vector: point_3d) -> None:
+        for element_id in element_ids:
+            self._element(element_id).translate(_t(vector))
+
+    def element_get_bounding_box_vertices_local(self, reference_id: int, element_ids: List[int]) -> List[point_3d]:
+        return self.element_get_bounding_box_vertices_global(element_ids)
+
+    def element_get_bounding_box_vertices_global(self, element_ids: List[int]) -> List[point_3d]:
+        boxes = [self._element(element_id).aabb() for element_id in element_ids]
+        lo = tuple(map(min, zip(*(box[0] for box in boxes))))
+        hi = tuple(map(max, zip(*(box[1] for box in boxes))))
+        return [point_3d(x, y, z) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+
+    def element_get_elements_in_contact(self, element_id: int) -> List[int]:
+        # like cadwork, this checks the element against the whole document on every call
+        lo, hi = self._element(element_id).aabb()
+        result = []
+        for other in self.document.elements.values():
+            if other.id == element_id:
+                continue
+            other_lo, other_hi = other.aabb()
+            if all(a <= d and c <= b for a, b, c, d in zip(lo, hi, other_lo, other_hi)):
+                result.append(other.id)
+        return result
+
+    # attribute_controller
+
+    def attribute_get_name(self, element_id: int) -> str:
+        return self._element(element_id).name
+
+    def attribute_set_name(self, element_ids: List[int], name: str) -> None:
+        for element_id in element_ids:
+            self._element(element_id).name = name
+
+    def attribute_get_group(self, element_id: int) -> str:
+        return self._element(element_id).group
+
+    def attribute_get_subgroup(self, element_id: int) -> str:
+        return self._element(element_id).subgroup
+
+    def attribute_get_element_grouping_type(self) -> element_grouping_type:
+        return self.document.grouping_type
+
+    def attribute_get_element_type(self, element_id: int) -> ElementType:
+        return ElementType(self._element(element_id).kind)
+
+    def attribute_get_user_attribute(self, element_id: int, number: int) -> str:
+        return self._element(element_id).attributes.get(number, "")
+
+    def attribute_set_user_attribute(self, element_ids: List[int], number: int, value: str) -> None:
+        for element_id in element_ids:
+            self._element(element_id).attributes[number] = value
+
+    def attribute_delete_user_attribute(self, number: int) -> bool:
+        # like cadwork, the attribute is only deleted when no element uses it
+        if any(element.attributes.get(number) for element in self.document.elements.values()):
+            return False
+        self.document.attribute_names.pop(number, None)
+        self.document.attribute_lists.pop(number, None)
+        return True
+
+    def attribute_get_user_attribute_name(self, number: int) -> str:
+        return self.document.attribute_names.get(number, "")
+
+    def attribute_set_user_attribute_name(self, number: int, name: str) -> None:
+        self.document.attribute_names[number] = name
+
+    def attribute_add_item_to_user_attribute_list(self, number: int, value: str) -> None:
+        self.document.attribute_lists.setdefault(number, []).append(value)
+
+    def attribute_delete_item_from_user_attribute_list(self, number: int, value: str) -> None:
+        # only the list of predefined values changes, the values of elements are kept
+        items = self.document.attribute_lists.get(number, [])
+        if value in items:
+            items.remove(value)
+
+    def attribute_is_framed_wall(self, element_id: int) -> bool:
+        return self._element(element_id).framed == "wall"
+
+    def attribute_is_framed_roof(self, element_id: int) -> bool:
+        return self._element(element_id).framed == "roof"
+
+    def attribute_is_framed_floor(self, element_id: int) -> bool:
+        return self._element(element_id).framed == "floor"
+
+    def attribute_is_drilling(self, element_id: int) -> bool:
+        return self._element(element_id).kind == "drilling"
+
+    def attribute_is_opening(self, element_id: int) -> bool:
+        return self._element(element_id).kind == "opening"
+
+    # geometry_controller
+
+    def geometry_get_p1(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).p1)
+
+    def geometry_get_p2(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).p2)
+
+    def geometry_get_xl(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).xl)
+
+    def geometry_get_yl(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).yl)
+
+    def geometry_get_zl(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).zl)
+
+    def geometry_get_width(self, element_id: int) -> float:
+        return self._element(element_id).width
+
+    def geometry_get_height(self, element_id: int) -> float:
+        return self._element(element_id).height
+
+    def geometry_get_length(self, element_id: int) -> float:
+        return self._element(element_id).length
+
+    # bim_controller
+
+    def bim_get_ifc_guid(self, element_id: int) -> str:
+        return self._element(element_id).ifc_guid
+
+    def bim_get_ifc_base64_guid(self, element_id: int) -> str:
+        return self._element(element_id).ifc_guid.replace("-", "")[:22]
+
+    def bim_get_ifc_options(self) -> _Options:
+        return _Options()
+
+    def bim_export_ifc4_silently_with_options(self, element_ids: List[int], filepath: str, options) -> bool:
+        with open(filepath, "w") as f:
+            for element_id in element_ids:
+                element = self._element(element_id)
+                f.write(f"{element.ifc_guid};{element.name};{element.p1};{element.length}\n")
+        self.exported_files.append(filepath)
+        return True
+
+    # dimension_controller
+
+    def dimension_create_dimension(self, xl: point_3d, normal: point_3d, distance: point_3d, points: List[point_3d]) -> int:
+        return self.document.add(kind="dimension", xl=_t(xl), yl=_t(normal.cross(xl)), dimension_points=[_t(point) for point in points], dimension_offset=_t(distance)).id
+
+    def dimension_get_dimension_points(self, element_id: int) -> List[point_3d]:
+        return [_p(point) for point in self._element(element_id).dimension_points]
+
+    def dimension_get_plane_xl(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).xl)
+
+    def dimension_get_plane_normal(self, element_id: int) -> point_3d:
+        return _p(self._element(element_id).zl)
+
+    def dimension_get_segment_distance(self, element_id: int, index: int) -> float:
+        return math.sqrt(sum(v * v for v in self._element(element_id).dimension_offset))
+
+    def dimension_get_segment_direction(self, element_id: int, index: int) -> point_3d:
+        offset = self._element(element_id).dimension_offset
+        length = math.sqrt(sum(v * v for v in offset)) or 1.0
+        return point_3d(*(v / length for v in offset))
+
+    # visualization_controller
+
+    def visualization_refresh(self) -> None:
+        self.refreshes += 1
+
+    def visualization_get_camera_data(self) -> camera_data:
+        return self.document.camera
+
+    def visualization_set_camera_data(self, data: camera_data) -> None:
+        self.document.camera = data
+
+    def visualization_set_active(self, element_ids: List[int]) -> None:
+        self.document.active_ids = list(element_ids)
+
+    def visualization_set_inactive(self, element_ids: List[int]) -> None:
+        self.document.active_ids = [element_id for element_id in self.document.active_ids if element_id not in set(element_ids)]
+
+    def visualization_is_cadwork_window_in_dark_mode(self) -> bool:
+        return False
+
+    def _noop(self, *args) -> None:
+        pass
+
+    visualization_zoom_active_elements = _noop
+    visualization_show_view_standard_axo = _noop
+    visualization_set_visible = _noop
+    visualization_set_invisible = _noop
+    visualization_set_mutable = _noop
+    visualization_set_immutable = _noop
+    visualization_show_all_elements = _noop
+    visualization_hide_all_elements = _noop
+
+    # utility_controller
+
+    def utility_disable_auto_display_refresh(self) -> None:
+        self.autorefresh = False
+
+    def utility_enable_auto_display_refresh(self) -> None:
+        self.autorefresh = True
+
+    def utility_get_project_data(self, key: str) -> str:
+        return self.document.project_data.get(key, "")
+
+    def utility_set_project_data(self, key: str, data: str) -> None:
+        self.document.project_data[key] = data
+
+    def utility_delete_project_data(self, key: str) -> None:
+        self.document.project_data.pop(key, None)
+
+    def utility_get_project_data_keys(self) -> List[str]:
+        return list(self.document.project_data)
+
+    def utility_get_use_of_global_coordinates(self) -> bool:
+        return self.document.use_global_coordinates
+
+    def utility_set_use_of_global_coordinates(self, value: bool) -> None:
+        self.document.use_global_coordinates = value
+
+    def utility_get_language(self) -> str:
+        return "en"
+
+    def utility_get_plugin_path(self) -> str:
+        return ""
+
+    def utility_get_3d_file_name(self) -> str:
+        return "simulated.3d"
+
+    utility_save_3d_file_silently = _noop
+
+
+# ==============================================================================
+# installation
+# ==============================================================================
+
+_ACTIVE: Optional[Simulator] = None
+
+
+def activate(simulator: Simulator) -> Simulator:
+    """Makes the given simulator receive all calls to the simulated controller modules."""
+    global _ACTIVE
+    _ACTIVE = simulator
+    return simulator
+
+
+def active() -> Simulator:
+    if _ACTIVE is None:
+        raise RuntimeError("No simulator is active.")
+    return _ACTIVE
+
+
+def _make_controller_module(name: str) -> types.ModuleType:
+    module = types.ModuleType(name)
+
+    def __getattr__(attribute: str):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        simulator = active()
+        # fail on attribute access for unknown functions, like a real module
+        if not hasattr(simulator, f"{name.split('_')[0]}_{attribute}"):
+            raise AttributeError(f"module '{name}' has no attribute '{attribute}'")
+        return lambda *args: active().call(name, attribute, *args)
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+def install() -> None:
+    """Registers the simulated cadwork modules in ``sys.modules``, replacing any installed ones (e.g. the stubs of ``cwapi3d``)."""
+    sys.modules["cadwork"] = _make_cadwork_module()
+    for name in CONTROLLERS:
+        sys.modules[name] = _make_controller_module(name)
+    activate(Simulator())
@@ -0,0 +1,90 @@
+from compas_cadwork.datamodel import ATTR_INSTRUCTION_ID
+from compas_cadwork.datamodel import AttributeIndex
+from compas_cadwork.datamodel import Element
+from compas_cadwork.utilities import get_all_elements
+from compas_cadwork.utilities import get_all_elements_with_attrib
+from compas_cadwork.utilities import set_user_attribute
+
+
+def _add_elements(document):
+    document.add(attributes={5: "Wall"})
+    document.add(attributes={5: "Wall"})
+    document.add(attributes={5: "Roof"})
+    document.add(attributes={ATTR_INSTRUCTION_ID: "instruction-1"})
+
+
+def test_attribute_index_scans_once(sim):
+    _add_elements(sim.document)
+    index = AttributeIndex()
+
+    assert index.lookup(5, "Wall") == {1, 2}
+    assert index.lookup(5, "Roof") == {3}
+    assert index.lookup(5, "") == {4}
+    assert index.ids_with_attribute(5) == {1, 2, 3}
+    assert index.value_of(3, 5) == "Roof"
+    assert 5 in index
+    assert sim.calls["attribute_controller.get_user_attribute"] == 4
+
+
+def test_attribute_index_matches_scan(sim):
+    _add_elements(sim.document)
+    index = AttributeIndex(attribute_numbers=[ATTR_INSTRUCTION_ID])
+
+    assert list(get_all_elements(index=index)) == list(get_all_elements())
+    assert list(get_all_elements_with_attrib(5, "Wall", index=index)) == list(get_all_elements_with_attrib(5, "Wall"))
+
+
+def test_attribute_index_follows_element_changes(sim):
+    _add_elements(sim.document)
+    index = AttributeIndex(attribute_numbers=[5, ATTR_INSTRUCTION_ID])
+    sim.reset_calls()
+
+    Element(1).set_attribute(5, "Roof")
+    set_user_attribute([2], 5, "Floor")
+    Element(3).remove()
+    Element(2).set_is_instruction(True, "instruction-2")
+
+    assert index.lookup(5, "Roof") == {1}
+    assert index.lookup(5, "Floor") == {2}
+    assert index.lookup(5, "Wall") == set()
+    assert index.value_of(3, 5) is None
+    assert index.ids_with_attribute(ATTR_INSTRUCTION_ID) == {2, 4}
+    assert sim.calls["attribute_controller.get_user_attribute"] == 0
+
+
+def test_attribute_index_attribute_removed(sim):
+    _add_elements(sim.document)
+    index = AttributeIndex(attribute_numbers=[5])
+
+    Element(1).remove_attribute(5)
+
+    # rebuilt from cadwork on next use
+    assert 5 not in index
+    assert index.lookup(5, "Wall") == {1, 2}
+
+
+def test_attribute_index_refresh(sim):
+    _add_elements(sim.document)
+    index = AttributeIndex(attribute_numbers=[5])
+
+    sim.document.elements[1].attributes[5] = "Floor"
+    del sim.document.elements[2]
+    added = sim.document.add(attributes={5: "Wall"})
+    index.refresh([1, 2, added.id])
+
+    assert index.lookup(5, "Floor") == {1}
+    assert index.lookup(5, "Wall") == {added.id}
+    assert index.value_of(2, 5) is None
+
+
+def test_attribute_index_subset_ignores_other_elements(sim):
+    _add_elements(sim.document)
+    subset = AttributeIndex(element_ids=[1, 2], attribute_numbers=[5])
+    document = AttributeIndex(attribute_numbers=[5])
+    added = sim.document.add()
+
+    set_user_attribute([2, 3, added.id], 5, "Floor")
+
+    assert subset.lookup(5, "Floor") == {2}
+    assert subset.value_of(3, 5) is None
+    assert document.lookup(5, "Floor") == {2, 3, added.id}
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from compas_cadwork.bridge import BridgeExecutor
+from compas_cadwork.profiling import profile_bridge
+from compas_cadwork.storage import MemoryProjectData
+from compas_cadwork.storage import ProjectStorage
+from compas_cadwork.utilities import get_all_elements_async
+from compas_cadwork.utilities import get_element_groups
+from compas_cadwork.utilities import get_element_groups_async
+
+
+@pytest.fixture
+def host(stand):
+    stand.host_thread = threading.get_ident()
+    yield stand
+    stand.host_thread = None
+
+
+def test_jobs_run_on_host_thread(host):
+    with BridgeExecutor() as bridge:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(bridge.call, threading.get_ident) for _ in range(8)]
+            bridge.run_until_complete(futures, timeout=5.0)
+
+    assert {future.result() for future in futures} == {threading.get_ident()}
+
+
+def test_controller_calls_from_worker_fail_without_bridge(host):
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with pytest.raises(RuntimeError):
+            pool.submit(get_element_groups).result()
+
+
+def test_run_coroutine(host):
+    backend = MemoryProjectData()
+    storage = ProjectStorage("test", incremental=True, backend=backend)
+    storage.save({"a": {"value": 1}, "b": [1, 2, 3]})
+
+    async def main():
+        return await asyncio.gather(get_element_groups_async(), get_all_elements_async(), ProjectStorage("test", incremental=True, backend=backend).load_async())
+
+    with BridgeExecutor() as bridge:
+        groups, elements, data = bridge.run(main(), timeout=5.0)
+
+    assert groups.keys() == get_element_groups().keys()
+    assert len(elements) == len(host.document)
+    assert data == {"a": {"value": 1}, "b": [1, 2, 3]}
+
+
+def test_async_results_are_read_off_host(host):
+    async def main():
+        elements = await get_all_elements_async(fields=["name", "group"])
+        groups = await get_element_groups_async()
+        # runs on the worker thread, where any call to cadwork raises
+        names = {record.id: (record.name, record.group) for record in elements}
+        return names, {name: (list(group.element_ids), group.wall_frame_element.id) for name, group in groups.items()}
+
+    with BridgeExecutor() as bridge:
+        names, groups = bridge.run(main(), timeout=5.0)
+
+    assert names == {element.id: (element.name, element.group) for element in host.document.elements.values()}
+    for name, group in get_element_groups().items():
+        assert groups[name] == (list(group.element_ids), group.wall_frame_element.id)
+
+
+def test_profile_jobs(host):
+    with profile_bridge() as stats:
+        with BridgeExecutor() as bridge:
+            bridge.run(get_element_groups_async(), timeout=5.0)
+
+    # attributed to the job, not to the executor which ran it
+    assert stats.functions["attribute_controller.get_group"].callers == {"get_element_groups": host.calls["attribute_controller.get_group"]}
+
+
+def test_map_is_one_batch(host):
+    with BridgeExecutor() as bridge:
+        results = bridge.run(lambda: list(bridge.map(lambda x: x * 2, range(10))), timeout=5.0)
+
+    assert results == [x * 2 for x in range(10)]
+    assert bridge.batches_processed == 1
+    assert bridge.jobs_processed == 10
+
+
+def test_exceptions_are_raised_in_caller(host):
+    def fail():
+        raise ValueError("fail")
+
+    with BridgeExecutor() as bridge:
+        with pytest.raises(ValueError):
+            bridge.run(bridge.call, fail, timeout=5.0)
+
+
+def test_shutdown(sim):
+    bridge = BridgeExecutor()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(bridge.submit, threading.get_ident).result()
+    bridge.shutdown()
+
+    assert future.cancelled()
+    with pytest.raises(RuntimeError):
+        bridge.submit(threading.get_ident)
+    with pytest.raises(RuntimeError):
+        BridgeExecutor.current()
@@ -0,0 +1,109 @@
+import pytest
+from compas.geometry import Point
+from compas.geometry import Vector
+from compas.tolerance import TOL
+
+from compas_cadwork.scene import Camera
+from compas_cadwork.scene import CameraKeyframe
+from compas_cadwork.scene import CameraPath
+
+
+class FakeClock:
+    """Time advances only by sleeping and by applying camera frames, which take ``frame_time`` seconds each."""
+
+    def __init__(self, frame_time=0.0):
+        self.now = 0.0
+        self.frame_time = frame_time
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def path():
+    start = CameraKeyframe(Point(0, 0, 0), Point(10, 0, 0), Vector(0, 0, 1), fov=0.5)
+    end = CameraKeyframe(Point(0, 10, 0), Point(10, 10, 0), Vector(0, 0, 1), fov=1.0, duration=1.0)
+    return CameraPath([start, end], fps=10)
+
+
+@pytest.fixture
+def camera(sim):
+    return Camera.from_activedoc()
+
+
+def _timed_camera(camera, clock, monkeypatch):
+    update = camera.update
+
+    def timed_update(**kwargs):
+        update(**kwargs)
+        clock.now += clock.frame_time
+
+    monkeypatch.setattr(camera, "update", timed_update)
+    return camera
+
+
+def test_camera_path_interpolation(path):
+    assert path.duration == 1.0
+    assert len(path.frames) == 11
+    assert path.frames[0] is path.keyframes[0]
+
+    middle = path.frames[5]
+    assert TOL.is_allclose(middle.position, [0, 5, 0])
+    assert TOL.is_allclose(middle.target, [10, 5, 0])
+    assert TOL.is_close(middle.fov, 0.75)
+    assert TOL.is_allclose(path.frames[-1].position, path.keyframes[-1].position)
+    assert all(TOL.is_close(frame.duration, 0.1) for frame in path.frames[1:])
+
+
+def test_camera_path_interpolation_unitizes_up_vector():
+    start = CameraKeyframe(Point(0, 0, 0), Point(10, 0, 0), Vector(0, 0, 1))
+    end = CameraKeyframe(Point(0, 0, 0), Point(10, 0, 0), Vector(0, 1, 0), duration=0.2)
+    path = CameraPath([start, end], fps=10)
+
+    assert len(path.frames) == 3
+    assert TOL.is_close(path.frames[1].up_vector.length, 1.0)
+    # the field of view is only interpolated if both keyframes have one
+    assert all(frame.fov is None for frame in path.frames)
+
+    with pytest.raises(ValueError):
+        CameraPath([])
+
+
+def test_camera_path_play(sim, camera, path, monkeypatch):
+    clock = FakeClock(frame_time=0.01)
+    stats = path.play(_timed_camera(camera, clock, monkeypatch), clock=clock, sleep=clock.sleep)
+
+    assert stats.frames == 11
+    assert stats.dropped_frames == 0
+    assert TOL.is_close(stats.duration, 1.01)
+    assert TOL.is_close(stats.max_frame_time, 0.01)
+    assert all(TOL.is_close(seconds, 0.09) for seconds in clock.sleeps)
+    assert TOL.is_allclose(camera.position, [0, 10, 0])
+    assert TOL.is_close(camera.fov, 1.0)
+    assert sim.document.camera.get_field_of_view() == 1.0
+
+
+def test_camera_path_drop_frames(camera, path, monkeypatch):
+    clock = FakeClock(frame_time=0.25)
+    stats = path.play(_timed_camera(camera, clock, monkeypatch), clock=clock, sleep=clock.sleep)
+
+    # frames are skipped to keep the duration, the last frame is always applied
+    assert stats.frames + stats.dropped_frames == 11
+    assert stats.dropped_frames > 0
+    assert stats.duration < 1.5
+    assert TOL.is_allclose(camera.position, [0, 10, 0])
+
+
+def test_camera_path_without_drop_frames(camera, path, monkeypatch):
+    clock = FakeClock(frame_time=0.25)
+    stats = path.play(_timed_camera(camera, clock, monkeypatch), drop_frames=False, clock=clock, sleep=clock.sleep)
+
+    assert stats.frames == 11
+    assert stats.dropped_frames == 0
+    assert TOL.is_close(stats.duration, 2.75)
+    assert clock.sleeps == []
@@ -0,0 +1,63 @@
+from compas_cadwork.datamodel import ATTR_INSTRUCTION_ID
+from compas_cadwork.datamodel import Element
+from compas_cadwork.utilities import ElementCatalog
+from compas_cadwork.utilities import get_dimensions
+
+
+def _copies(document):
+    # the number of copies of the fixture model, see the --cadwork-copies option
+    return sum(1 for element in document.elements.values() if element.kind == "wall")
+
+
+def test_element_catalog(stand):
+    catalog = ElementCatalog.from_document()
+    stand.reset_calls()
+
+    copies = _copies(stand.document)
+    assert len(catalog.beams) == 31 * copies
+    assert len(catalog.walls) == copies
+    assert len(catalog.dimensions) == copies
+    assert len(catalog.beams_in_group(f"Wall_{copies - 1:04d}")) == 31
+    assert [e.id for e in catalog.dimensions] == [d.id for d in get_dimensions()]
+    stand.reset_calls()
+    assert get_dimensions(catalog=catalog)
+    assert stand.total_calls == 0
+
+
+def test_element_catalog_matches_element_properties(stand):
+    document = stand.document
+    document.add(kind="drilling", group="Wall_0000")
+    document.add(kind="opening", group="Wall_0000")
+    document.add(kind="surface", name="grid")
+    document.add(name="axis", group="GL_A")
+    document.add(kind="roof", framed="roof", group="Roof")
+    document.add(kind="floor", framed="floor", group="Floor")
+    document.add(name="instruction", attributes={ATTR_INSTRUCTION_ID: "instruction-1"})
+    catalog = ElementCatalog.from_document()
+
+    for element_id in document.elements:
+        element = Element(element_id)
+        expected = {kind for kind in ElementCatalog.KINDS if getattr(element, f"is_{kind}" if kind != "dimension" else "is_linear_dimension")}
+        assert catalog.kinds_of(element_id) == expected, element_id
+    assert all(catalog.element_ids(kind) for kind in ElementCatalog.KINDS)
+
+
+def test_element_catalog_update(stand):
+    catalog = ElementCatalog.from_document()
+    beam = stand.document.add(name="new", group="Wall_0000")
+    drilling = stand.document.add(kind="drilling", group="Wall_0000")
+
+    catalog.update(added=[beam.id, drilling.id])
+    Element(1).remove()
+    Element(beam.id).set_is_instruction(True, "instruction-1")
+
+    assert 1 not in catalog
+    assert [e.id for e in catalog.drillings] == [drilling.id]
+    assert [e.id for e in catalog.instructions] == [beam.id]
+    assert catalog.kinds_of(beam.id) == {"beam", "instruction"}
+    assert len(catalog.beams_in_group("Wall_0000")) == 31
+
+    stand.document.elements[beam.id].attributes[ATTR_INSTRUCTION_ID] = ""
+    catalog.update(added=[beam.id], removed=[drilling.id])
+    assert not catalog.instructions
+    assert not catalog.drillings
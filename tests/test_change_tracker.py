@@ -0,0 +1,137 @@
+from compas.geometry import Vector
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.utilities.events import ChangeTracker
+from compas_cadwork.utilities.events import DimensionsDelta
+from compas_cadwork.utilities.events import fingerprint_element
+
+
+def _add_beams(document, count=3):
+    return [document.add(name=f"beam_{i}", p1=(i * 1000.0, 0.0, 0.0)).id for i in range(count)]
+
+
+def test_fingerprint_element(sim):
+    element = sim.document.add(attributes={5: "Wall"})
+    fingerprint = fingerprint_element(element.id, [5])
+
+    element.p1 = (1e-9, 0.0, 0.0)
+    assert fingerprint_element(element.id, [5]) == fingerprint
+    element.attributes[5] = "Roof"
+    assert fingerprint_element(element.id, [5]) != fingerprint
+    assert fingerprint_element(element.id) == fingerprint_element(element.id, [])
+
+
+def test_change_tracker_added_and_removed(sim):
+    _add_beams(sim.document)
+    tracker = ChangeTracker()
+
+    added = sim.document.add(name="new")
+    del sim.document.elements[1]
+    changes = tracker.poll()
+
+    assert changes.added == [added.id]
+    assert changes.removed == [1]
+    assert changes.modified == []
+    assert not tracker.poll()
+
+
+def test_change_tracker_modified_through_element(sim):
+    _add_beams(sim.document)
+    tracker = ChangeTracker(watch_selection=False)
+    sim.reset_calls()
+
+    Element(2).translate(Vector(0, 0, 100))
+    changes = tracker.poll()
+
+    assert changes.modified == [2]
+    # only the translated element is fingerprinted again
+    assert sim.calls["geometry_controller.get_p1"] == 1
+
+
+def test_change_tracker_modified_externally(sim):
+    _add_beams(sim.document)
+    tracker = ChangeTracker()
+
+    # not visible until the element is selected, marked dirty or a full poll is made
+    sim.document.elements[1].length = 5.0
+    sim.document.elements[2].length = 5.0
+    sim.document.elements[3].length = 5.0
+    assert tracker.poll(update=False).modified == []
+
+    sim.document.active_ids = [1]
+    tracker.mark_dirty([2])
+    assert sorted(tracker.poll(update=False).modified) == [1, 2]
+    assert sorted(tracker.poll(full=True).modified) == [1, 2, 3]
+    assert tracker.poll(full=True).modified == []
+
+
+def test_change_tracker_attributes(sim):
+    _add_beams(sim.document)
+    tracker = ChangeTracker(attribute_numbers=[5], watch_selection=False)
+
+    Element(1).set_attribute(5, "Wall")
+    Element(2).set_attribute(6, "ignored")
+
+    assert tracker.poll().modified == [1]
+
+
+def test_change_tracker_filter(sim):
+    _add_beams(sim.document)
+    tracker = ChangeTracker(element_filter=lambda element_id: element_id != 1)
+    assert tracker.tracked_ids == [2, 3]
+
+    del sim.document.elements[1]
+    assert not tracker.poll()
+
+
+def test_dimensions_delta(sim):
+    _add_beams(sim.document)
+    dimension = sim.document.add(kind="dimension", dimension_points=[(0.0, 0.0, 0.0), (1000.0, 0.0, 0.0)])
+    delta = DimensionsDelta()
+
+    # edited in cadwork while not selected
+    dimension.dimension_points[1] = (2000.0, 0.0, 0.0)
+
+    assert [d.id for d in delta.check_for_changed_dimensions()] == [dimension.id]
+    dimension.dimension_points[1] = (1000.0, 0.0, 0.0)
+    assert delta.check_for_changed_dimensions() == []
+
+
+def test_dimensions_delta_selected(sim):
+    _add_beams(sim.document)
+    dimension = sim.document.add(kind="dimension", dimension_points=[(0.0, 0.0, 0.0), (1000.0, 0.0, 0.0)])
+    delta = DimensionsDelta(full_scan=False)
+
+    # edited in cadwork while selected
+    dimension.dimension_points[1] = (2000.0, 0.0, 0.0)
+    sim.document.active_ids = [dimension.id]
+
+    assert [d.id for d in delta.check_for_changed_dimensions()] == [dimension.id]
+    # the baseline is kept until reset, also after the dimension is deselected
+    sim.document.active_ids = []
+    assert [d.id for d in delta.check_for_changed_dimensions()] == [dimension.id]
+    delta.reset()
+    assert delta.check_for_changed_dimensions() == []
+
+
+def test_dimensions_delta_cost(sim):
+    _add_beams(sim.document)
+    for i in range(10):
+        sim.document.add(kind="dimension", dimension_points=[(0.0, 0.0, 0.0), (1000.0 * i, 0.0, 0.0)])
+    delta = DimensionsDelta(full_scan=False)
+    _add_beams(sim.document)
+    delta.check_for_changed_dimensions()
+    sim.reset_calls()
+
+    assert delta.check_for_changed_dimensions() == []
+    # neither fingerprints nor classifies anything
+    assert sim.calls["dimension_controller.get_dimension_points"] == 0
+    assert sim.calls["attribute_controller.get_element_type"] == 0
+
+
+def test_dimensions_delta_selected_misses_unselected(sim):
+    dimension = sim.document.add(kind="dimension", dimension_points=[(0.0, 0.0, 0.0), (1000.0, 0.0, 0.0)])
+    delta = DimensionsDelta(full_scan=False)
+
+    dimension.dimension_points[1] = (2000.0, 0.0, 0.0)
+    assert delta.check_for_changed_dimensions() == []
@@ -0,0 +1,56 @@
+import numpy as np
+from compas.geometry import Point
+from compas.geometry import Vector
+
+from compas_cadwork.conversions import array_to_cadwork
+from compas_cadwork.conversions import array_to_pointcloud
+from compas_cadwork.conversions import array_to_points
+from compas_cadwork.conversions import array_to_vectors
+from compas_cadwork.conversions import point_to_cadwork
+from compas_cadwork.conversions import point_to_compas
+from compas_cadwork.conversions import points_to_array
+from compas_cadwork.conversions import points_to_cadwork
+from compas_cadwork.conversions import points_to_compas
+from compas_cadwork.conversions import vector_to_cadwork
+from compas_cadwork.conversions import vector_to_compas
+
+COORDINATES = [[0.0, 1.0, 2.0], [3.5, -4.0, 5.25]]
+
+
+def test_primitives_round_trip():
+    point = Point(1.0, 2.0, 3.0)
+    vector = Vector(0.0, 0.0, 1.0)
+
+    assert point_to_compas(point_to_cadwork(point)) == point
+    assert vector_to_compas(vector_to_cadwork(vector)) == vector
+    assert isinstance(vector_to_compas(vector_to_cadwork(vector)), Vector)
+
+
+def test_points_batch_matches_single():
+    points = [Point(*xyz) for xyz in COORDINATES]
+    cadwork_points = points_to_cadwork(points)
+
+    assert [tuple(p) for p in cadwork_points] == [tuple(point_to_cadwork(p)) for p in points]
+    assert points_to_compas(cadwork_points) == points
+
+
+def test_points_to_array():
+    points = points_to_cadwork(Point(*xyz) for xyz in COORDINATES)
+    array = points_to_array(points)
+
+    assert array.shape == (2, 3)
+    assert array.dtype == np.float64
+    assert array.tolist() == COORDINATES
+    assert points_to_array([]).shape == (0, 3)
+    # any object with x, y and z is accepted
+    assert points_to_array([Vector(*COORDINATES[1])]).tolist() == [COORDINATES[1]]
+
+
+def test_array_conversions():
+    array = np.array(COORDINATES, dtype=np.float32)
+
+    assert [tuple(p) for p in array_to_cadwork(array)] == [tuple(xyz) for xyz in COORDINATES]
+    assert array_to_points(array) == [Point(*xyz) for xyz in COORDINATES]
+    assert array_to_vectors(array) == [Vector(*xyz) for xyz in COORDINATES]
+    assert all(isinstance(v, Vector) for v in array_to_vectors(array))
+    assert array_to_pointcloud(array).points == [Point(*xyz) for xyz in COORDINATES]
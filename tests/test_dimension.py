@@ -0,0 +1,46 @@
+from compas_cadwork.datamodel import Dimension
+
+
+def _add_dimension(document, end=1000.0):
+    return document.add(kind="dimension", dimension_points=[(0.0, 0.0, 0.0), (end, 0.0, 0.0)], dimension_offset=(0.0, 0.0, 200.0))
+
+
+def test_dimension_anchors_loaded_lazily(sim):
+    _add_dimension(sim.document)
+    dimension = Dimension(1)
+    assert sim.calls["dimension_controller.get_dimension_points"] == 0
+
+    assert dimension.length == 1000.0
+    assert len(dimension.anchors) == 2
+    assert dimension.anchors[1].distance == 200.0
+    assert dimension.frame.point == [0.0, 0.0, 0.0]
+    assert sim.calls["dimension_controller.get_dimension_points"] == 1
+
+
+def test_dimension_hash_does_not_load_anchors(sim):
+    _add_dimension(sim.document)
+    dimension = Dimension(1)
+
+    dimensions = {dimension}
+    assert hash(dimension) == hash(Dimension(1))
+    assert sim.calls["dimension_controller.get_dimension_points"] == 0
+
+    # the anchors are stable after the first load, the hash does not change
+    hash_before = hash(dimension)
+    sim.document.elements[1].dimension_points.append((2000.0, 0.0, 0.0))
+    assert len(Dimension(1).anchor_values) == 3
+    assert hash(dimension) == hash_before
+    assert dimension in dimensions
+
+
+def test_dimension_equality_compares_anchors(sim):
+    element = _add_dimension(sim.document)
+    before = Dimension(1)
+    before.anchor_values
+
+    assert before == Dimension(1)
+    element.dimension_points[1] = (1000.0 + 1e-6, 0.0, 0.0)
+    assert before == Dimension(1)
+    element.dimension_points[1] = (2000.0, 0.0, 0.0)
+    assert before != Dimension(1)
+    assert before.anchor_fingerprint != Dimension(1).anchor_fingerprint
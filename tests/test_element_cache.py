@@ -0,0 +1,91 @@
+from compas.geometry import Vector
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementCache
+from compas_cadwork.datamodel import element_cache
+
+
+def test_element_cache_serves_repeated_reads(sim):
+    sim.document.add(name="beam")
+    element = Element(1)
+
+    with element_cache() as cache:
+        assert element.name == "beam"
+        assert element.name == "beam"
+        assert Element(1).name == "beam"
+
+    assert sim.calls["attribute_controller.get_name"] == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert len(cache) == 1
+
+
+def test_element_cache_inactive_outside_of_context(sim):
+    sim.document.add(name="beam")
+
+    with element_cache():
+        Element(1).name
+    Element(1).name
+    Element(1).name
+
+    assert sim.calls["attribute_controller.get_name"] == 3
+
+
+def test_element_cache_invalidated_by_translate(sim):
+    sim.document.add(p1=(0.0, 0.0, 0.0))
+    element = Element(1)
+
+    with element_cache():
+        assert element.frame.point.z == 0.0
+        element.translate(Vector(0, 0, 100))
+        assert element.frame.point.z == 100.0
+
+
+def test_element_cache_invalidated_by_set_attribute_and_remove(sim):
+    sim.document.add(name="a")
+    sim.document.add(name="b")
+
+    with element_cache() as cache:
+        first, second = Element(1), Element(2)
+        first.name, second.name
+        first.set_attribute(5, "value")
+        assert 1 not in cache._values
+        assert 2 in cache._values
+
+        second.remove()
+        assert len(cache) == 0
+
+
+def test_element_cache_invalidated_by_remove_attribute(sim):
+    sim.document.add(name="a")
+    sim.document.add(name="b")
+
+    with element_cache() as cache:
+        Element(1).name, Element(2).name
+        # not scoped to an element, all cached values are discarded
+        Element(1).remove_attribute(5)
+        assert len(cache) == 0
+
+
+def test_element_invalidate(sim):
+    element = sim.document.add(name="before")
+
+    with element_cache():
+        assert Element(1).name == "before"
+        element.name = "after"
+        assert Element(1).name == "before"
+        Element(1).invalidate()
+        assert Element(1).name == "after"
+
+
+def test_element_cache_reused(sim):
+    sim.document.add(name="beam")
+    cache = ElementCache()
+
+    with element_cache(cache):
+        Element(1).name
+    with element_cache(cache):
+        Element(1).name
+
+    assert sim.calls["attribute_controller.get_name"] == 1
+    cache.reset_stats()
+    assert cache.hit_rate == 0.0
@@ -0,0 +1,50 @@
+import pytest
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementGroup
+
+
+def test_element_has_no_dict():
+    with pytest.raises(AttributeError):
+        Element(1).__dict__
+
+
+def test_element_group_elements_list_operations():
+    group = ElementGroup("Wall_01")
+    assert group.elements == []
+
+    group.elements.append(Element(1))
+    group.elements.extend([Element(2), Element(3)])
+    group.elements.insert(0, Element(0))
+    group.elements[1] = Element(10)
+    del group.elements[2]
+    group.elements.remove(Element(3))
+
+    assert group.elements == [Element(0), Element(10)]
+    assert list(group.element_ids) == [0, 10]
+    assert Element(10) in group.elements
+    assert group.elements.index(Element(10)) == 1
+    assert group.elements + [Element(4)] == [Element(0), Element(10), Element(4)]
+    assert group.elements.pop() == Element(10)
+    assert group.elements.copy() == [Element(0)]
+
+
+def test_element_group_elements_assignment():
+    group = ElementGroup("Wall_01", [Element(1), Element(2)])
+    group.elements = [Element(3)]
+    assert list(group.element_ids) == [3]
+    group.elements = None
+    assert len(group.elements) == 0
+
+
+def test_element_group_add_element_finds_wall_frame(sim):
+    sim.document.add(name="beam")
+    sim.document.add(name="wall", kind="wall", framed="wall")
+
+    group = ElementGroup("Wall_01")
+    group.add_element(Element(1))
+    group.add_element(Element(2))
+
+    assert group.wall_frame_element == Element(2)
+    assert group.ifc_guid == sim.document.elements[2].ifc_guid.replace("-", "")[:22]
+    assert group == ElementGroup.from_element_ids("Wall_01", [1, 2], Element(2))
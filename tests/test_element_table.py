@@ -0,0 +1,56 @@
+import pytest
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import ElementTable
+
+
+@pytest.fixture
+def document(sim):
+    sim.document.add(name="beam", group="Wall_01", p1=(0.0, 0.0, 0.0), length=2000.0)
+    sim.document.add(name="wall", group="Wall_01", kind="wall", framed="wall")
+    sim.document.add(name="grid", group="GL_A", kind="surface")
+    return sim.document
+
+
+def test_element_table_matches_element_properties(document):
+    fields = ["name", "group", "length", "frame", "midpoint", "is_beam", "is_wall", "is_gridline"]
+    table = ElementTable(document.elements, fields)
+
+    for record in table:
+        element = Element(record.id)
+        for field in fields:
+            assert getattr(record, field) == getattr(element, field)
+
+
+def test_element_table_shares_raw_columns(sim, document):
+    table = ElementTable(document.elements, ["frame", "centerline", "midpoint", "is_beam", "is_gridline", "group"])
+
+    assert len(table) == 3
+    assert sim.calls["geometry_controller.get_p1"] == 3
+    assert sim.calls["geometry_controller.get_p2"] == 3
+    assert sim.calls["attribute_controller.get_element_type"] == 3
+    assert sim.calls["attribute_controller.get_group"] == 3
+    assert sim.calls["attribute_controller.get_element_grouping_type"] == 1
+
+
+def test_element_table_filter_and_lookup(document):
+    table = ElementTable(document.elements, ["name", "is_beam", "is_gridline"])
+
+    assert table.filter("is_beam") == [1]
+    assert table.filter("is_gridline") == [3]
+    assert table.filter("name", "wall") == [2]
+    assert 2 in table
+    assert table[2].to_dict() == {"id": 2, "name": "wall", "is_beam": False, "is_gridline": False}
+
+
+def test_element_table_missing_fields(document):
+    with pytest.raises(ValueError):
+        ElementTable(document.elements, ["name", "color"])
+
+    table = ElementTable(document.elements, ["name"])
+    with pytest.raises(AttributeError):
+        table[1].width
+    with pytest.raises(KeyError):
+        table.column("width")
+    with pytest.raises(KeyError):
+        table[42]
@@ -0,0 +1,100 @@
+from compas_cadwork.datamodel import Element
+from compas_cadwork.utilities import GroupIndex
+from compas_cadwork.utilities import get_element_groups
+from compas_cadwork.utilities import get_element_groups_from_selection
+
+
+def _add_group(document, name, beams=2, framed="wall"):
+    ids = [document.add(name="beam", group=name, subgroup=f"{name}_sub").id for _ in range(beams)]
+    if framed:
+        ids.append(document.add(name=framed, kind=framed, group=name, subgroup=f"{name}_sub", framed=framed).id)
+    return ids
+
+
+def test_group_index_single_pass(sim):
+    _add_group(sim.document, "Wall_01")
+    _add_group(sim.document, "Wall_02", framed="roof")
+    sim.document.add(name="loose")
+
+    index = GroupIndex.from_document()
+
+    assert sim.calls["attribute_controller.get_group"] == len(sim.document)
+    assert sim.calls["attribute_controller.get_element_grouping_type"] == 1
+    assert index.group_names == ["Wall_01", "Wall_02"]
+    assert index.group_of(7) == ""
+    assert index.element_ids("Wall_02") == [4, 5, 6]
+    assert index.wall_frame_id("Wall_01") == 3
+    assert index.wall_frame_id("Wall_02") == 6
+
+
+def test_group_index_matches_get_element_groups(sim):
+    _add_group(sim.document, "Wall_01")
+    _add_group(sim.document, "Wall_02", framed=None)
+
+    groups = get_element_groups()
+
+    assert list(groups) == ["Wall_01"]
+    assert groups["Wall_01"].element_ids.tolist() == [1, 2, 3]
+    assert groups["Wall_01"].wall_frame_element == Element(3)
+    assert list(get_element_groups(is_wall_frame=False)) == ["Wall_01", "Wall_02"]
+
+
+def test_get_element_groups_from_selection_merges_ungrouped(sim):
+    loose = sim.document.add(name="loose").id
+    grouped = _add_group(sim.document, "Ungrouped", framed=None)
+    sim.document.active_ids = [loose] + grouped
+
+    groups = get_element_groups_from_selection(is_wall_frame=False)
+
+    assert list(groups) == ["Ungrouped"]
+    assert groups["Ungrouped"].element_ids.tolist() == [loose] + grouped
+
+
+def test_group_index_refresh(sim):
+    _add_group(sim.document, "Wall_01")
+    _add_group(sim.document, "Wall_02")
+    index = GroupIndex.from_document()
+
+    sim.document.elements[1].group = "Wall_02"
+    added = sim.document.add(name="beam", group="Wall_01")
+    del sim.document.elements[3]
+    index.refresh([1, 3, added.id])
+
+    assert index.element_ids("Wall_01") == [2, added.id]
+    assert index.element_ids("Wall_02") == [4, 5, 6, 1]
+    assert 3 not in index
+    assert index.wall_frame_id("Wall_01") is None
+
+
+def test_group_index_refresh_finds_new_wall_frame(sim):
+    _add_group(sim.document, "Wall_01", framed=None)
+    index = GroupIndex.from_document()
+    assert index.to_element_groups() == {}
+
+    sim.document.elements[2].framed = "wall"
+    index.refresh([2])
+
+    assert index.wall_frame_id("Wall_01") == 2
+    assert list(index.to_element_groups()) == ["Wall_01"]
+
+
+def test_group_index_refresh_loses_wall_frame(sim):
+    _add_group(sim.document, "Wall_01")
+    index = GroupIndex.from_document()
+    assert index.wall_frame_id("Wall_01") == 3
+
+    sim.document.elements[3].framed = ""
+    index.refresh([3])
+
+    assert index.wall_frame_id("Wall_01") is None
+
+
+def test_group_index_refresh_grouping_type_changed(sim):
+    _add_group(sim.document, "Wall_01")
+    index = GroupIndex.from_document()
+
+    sim.document.grouping_type = sim.document.grouping_type.subgroup
+    index.refresh([])
+
+    assert index.group_names == ["Wall_01_sub"]
+    assert len(index) == 3
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from compas_cadwork.utilities import get_element_groups
+from compas_cadwork.utilities.ifc_export import IFCExporter
+from compas_cadwork.utilities.ifc_export import _group_filenames
+
+
+@pytest.fixture
+def groups(sim):
+    for name in ["Wall_01", "A/B", "A:B", "Roof", "roof"]:
+        sim.document.add(name="beam", group=name)
+        sim.document.add(name="wall", group=name, kind="wall", framed="wall")
+    return get_element_groups(is_wall_frame=False)
+
+
+def test_export_groups_to_ifc(sim, groups, tmp_path):
+    postprocessed = []
+
+    results = IFCExporter().export_groups_to_ifc(groups, str(tmp_path), postprocess=postprocessed.append)
+
+    assert [result.name for result in results] == list(groups)
+    assert all(result.success and not result.skipped and result.error is None for result in results)
+    assert sorted(postprocessed) == sorted(result.filepath for result in results)
+    assert sorted(sim.exported_files) == sorted(os.path.abspath(result.filepath) for result in results)
+    with open(results[0].filepath) as f:
+        assert len(f.read().splitlines()) == 2
+
+
+def test_export_groups_to_ifc_distinct_filenames(groups, tmp_path):
+    results = IFCExporter().export_groups_to_ifc(groups, str(tmp_path))
+
+    filenames = [os.path.basename(result.filepath) for result in results]
+    assert len({filename.casefold() for filename in filenames}) == len(groups)
+    assert len(os.listdir(tmp_path)) == len(groups)
+    assert filenames[0] == "Wall_01.ifc"
+
+
+def test_group_filenames_are_stable():
+    filenames = _group_filenames(["A/B", "A:B", "Roof", "roof", "Wall_01"])
+    assert filenames["Wall_01"] == "Wall_01"
+    assert filenames["A/B"].startswith("A_B_") and filenames["A:B"].startswith("A_B_")
+
+    # the name of a sanitized group does not depend on the other groups
+    assert _group_filenames(["A/B"])["A/B"] == filenames["A/B"]
+    assert _group_filenames(["Roof", "Wall_01"])["Roof"] == "Roof"
+
+
+def test_export_groups_to_ifc_incremental(sim, groups, tmp_path):
+    exporter = IFCExporter()
+    results = exporter.export_groups_to_ifc(groups, str(tmp_path), incremental=True)
+    manifest = exporter.load_manifest(str(tmp_path))
+
+    assert sorted(manifest) == sorted(groups)
+    assert all(manifest[result.name]["file_hash"] == result.file_hash for result in results)
+
+    sim.exported_files.clear()
+    results = exporter.export_groups_to_ifc(groups, str(tmp_path), incremental=True)
+    assert all(result.skipped and result.success for result in results)
+    assert sim.exported_files == []
+    assert exporter.load_manifest(str(tmp_path)) == manifest
+
+
+def test_export_groups_to_ifc_incremental_changes(sim, groups, tmp_path):
+    exporter = IFCExporter()
+    results = {result.name: result for result in exporter.export_groups_to_ifc(groups, str(tmp_path), incremental=True)}
+    sim.exported_files.clear()
+
+    # a moved element, a deleted file and changed settings trigger a new export
+    sim.document.elements[groups["Wall_01"].element_ids[0]].p1 = (0.0, 0.0, 100.0)
+    os.remove(results["Roof"].filepath)
+    exported = [result.name for result in exporter.export_groups_to_ifc(groups, str(tmp_path), incremental=True) if not result.skipped]
+    assert sorted(exported) == ["Roof", "Wall_01"]
+    assert len(sim.exported_files) == 2
+
+    exporter.settings.export_cover_geometry = True
+    exported = [result.name for result in exporter.export_groups_to_ifc(groups, str(tmp_path), incremental=True) if not result.skipped]
+    assert sorted(exported) == sorted(groups)
+
+
+def test_export_groups_to_ifc_incremental_failed(groups, tmp_path):
+    exporter = IFCExporter()
+
+    def failing(filepath):
+        if "Roof" in filepath:
+            raise ValueError("invalid file")
+
+    results = exporter.export_groups_to_ifc(groups, str(tmp_path), postprocess=failing, incremental=True)
+    failed = [result.name for result in results if not result.success]
+    assert failed == ["Roof"]
+    assert "Roof" not in exporter.load_manifest(str(tmp_path))
+
+    # failed groups are exported again
+    results = exporter.export_groups_to_ifc(groups, str(tmp_path), incremental=True)
+    assert [result.name for result in results if not result.skipped] == ["Roof"]
+
+
+def test_load_manifest_invalid(tmp_path):
+    exporter = IFCExporter()
+    assert exporter.load_manifest(str(tmp_path)) == {}
+
+    (tmp_path / IFCExporter.MANIFEST_FILENAME).write_text("{invalid")
+    assert exporter.load_manifest(str(tmp_path)) == {}
+    (tmp_path / IFCExporter.MANIFEST_FILENAME).write_text('{"version": 0, "groups": {"A": {}}}')
+    assert exporter.load_manifest(str(tmp_path)) == {}
+
+    exporter.save_manifest(str(tmp_path), {"A": {"fingerprint": "f", "file_hash": "h"}})
+    assert exporter.load_manifest(str(tmp_path)) == {"A": {"fingerprint": "f", "file_hash": "h"}}
+    assert os.listdir(tmp_path) == [IFCExporter.MANIFEST_FILENAME]
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(__file__)
+
+# modules which must not be imported when compas loads the plugin
+DEFERRED = [
+    "compas_timber",
+    "compas_cadwork.scene.scene",
+    "compas_cadwork.scene.camera",
+    "compas_cadwork.utilities",
+    "compas_cadwork.datamodel",
+]
+
+
+def imported_modules(statement):
+    code = f"import simulator; simulator.install(); {statement}; import sys; print('\\n'.join(sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+
+def test_plugin_import_is_lazy():
+    modules = imported_modules("import compas_cadwork.scene")
+    for name in DEFERRED:
+        assert name not in modules
+
+
+def test_utilities_import_is_lazy():
+    modules = imported_modules("import compas_cadwork.utilities")
+    assert "compas_cadwork.utilities.ifc_export" not in modules
+    assert "compas_cadwork.utilities.spatial" not in modules
+    assert "compas_cadwork.datamodel.table" not in modules
+
+
+def test_lazy_names():
+    import compas_cadwork.datamodel
+    import compas_cadwork.scene
+    import compas_cadwork.utilities
+
+    for module in (compas_cadwork.datamodel, compas_cadwork.scene, compas_cadwork.utilities):
+        for name in module.__all__:
+            assert getattr(module, name) is not None
+            assert name in dir(module)
+        # every lazily imported name is public
+        assert set(module._LAZY_IMPORTS) <= set(module.__all__)
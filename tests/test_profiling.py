@@ -0,0 +1,73 @@
+import json
+
+import attribute_controller
+import element_controller
+from compas.scene import Scene
+
+import simulator
+from compas_cadwork import profiling
+from compas_cadwork.profiling import profile_bridge
+from compas_cadwork.utilities import ElementCatalog
+from compas_cadwork.utilities import get_element_groups
+
+
+def test_profile_bridge(stand, tmp_path):
+    filepath = tmp_path / "profile.json"
+
+    with profile_bridge(str(filepath)) as stats:
+        groups = get_element_groups()
+
+    group_calls = stats.functions["attribute_controller.get_group"]
+    assert group_calls.calls == stand.calls["attribute_controller.get_group"]
+    assert group_calls.callers == {"get_element_groups": group_calls.calls}
+    assert 0.0 <= group_calls.percentile(50) <= group_calls.percentile(99) <= group_calls.total_time
+    assert stats.total_calls == stand.total_calls
+    assert groups
+
+    dumped = json.loads(filepath.read_text())
+    assert dumped["total_calls"] == stats.total_calls
+    assert dumped["callers"] == {"get_element_groups": stats.total_calls}
+
+
+def test_profile_bridge_scene_object(sim):
+    sceneobject = Scene(context="cadwork").add(simulator.make_beams()[0])
+
+    with profile_bridge() as stats:
+        sceneobject.draw()
+
+    assert stats.functions["element_controller.create_rectangular_beam_vectors"].callers == {"BeamSceneObject.draw": 1}
+
+
+def test_profile_bridge_restores_modules(sim):
+    from compas_cadwork.utilities import catalog
+    from compas_cadwork.utilities import groups
+
+    with profile_bridge():
+        with profile_bridge() as inner:
+            assert profiling.is_profiling()
+        assert groups.ac is not attribute_controller
+        assert profiling.is_profiling()
+
+    assert not profiling.is_profiling()
+    assert groups.ec is element_controller
+    assert groups.ac is attribute_controller
+    assert catalog.ec is element_controller
+    assert catalog.ac is attribute_controller
+    assert inner.wall_time > 0.0
+
+
+def test_profile_bridge_off_after_exit(stand, monkeypatch):
+    with profile_bridge() as stats:
+        catalog = ElementCatalog.from_document()
+    calls = stats.total_calls
+
+    # the catalog keeps a controller function captured within the scope
+    def fail(frame):
+        raise AssertionError("recorded a call outside of profile_bridge")
+
+    monkeypatch.setattr(profiling, "_api_caller", fail)
+    element = stand.document.add(name="new")
+    catalog.update(added=[element.id])
+
+    assert catalog.kinds_of(element.id) is not None
+    assert stats.total_calls == calls
@@ -0,0 +1,82 @@
+import pytest
+
+from compas_cadwork.utilities import disable_autorefresh
+from compas_cadwork.utilities import enable_autorefresh
+from compas_cadwork.utilities import force_refresh
+from compas_cadwork.utilities import get_refresh_stats
+from compas_cadwork.utilities import reset_refresh_stats
+from compas_cadwork.utilities import suspended_refresh
+from compas_cadwork.utilities.refresh import is_refresh_suspended
+
+
+@pytest.fixture(autouse=True)
+def restore(sim):
+    reset_refresh_stats()
+    yield
+    enable_autorefresh()
+    reset_refresh_stats()
+
+
+def test_suspended_refresh_nested(sim):
+    with suspended_refresh() as stats:
+        assert not sim.autorefresh
+        force_refresh()
+        with suspended_refresh():
+            force_refresh()
+        assert sim.refreshes == 0
+
+    assert sim.autorefresh
+    assert sim.refreshes == 1
+    assert stats.suspensions == 1
+    assert stats.refreshes == 1
+    # two forced refreshes and the exit of the nested scope
+    assert stats.coalesced_refreshes == 3
+    assert sim.calls["utility_controller.disable_auto_display_refresh"] == 1
+    assert sim.calls["utility_controller.enable_auto_display_refresh"] == 1
+
+
+def test_suspended_refresh_exception(sim):
+    with pytest.raises(ValueError):
+        with suspended_refresh():
+            with suspended_refresh():
+                raise ValueError()
+
+    assert not is_refresh_suspended()
+    assert sim.autorefresh
+    assert sim.refreshes == 1
+
+
+def test_suspended_refresh_keeps_disabled_autorefresh(sim):
+    disable_autorefresh()
+    sim.reset_calls()
+
+    with suspended_refresh():
+        pass
+
+    assert not sim.autorefresh
+    assert sim.refreshes == 1
+    assert sim.calls["utility_controller.disable_auto_display_refresh"] == 0
+    assert sim.calls["utility_controller.enable_auto_display_refresh"] == 0
+
+
+def test_autorefresh_toggled_within_suspension(sim):
+    with suspended_refresh():
+        disable_autorefresh()
+    assert not sim.autorefresh
+
+    with suspended_refresh():
+        enable_autorefresh()
+        # deferred to the end of the suspension
+        assert not sim.autorefresh
+    assert sim.autorefresh
+
+
+def test_reset_refresh_stats(sim):
+    stats = get_refresh_stats()
+    with suspended_refresh():
+        force_refresh()
+
+    reset_refresh_stats()
+
+    assert stats is get_refresh_stats()
+    assert (stats.suspensions, stats.refreshes, stats.coalesced_refreshes, stats.suspended_time) == (0, 0, 0, 0.0)
@@ -0,0 +1,200 @@
+import gc
+import weakref
+
+from compas.geometry import Point
+from compas.scene import Scene
+
+import simulator
+from compas_cadwork.datamodel import Element
+from compas_cadwork.scene import CadworkSceneObject
+from compas_cadwork.scene import DrawnElementRegistry
+from compas_cadwork.scene import batch_draw
+from compas_cadwork.scene import clear_drawn_elements
+from compas_cadwork.scene import get_registry
+from compas_cadwork.scene import share_registry
+from compas_cadwork.utilities import remove_elements
+
+
+class Dummy:
+    pass
+
+
+def _draw(beams):
+    scene = Scene(context="cadwork")
+    sceneobjects = [scene.add(beam) for beam in beams]
+    scene.draw()
+    return scene, sceneobjects
+
+
+def test_registry_keys_by_name_and_order(sim):
+    beams = simulator.make_beams()[:3]
+    beams[1].name = "named"
+    scene, sceneobjects = _draw(beams)
+    registry = get_registry(scene)
+
+    assert [registry.key(sceneobject) for sceneobject in sceneobjects] == [("Beam", 0), ("named", 0), ("Beam", 1)]
+    assert registry.element_ids() == {1, 2, 3}
+    assert registry.owner(2) is sceneobjects[1]
+    assert sceneobjects[0].guids == [1]
+
+
+def test_registry_scenes_within_batch(sim):
+    beams = simulator.make_beams()[:4]
+    first = Scene(context="cadwork")
+    second = Scene(context="cadwork")
+    first_objects = [first.add(beam) for beam in beams[:2]]
+    second_objects = [second.add(beam) for beam in beams[2:]]
+
+    with batch_draw():
+        first.draw()
+        second.draw()
+
+    assert [sceneobject.guids for sceneobject in first_objects + second_objects] == [[1], [2], [3], [4]]
+    assert list(sim.document.elements) == [1, 2, 3, 4]
+
+
+def test_registry_per_scene(sim):
+    beams = simulator.make_beams()[:4]
+    first = _draw(beams[:2])[0]
+    second = _draw(beams[2:])[0]
+
+    # items with the same keys in independent scenes do not claim each other's elements
+    first.draw()
+    second.draw()
+    assert get_registry(first) is not get_registry(second)
+    assert get_registry(first).element_ids() == {1, 2}
+    assert get_registry(second).element_ids() == {3, 4}
+    assert list(sim.document.elements) == [1, 2, 3, 4]
+
+
+def test_registry_shared(sim):
+    beams = simulator.make_beams()[:3]
+    first = Scene(context="cadwork")
+    share_registry(first, "design")
+    for beam in beams:
+        first.add(beam)
+    first.draw()
+    sim.reset_calls()
+
+    second = Scene(context="cadwork")
+    registry = share_registry(second, "design")
+    for beam in simulator.make_beams()[:2]:
+        second.add(beam)
+    second.draw()
+
+    assert registry is get_registry(first)
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == 0
+    assert list(sim.document.elements) == [1, 2]
+
+
+def test_registry_released_with_scene(sim):
+    beams = simulator.make_beams()[:2]
+
+    scene = _draw(beams)[0]
+    released = weakref.ref(scene)
+    registry = weakref.ref(get_registry(scene))
+    del scene
+    gc.collect()
+
+    assert released() is None
+    assert registry() is None
+    # the elements are still removed with all drawn elements
+    clear_drawn_elements()
+    assert len(sim.document) == 0
+
+
+def test_registry_clear_sceneobject(sim):
+    beams = simulator.make_beams()[:3]
+    scene, sceneobjects = _draw(beams)
+
+    sceneobjects[1].clear_elements()
+
+    assert list(sim.document.elements) == [1, 3]
+    assert get_registry(scene).element_ids() == {1, 3}
+    assert sceneobjects[1].guids == []
+
+
+def test_sceneobject_clear_all(sim):
+    _draw(simulator.make_beams()[:2])
+    _draw(simulator.make_beams()[:2])
+    other = sim.document.add(name="not drawn")
+
+    CadworkSceneObject.clear()
+
+    assert list(sim.document.elements) == [other.id]
+
+
+def test_registry_follows_removed_elements(sim):
+    beams = simulator.make_beams()[:3]
+    scene, sceneobjects = _draw(beams)
+    registry = get_registry(scene)
+
+    remove_elements([1])
+    Element(2).remove()
+
+    assert registry.element_ids() == {3}
+    assert registry.state(sceneobjects[0]) is None
+    assert registry.sceneobjects == [sceneobjects[2]]
+
+
+def test_clear_drawn_elements(sim):
+    beams = simulator.make_beams()[:3]
+    scene = _draw(beams)[0]
+    other = sim.document.add(name="not drawn")
+
+    clear_drawn_elements([1, other.id])
+    assert list(sim.document.elements) == [2, 3, other.id]
+
+    clear_drawn_elements()
+    assert list(sim.document.elements) == [other.id]
+    assert len(get_registry(scene)) == 0
+
+
+def test_registry_dirty_ids():
+    registry = DrawnElementRegistry()
+    sceneobject = Dummy()
+
+    registry.add(sceneobject, 1)
+    registry.add(sceneobject, 2)
+    assert sorted(registry.take_dirty()) == [1, 2]
+    registry.add(sceneobject, 3)
+    assert registry.dirty_ids == {3}
+    assert registry.remove(sceneobject) == {1, 2, 3}
+    assert registry.dirty_ids == set()
+
+
+def test_registry_pass_removes_items_not_drawn_again():
+    registry = DrawnElementRegistry()
+    first, second = Dummy(), Dummy()
+
+    registry.begin_pass()
+    registry.add(first, 1)
+    registry.claim(second, "item")
+    registry.add(second, 2)
+    assert registry.end_pass() == []
+
+    registry.begin_pass()
+    assert registry.claim(second, "item") == ("item", 0)
+    # the element of the item which was not claimed again is removed
+    assert registry.end_pass() == [1]
+    assert registry.element_ids() == {2}
+    # outside of a pass, nothing is removed
+    assert registry.end_pass() == []
+
+
+def test_registry_claim_matches_content_before_order():
+    registry = DrawnElementRegistry()
+    first, second = Dummy(), Dummy()
+    registry.begin_pass()
+    for element_id, sceneobject, position in [(1, first, Point(0, 0, 0)), (2, second, Point(1, 0, 0))]:
+        registry.claim(sceneobject, "item", "content", position)
+        registry.add(sceneobject, element_id)
+        registry.record(sceneobject, "content", position)
+    registry.end_pass()
+
+    registry.begin_pass()
+    # same position first, then the first key with the same content, then a new key
+    assert registry.claim(Dummy(), "item", "content", Point(1, 0, 0)) == ("item", 1)
+    assert registry.claim(Dummy(), "item", "content", Point(5, 0, 0)) == ("item", 0)
+    assert registry.claim(Dummy(), "item", "content", Point(1, 0, 0)) == ("item", 2)
+    assert registry.claim(Dummy(), "item", "other") == ("item", 3)
@@ -0,0 +1,200 @@
+import pytest
+from compas.geometry import Translation
+from compas.scene import Scene
+
+import simulator
+from compas_cadwork.scene import batch_draw
+from compas_cadwork.scene import get_registry
+from compas_cadwork.scene import share_registry
+from compas_cadwork.scene import scene as scene_module
+from compas_cadwork.scene.beamobject import BeamSceneObject
+from compas_cadwork.utilities import refresh
+from compas_cadwork.utilities import remove_elements
+
+
+def _scene(beams):
+    scene = Scene(context="cadwork")
+    for beam in beams:
+        scene.add(beam)
+    return scene
+
+
+def _assert_not_suspended(sim):
+    assert scene_module._ACTIVE_BATCH is None
+    assert not refresh.is_refresh_suspended()
+    assert sim.autorefresh
+
+
+def test_scene_draw_batches_names(sim):
+    beams = simulator.make_beams()[:5]
+    scene = _scene(beams)
+
+    scene.draw()
+
+    assert sim.calls["attribute_controller.set_name"] == len(beams)
+    assert sim.calls["element_controller.recreate_elements"] == 1
+    assert sim.refreshes == 1
+    assert [element.name for element in sim.document.elements.values()] == [f"beam_{beam.guid}" for beam in beams]
+    _assert_not_suspended(sim)
+
+
+def test_scene_draw_raises(sim, monkeypatch):
+    beams = simulator.make_beams()[:5]
+    scene = _scene(beams)
+    draw_elements = BeamSceneObject.draw_elements
+
+    def failing(sceneobject):
+        if sceneobject.item is beams[2]:
+            raise ValueError("failed")
+        return draw_elements(sceneobject)
+
+    monkeypatch.setattr(BeamSceneObject, "draw_elements", failing)
+    with pytest.raises(ValueError):
+        scene.draw()
+
+    # the elements drawn before the failure are complete and the viewport is refreshed
+    _assert_not_suspended(sim)
+    assert len(sim.document) == 2
+    assert all(element.name for element in sim.document.elements.values())
+    assert sim.refreshes == 1
+
+    monkeypatch.setattr(BeamSceneObject, "draw_elements", draw_elements)
+    scene.draw()
+    _assert_not_suspended(sim)
+    assert len(sim.document) == 5
+
+
+def test_scene_draw_recovers_from_stale_batch(sim, monkeypatch):
+    beams = simulator.make_beams()[:3]
+    scene = _scene(beams)
+
+    # a scene object which is not a CadworkSceneObject raises, after_draw is never called
+    def failing(sceneobject):
+        raise ValueError("failed")
+
+    monkeypatch.setattr(BeamSceneObject, "draw", failing)
+    with pytest.raises(ValueError):
+        scene.draw()
+    assert refresh.is_refresh_suspended()
+
+    monkeypatch.undo()
+    scene.draw()
+    _assert_not_suspended(sim)
+    assert len(sim.document) == 3
+
+
+def test_scene_draw_within_batch_draw(sim):
+    beams = simulator.make_beams()[:3]
+    scene = _scene(beams)
+
+    with batch_draw() as batch:
+        scene.draw()
+        # applied when the outer context exits
+        assert len(batch) == 3
+        assert refresh.is_refresh_suspended()
+
+    _assert_not_suspended(sim)
+    assert sim.calls["attribute_controller.set_name"] == 3
+    assert sim.refreshes == 1
+
+
+def test_scene_redraw_incremental(sim):
+    beams = simulator.make_beams()[:3]
+    scene = _scene(beams)
+    scene.draw()
+    sim.reset_calls()
+
+    scene.draw()
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == 0
+    assert list(sim.document.elements) == [1, 2, 3]
+
+    beams[0].transform(Translation.from_vector([0.0, 0.0, 100.0]))
+    beams[1].length += 100.0
+    scene.draw()
+
+    # moved, replaced and kept
+    assert sim.calls["element_controller.move_element"] == 1
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == 1
+    assert list(sim.document.elements) == [1, 3, 4]
+    assert sim.document.elements[1].p1[2] == beams[0].frame.point.z
+
+
+def test_sceneobject_keeps_empty_registry(sim):
+    beams = simulator.make_beams()[:1]
+    scene = _scene(beams)
+    scene.draw()
+    sceneobject = scene.objects[0]
+    registry = get_registry(scene)
+
+    remove_elements(sceneobject.guids)
+    assert len(registry) == 0
+    scene.remove(sceneobject)
+
+    # the object sticks to the registry of the scene it drew in, even when it is empty
+    assert sceneobject.registry is registry
+    sceneobject.draw()
+    assert sceneobject.guids == [2]
+    assert registry.element_ids() == {2}
+
+
+def test_scene_redraw_rerun(sim):
+    # a design script builds a new scene with new beams on every run
+    scene = Scene(context="cadwork")
+    share_registry(scene, "design")
+    for beam in simulator.make_beams()[:3]:
+        scene.add(beam)
+    scene.draw()
+    sim.reset_calls()
+
+    beams = simulator.make_beams()[:2]
+    beams[1].transform(Translation.from_vector([0.0, 0.0, 100.0]))
+    scene = Scene(context="cadwork")
+    share_registry(scene, "design")
+    for beam in beams:
+        scene.add(beam)
+    scene.draw()
+
+    # kept, moved and the beam left out of the run is deleted
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == 0
+    assert sim.calls["element_controller.move_element"] == 1
+    assert list(sim.document.elements) == [1, 2]
+    assert [element.name for element in sim.document.elements.values()] == [f"beam_{beam.guid}" for beam in beams]
+    assert [sceneobject.guids for sceneobject in scene.objects] == [[1], [2]]
+    _assert_not_suspended(sim)
+
+
+def test_scene_redraw_removed_sceneobject(sim):
+    beams = simulator.make_beams()[:3]
+    for index, beam in enumerate(beams):
+        beam.name = f"beam {index}"
+    scene = _scene(beams)
+    scene.draw()
+
+    scene.remove(scene.objects[1])
+    scene.draw()
+
+    assert list(sim.document.elements) == [1, 3]
+
+
+def test_scene_redraw_rerun_without_first_item(sim):
+    # many beams with the same name, the first one is left out of the next run
+    scene = Scene(context="cadwork")
+    share_registry(scene, "design")
+    for beam in simulator.make_beams(copies=2)[:31]:
+        scene.add(beam)
+    scene.draw()
+    sim.reset_calls()
+
+    beams = simulator.make_beams(copies=2)[1:31]
+    scene = Scene(context="cadwork")
+    share_registry(scene, "design")
+    for beam in beams:
+        scene.add(beam)
+    scene.draw()
+
+    # the other beams keep their elements, only the one left out is deleted
+    assert sim.calls["element_controller.create_rectangular_beam_vectors"] == 0
+    assert sim.calls["element_controller.move_element"] == 0
+    assert sim.calls["element_controller.delete_elements"] == 1
+    assert list(sim.document.elements) == list(range(2, 32))
+    assert [sceneobject.guids for sceneobject in scene.objects] == [[element_id] for element_id in range(2, 32)]
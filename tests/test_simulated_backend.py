@@ -0,0 +1,39 @@
+from compas_cadwork.utilities import get_all_elements
+from compas_cadwork.utilities import get_dimensions
+from compas_cadwork.utilities import get_element_groups
+from compas_cadwork.utilities import remove_elements
+from compas_cadwork.utilities.events import ElementDelta
+
+
+def test_get_all_elements(stand):
+    elements = list(get_all_elements())
+    assert len(elements) == len(stand.document)
+
+
+def _copies(document):
+    # the number of copies of the fixture model, see the --cadwork-copies option
+    return sum(1 for element in document.elements.values() if element.kind == "wall")
+
+
+def test_get_element_groups(stand):
+    groups = get_element_groups()
+    assert len(groups) == _copies(stand.document)
+    for group in groups.values():
+        assert group.wall_frame_element is not None
+        # the beams of a copy of the model and its wall frame element
+        assert len(group.elements) == 32
+
+
+def test_get_dimensions(stand):
+    assert len(get_dimensions()) == _copies(stand.document)
+
+
+def test_element_delta(stand):
+    delta = ElementDelta()
+    element = stand.document.add(name="new")
+    remove_elements([1])
+
+    added, removed = delta.check_for_changed_elements()
+
+    assert [e.id for e in added] == [element.id]
+    assert [e.id for e in removed] == [1]
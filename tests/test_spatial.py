@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from compas.geometry import Box
+from compas.geometry import Frame
+from compas.geometry import Point
+from compas.geometry import Vector
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.utilities import SpatialIndex
+from compas_cadwork.utilities.events import ElementChanges
+
+
+@pytest.fixture
+def document(sim):
+    # beams of 1000 x 100 x 100 along x, p1 is in the middle of the cross section
+    sim.document.add(p1=(0.0, 0.0, 0.0))
+    sim.document.add(p1=(1000.0, 0.0, 0.0))
+    sim.document.add(p1=(3000.0, 0.0, 0.0))
+    sim.document.add(p1=(0.0, 1000.0, 0.0))
+    return sim.document
+
+
+def test_spatial_index_bounding_box(document):
+    index = SpatialIndex.from_document()
+
+    assert len(index) == 4
+    assert 4 in index
+    box_min, box_max = index.bounding_box(1)
+    assert np.allclose(box_min, [0, -50, -50])
+    assert np.allclose(box_max, [1000, 50, 50])
+
+
+def test_spatial_index_queries(document):
+    index = SpatialIndex.from_document()
+
+    assert index.intersecting(1) == [2]
+    assert sorted(index.intersecting(Point(1000, 0, 0))) == [1, 2]
+    assert index.intersecting((Point(2500, -10, -10), Point(3500, 10, 10))) == [3]
+    assert index.intersecting(Box(100, 100, 100, Frame(Point(0, 1000, 0)))) == [4]
+    assert index.within_distance(1, 1000.0) == [2, 4]
+    assert index.within_distance(1, 2000.0) == [2, 4, 3]
+    assert index.within_distance(Point(500, 0, 500), 500.0) == [1]
+    assert index.nearest(1, k=2) == [2, 4]
+    assert index.nearest(Point(3500, 0, 0)) == [3]
+    assert index.nearest(1, k=10) == [2, 4, 3]
+
+
+def test_spatial_index_matches_contacts(sim, document):
+    index = SpatialIndex.from_document()
+    for element_id in document.elements:
+        assert sorted(index.intersecting(element_id)) == sorted(sim.element_get_elements_in_contact(element_id))
+
+
+def test_spatial_index_follows_elements(document):
+    index = SpatialIndex.from_document()
+
+    Element(3).translate(Vector(-1000, 0, 0))
+    assert sorted(index.intersecting(3)) == [2]
+    Element(2).remove()
+    assert 2 not in index
+    assert index.intersecting(3) == []
+    assert index.nearest(1, k=10) == [4, 3]
+
+
+def test_spatial_index_apply_changes(document):
+    index = SpatialIndex([1, 2])
+    document.elements[2].p1 = (5000.0, 0.0, 0.0)
+
+    index.apply_changes(ElementChanges(added=[3], removed=[1], modified=[2, 4]))
+
+    assert len(index) == 2
+    assert 4 not in index
+    assert index.intersecting(2) == []
+    box_min, _ = index.bounding_box(2)
+    assert np.allclose(box_min, [5000, -50, -50])
+
+
+def test_spatial_index_reuses_rows(sim):
+    for i in range(100):
+        sim.document.add(p1=(i * 2000.0, 0.0, 0.0))
+    index = SpatialIndex.from_document()
+    capacity = len(index._ids)
+
+    index.remove(range(1, 51))
+    for i in range(50):
+        sim.document.add(p1=(i * 2000.0, 5000.0, 0.0))
+    index.insert(range(101, 151))
+
+    assert len(index) == 100
+    assert len(index._ids) == capacity
+    assert index.nearest(Point(0, 5000, 0)) == [101]
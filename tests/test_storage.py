@@ -0,0 +1,213 @@
+import gzip
+import os
+import time
+
+import pytest
+from compas.geometry import Frame
+from compas.geometry import Point
+
+import simulator
+from compas_cadwork.storage import CachedStorage
+from compas_cadwork.storage import JsonLinesFileStorage
+from compas_cadwork.storage import MemoryProjectData
+from compas_cadwork.storage import ProjectStorage
+from compas_cadwork.storage import Storage
+from compas_cadwork.storage import StorageError
+
+
+@pytest.fixture
+def data():
+    return {"settings": {"name": "line\nbreak", "count": 3}, "points": [Point(1, 2, 3), Point(4, 5, 6)], "frame": Frame.worldXY()}
+
+
+def test_jsonlines_round_trip(tmp_path, data):
+    filepath = str(tmp_path / "data.jsonl")
+    storage = JsonLinesFileStorage(filepath)
+    storage.save(data)
+
+    with open(filepath, "rb") as f:
+        assert len(f.read().splitlines()) == 4
+    assert storage.keys() == ["settings", "points", "frame"]
+    assert storage.load() == data
+    assert os.listdir(tmp_path) == ["data.jsonl"]
+
+
+def test_jsonlines_round_trip_data(tmp_path):
+    storage = JsonLinesFileStorage(str(tmp_path / "frame.jsonl"))
+    frame = Frame(Point(1, 2, 3))
+    storage.save(frame)
+
+    assert storage.keys() == ["point", "xaxis", "yaxis"]
+    loaded = storage.load()
+    assert isinstance(loaded, Frame)
+    assert loaded == frame
+
+    storage.save([1, 2, 3])
+    assert storage.keys() == []
+    assert storage.load() == [1, 2, 3]
+
+
+def test_jsonlines_gzip(tmp_path, data):
+    filepath = str(tmp_path / "data.jsonl.gz")
+    JsonLinesFileStorage(filepath, compress=True).save(data)
+
+    with open(filepath, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+    with gzip.open(filepath, "rb") as f:
+        assert len(f.read().splitlines()) == 4
+
+    # compression is detected on load
+    storage = JsonLinesFileStorage(filepath)
+    assert storage.load() == data
+    assert storage.load("points") == data["points"]
+
+
+def test_jsonlines_partial_load(tmp_path, data):
+    storage = JsonLinesFileStorage(str(tmp_path / "data.jsonl"))
+    storage.save(data)
+
+    assert storage.load("settings") == data["settings"]
+    assert storage.load("frame") == data["frame"]
+    with pytest.raises(StorageError):
+        storage.load("missing")
+
+
+def test_jsonlines_errors(tmp_path, data):
+    filepath = tmp_path / "data.jsonl"
+    storage = JsonLinesFileStorage(str(filepath))
+    with pytest.raises(StorageError):
+        storage.load()
+
+    filepath.write_text('{"format": "other"}\n')
+    with pytest.raises(StorageError):
+        storage.keys()
+
+    # a failed save keeps the previous file
+    storage.save(data)
+    with pytest.raises(StorageError):
+        storage.save({"value": object()})
+    assert storage.load() == data
+    assert os.listdir(tmp_path) == ["data.jsonl"]
+
+
+def test_project_storage_incremental_writes_changed_chunks(sim):
+    backend = MemoryProjectData()
+    storage = ProjectStorage("test", incremental=True, backend=backend)
+    data = {"a": [1], "b": [2], "c": [3]}
+
+    storage.save(data)
+    assert backend.writes == 4
+    storage.save(data)
+    assert backend.writes == 4
+
+    data["b"] = [20]
+    del data["c"]
+    storage.save(data)
+    assert backend.writes == 6
+    assert sorted(backend.data) == ["test", "test/a", "test/b"]
+    assert ProjectStorage("test", incremental=True, backend=backend).load() == data
+
+
+def test_project_storage_incremental_changed_by_other_storage(sim):
+    backend = MemoryProjectData()
+    storage = ProjectStorage("test", incremental=True, backend=backend)
+    other = ProjectStorage("test", incremental=True, backend=backend)
+
+    storage.save({"a": [1], "b": [2]})
+    other.save({"a": [10], "b": [2]})
+    # the stored chunk differs from the one saved before, it is written again
+    storage.save({"a": [1], "b": [2]})
+
+    assert other.load() == {"a": [1], "b": [2]}
+
+
+def test_project_storage_incremental_document_switch(sim):
+    storage = ProjectStorage("test", incremental=True)
+    data = {"a": [1], "b": [2]}
+    storage.save(data)
+
+    other = simulator.activate(simulator.Simulator())
+    storage.save(data)
+
+    assert sorted(other.document.project_data) == ["test", "test/a", "test/b"]
+    assert storage.load() == data
+
+
+def test_project_storage_incremental_loads_full(sim):
+    backend = MemoryProjectData()
+    ProjectStorage("test", backend=backend).save({"a": [1]})
+    storage = ProjectStorage("test", incremental=True, backend=backend)
+
+    assert storage.load() == {"a": [1]}
+    storage.save({"a": [1]})
+    assert sorted(backend.data) == ["test", "test/a"]
+    assert storage.load() == {"a": [1]}
+    with pytest.raises(StorageError):
+        ProjectStorage("missing", incremental=True, backend=backend).load()
+
+
+class FailingStorage(Storage):
+    def __init__(self):
+        self.saved = []
+        self.fail = False
+
+    def save(self, data):
+        if self.fail:
+            raise OSError("disk full")
+        self.saved.append(dict(data))
+
+    def load(self):
+        return self.saved[-1]
+
+
+def test_cached_storage_debounces_saves():
+    storage = FailingStorage()
+    cached = CachedStorage(storage, delay=0.05)
+
+    for value in range(5):
+        cached.save({"value": value})
+    assert cached.load() == {"value": 4}
+    assert cached.is_dirty
+
+    deadline = time.monotonic() + 5.0
+    while cached.is_dirty and time.monotonic() < deadline:
+        time.sleep(0.01)
+    cached.close()
+
+    assert storage.saved == [{"value": 4}]
+
+
+def test_cached_storage_reraises_background_error():
+    storage = FailingStorage()
+    storage.fail = True
+    cached = CachedStorage(storage, delay=0.0)
+
+    cached.save({"value": 1})
+    deadline = time.monotonic() + 5.0
+    while cached._error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(StorageError):
+        cached.flush()
+    # the data stays pending, the next flush retries
+    assert cached.is_dirty
+    storage.fail = False
+    cached.close()
+    assert storage.saved == [{"value": 1}]
+    with pytest.raises(StorageError):
+        cached.save({"value": 2})
+
+
+def test_cached_storage_project_storage_not_in_background(sim):
+    backend = MemoryProjectData()
+    cached = CachedStorage(ProjectStorage("test", backend=backend), delay=0.0)
+
+    assert not cached.background
+    assert CachedStorage(FailingStorage()).background
+    cached.save({"a": 1})
+    time.sleep(0.05)
+    assert backend.writes == 0 and cached._worker is None
+
+    cached.flush()
+    assert backend.writes == 1
+    assert ProjectStorage("test", backend=backend).load() == {"a": 1}
@@ -0,0 +1,155 @@
+import pytest
+from compas.geometry import Vector
+
+import simulator
+
+from compas_cadwork.datamodel import Element
+from compas_cadwork.datamodel import transaction
+
+
+def test_transaction_groups_calls(stand):
+    elements = [Element(element_id) for element_id in list(stand.document.elements)[:20]]
+    p1 = {element.id: stand.document.elements[element.id].p1 for element in elements}
+    stand.reset_calls()
+
+    with transaction() as tx:
+        for element in elements:
+            element.translate(Vector(0, 0, 100))
+            element.set_attribute(5, "moved")
+        elements[0].translate(Vector(0, 0, 100))
+        elements[1].remove()
+        assert stand.total_calls == 0
+
+    # one move per distinct total vector, one attribute call, one delete
+    assert stand.calls["element_controller.move_element"] == 2
+    assert stand.calls["attribute_controller.set_user_attribute"] == 1
+    assert stand.calls["element_controller.delete_elements"] == 1
+    assert stand.calls["visualization_controller.refresh"] == 1
+    assert tx.calls == 4
+    assert tx.is_closed
+
+    assert elements[1].id not in stand.document.elements
+    assert stand.document.elements[elements[0].id].p1[2] == p1[elements[0].id][2] + 200
+    for element in elements[2:]:
+        assert stand.document.elements[element.id].p1[2] == p1[element.id][2] + 100
+        assert stand.document.elements[element.id].attributes[5] == "moved"
+
+
+def test_transaction_rollback_on_exception(stand):
+    element = Element(1)
+    stand.reset_calls()
+
+    with pytest.raises(ValueError):
+        with transaction():
+            element.translate(Vector(1, 0, 0))
+            element.remove()
+            raise ValueError()
+
+    assert stand.total_calls == 0
+    assert 1 in stand.document.elements
+
+
+def test_transaction_explicit_rollback(stand):
+    element = Element(1)
+    stand.reset_calls()
+
+    with transaction() as tx:
+        element.remove()
+        tx.rollback()
+        element.set_attribute(5, "kept")
+
+    assert 1 in stand.document.elements
+    assert stand.document.elements[1].attributes[5] == "kept"
+    assert stand.calls["element_controller.delete_elements"] == 0
+
+
+def test_transaction_nested(stand):
+    stand.reset_calls()
+
+    with transaction() as outer:
+        with transaction() as inner:
+            Element(1).translate(Vector(1, 0, 0))
+        assert inner is outer
+        Element(2).translate(Vector(1, 0, 0))
+
+    assert stand.calls["element_controller.move_element"] == 1
+
+
+def _set_name_after_remove(first, second):
+    first.remove_attribute(5)
+    first.set_attribute(5, "Name", "v")
+
+
+def _remove_after_set(first, second):
+    first.set_attribute(5, "v")
+    first.remove_attribute(5)
+
+
+def _remove_item_after_set(first, second):
+    first.set_attribute(5, "v")
+    first.remove_attribute(5, "v")
+
+
+def _remove_after_clear(first, second):
+    first.set_attribute(5, "v")
+    first.set_attribute(5, "")
+    first.remove_attribute(5)
+
+
+def _overwrite(first, second):
+    first.set_attribute(5, "a")
+    second.set_attribute(5, "a")
+    first.set_attribute(5, "b")
+    first.remove_attribute(6)
+    second.set_attribute(5, "c")
+
+
+def _run(document, sequence, batched):
+    sim = simulator.activate(simulator.Simulator(document))
+    first, second = Element(1), Element(2)
+    if batched:
+        with transaction():
+            sequence(first, second)
+    else:
+        sequence(first, second)
+    return sim, ({element.id: element.attributes for element in document.elements.values()}, document.attribute_names, document.attribute_lists)
+
+
+def _document():
+    document = simulator.SimulatedDocument()
+    document.add(name="first")
+    document.add(name="second")
+    document.attribute_names.update({5: "Old", 6: "Other"})
+    document.attribute_lists[5] = ["v"]
+    return document
+
+
+@pytest.mark.parametrize("sequence", [_set_name_after_remove, _remove_after_set, _remove_item_after_set, _remove_after_clear, _overwrite])
+def test_transaction_matches_direct_calls(sim, sequence):
+    _, direct = _run(_document(), sequence, batched=False)
+    _, batched = _run(_document(), sequence, batched=True)
+
+    assert batched == direct
+
+
+def test_transaction_keeps_value_set_before_remove(sim):
+    _, (attributes, names, _) = _run(_document(), _remove_after_set, batched=True)
+
+    # cadwork does not delete an attribute which is in use
+    assert attributes[1] == {5: "v"}
+    assert names[5] == "Old"
+
+
+def test_transaction_coalesces_attribute_calls(sim):
+    stand, _ = _run(_document(), _overwrite, batched=True)
+
+    # values overwritten before anything depends on them are not set, only "b" and "c" are
+    assert stand.calls["attribute_controller.set_user_attribute"] == 2
+    assert stand.calls["attribute_controller.delete_user_attribute"] == 1
+
+    with transaction() as tx:
+        for element_id in (1, 2):
+            Element(element_id).set_attribute(5, "Name", "x")
+            Element(element_id).set_attribute(6, "y")
+        assert len(tx) == 5
+    assert tx.calls == 3